@@ -1,36 +1,106 @@
 # main.py
+import argparse
+import logging
 import os
-import tkinter as tk
-from utils.data_loader import load_data_from_file
-from ui.main_window import MainWindow
+from utils.instrumentation import enable_from_environment
+from utils.log import configure_logging
+from utils.startup_profile import (
+    StartupProfile,
+    wait_for_first_paint,
+    wait_for_population,
+)
+
+logger = logging.getLogger("build_crafter")
 
 WEAPONS_FILE = os.path.join("data", "weapons.json")
 ARMOR_FILE = os.path.join("data", "armor.json")
 
-if __name__ == "__main__":
-    print("Launching Build Crafter Application...")
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Build Crafter")
+    parser.add_argument(
+        "--list-renderer",
+        choices=("frames", "canvas"),
+        default="frames",
+        help="affichage des listes : un Frame par ligne, ou lignes dessinées sur un canvas",
+    )
+    parser.add_argument(
+        "--profile-startup",
+        action="store_true",
+        help="profile le démarrage (phases + cProfile) jusqu'aux listes remplies",
+    )
+    parser.add_argument("--profile-output", default="startup.prof")
+    parser.add_argument(
+        "--profile-exit",
+        action="store_true",
+        help="quitte une fois le profil écrit (profil scripté)",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    configure_logging()
+    enable_from_environment()  # BUILD_CRAFTER_TIMINGS=1 : rapport des temps à la sortie
+    profile = StartupProfile(enabled=args.profile_startup)
+    profile.start()
+    logger.info("Launching Build Crafter Application...")
+
+    # 0. Imports lourds (Tk, PIL, interface) : mesurés avec --profile-startup
+    with profile.phase("import tkinter"):
+        import tkinter  # noqa: F401
+    with profile.phase("import PIL"):
+        from PIL import Image, ImageTk  # noqa: F401
+    with profile.phase("import ui"):
+        from utils.data_loader import load_data_from_file
+        from ui.main_window import MainWindow
 
     # 1. Charger les données
-    weapon_data = load_data_from_file(WEAPONS_FILE)
-    armor_data = load_data_from_file(ARMOR_FILE)
+    with profile.phase(f"load_data_from_file {os.path.basename(WEAPONS_FILE)}"):
+        weapon_data = load_data_from_file(WEAPONS_FILE)
+    with profile.phase(f"load_data_from_file {os.path.basename(ARMOR_FILE)}"):
+        armor_data = load_data_from_file(ARMOR_FILE)
 
-    print(f"main.py - Loaded Weapon Data Count: {len(weapon_data)}") # <<< Print 9
-    print(f"main.py - Loaded Armor Data Count: {len(armor_data)}")   # <<< Print 10
-    if weapon_data: print(f"main.py - Type of first weapon data item: {type(weapon_data[0])}") # <<< Print 11
-    if armor_data: print(f"main.py - Type of first armor data item: {type(armor_data[0])}")   # <<< Print 12
+    logger.info("Loaded Weapon Data Count: %d", len(weapon_data))
+    logger.info("Loaded Armor Data Count: %d", len(armor_data))
+    if weapon_data: logger.debug("Type of first weapon data item: %s", type(weapon_data[0]))
+    if armor_data: logger.debug("Type of first armor data item: %s", type(armor_data[0]))
 
 
     if not weapon_data and not armor_data:
-        print("Warning: No weapon or armor data loaded. Application might not function as expected.")
+        logger.warning("No weapon or armor data loaded. Application might not function as expected.")
         # Consider adding a message box here
         # import tkinter.messagebox as mb
         # mb.showwarning("No Data", "No weapon or armor data could be loaded. Check your data files.")
         # exit() # Uncomment if data is essential
 
     # 2. Créer l'instance de la fenêtre principale
-    app = MainWindow(weapon_data=weapon_data, armor_data=armor_data)
+    with profile.phase("MainWindow"):
+        app = MainWindow(
+            weapon_data=weapon_data,
+            armor_data=armor_data,
+            list_renderer=args.list_renderer,
+        )
+
+    # 3. Premier affichage (listes vides), puis index et remplissage différé des listes
+    if profile.enabled:
+        with profile.phase("first paint"):
+            wait_for_first_paint(app)
+        zones = {"armes": app.search_zone_weapons, "armures": app.search_zone_armor}
+        with profile.phase("index + remplissage des listes"):
+            durations = wait_for_population(app, list(zones.values()))
+        for zone_name, duration_ms in zip(zones, durations):
+            profile.add_phase(f"liste {zone_name} remplie", duration_ms, depth=1)
+        profile.write(args.profile_output)
+        if args.profile_exit:
+            app.destroy()
+            return
 
-    # 3. Lancer la boucle principale
+    # 4. Lancer la boucle principale
     app.mainloop()
 
-    print("Application finished.")
\ No newline at end of file
+    logger.info("Application finished.")
+
+
+if __name__ == "__main__":
+    main()
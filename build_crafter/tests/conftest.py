@@ -0,0 +1,6 @@
+# tests/conftest.py
+"""Les tests importent les modules comme main.py, depuis build_crafter/ (utils.*, ui.*)."""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,131 @@
+# tests/test_build_search.py
+"""Énumération parallèle des builds et meilleur item par slot (niveau plafonné, verrous)."""
+import itertools
+
+import pytest
+
+from utils.build_search import BuildScorer, best_items_per_slot, enumerate_builds
+from utils.catalog_index import CatalogIndex
+
+SLOT_NAMES = ["Helm", "Ring1", "Chest", "Weapon", "Ring2"]
+
+
+def _item(name, slot, levels):
+    """levels: {niveau: {stat: valeur}}"""
+    return {
+        "name": name,
+        "slot": slot,
+        "levels": {
+            str(level): {
+                "effects": [
+                    {"type": stat, "value": value, "is_percentage": False, "text": ""}
+                    for stat, value in stats.items()
+                ]
+            }
+            for level, stats in levels.items()
+        },
+    }
+
+
+def _names(result):
+    return {slot: (item["name"], level, score) for slot, (item, level, score) in result.items()}
+
+
+CATALOG = [
+    _item("Iron Helm", "Helm", {1: {"armor": 3}, 10: {"armor": 8}}),
+    _item("Tin Helm", "Helm", {1: {"armor": 5}}),
+    _item("Bronze Chest", "Chest", {1: {"max_health": 4}}),
+    _item("Ring A", "Ring", {1: {"armor": 2}}),
+    _item("Ring B", "Ring", {1: {"armor": 1}}),
+    _item("Sword", "Melee Weapon", {1: {"melee_damage": 9}}),
+]
+
+
+def test_best_item_per_slot_at_level_cap():
+    index = CatalogIndex(CATALOG)
+    weights = {"armor": 1, "max_health": 0.5}
+    assert _names(best_items_per_slot(index, weights, SLOT_NAMES)) == {
+        "Helm": ("Iron Helm", 10, 8.0),
+        "Ring1": ("Ring A", 1, 2.0),
+        "Chest": ("Bronze Chest", 1, 2.0),
+        "Ring2": ("Ring B", 1, 1.0),
+    }
+    capped = best_items_per_slot(index, weights, SLOT_NAMES, max_level=5)
+    assert _names(capped)["Helm"] == ("Tin Helm", 1, 5.0)
+
+
+def test_slots_without_positive_score_stay_empty():
+    index = CatalogIndex(CATALOG)
+    result = best_items_per_slot(index, {"max_health": 1}, SLOT_NAMES)
+    assert sorted(result) == ["Chest"]
+
+
+def test_locked_item_keeps_its_slot_and_leaves_the_pool():
+    index = CatalogIndex(CATALOG)
+    locks = {"Ring1": CATALOG[4]}
+    result = _names(best_items_per_slot(index, {"armor": 1}, SLOT_NAMES, locks=locks))
+    assert result["Ring1"] == ("Ring B", 1, 1.0)
+    assert result["Ring2"] == ("Ring A", 1, 2.0)
+
+
+def test_ties_do_not_depend_on_catalog_order():
+    twins = [
+        _item("Beta Helm", "Helm", {1: {"armor": 4}, 2: {"armor": 4}}),
+        _item("Alpha Helm", "Helm", {1: {"armor": 4}}),
+    ]
+    for items in (twins, twins[::-1]):
+        result = best_items_per_slot(CatalogIndex(items), {"armor": 1}, SLOT_NAMES)
+        assert _names(result) == {"Helm": ("Alpha Helm", 1, 4.0)}
+
+
+def _brute_force_scores(items, scorer):
+    """Score de chaque build valide (anneaux distincts, paire non ordonnée)."""
+    by_slot = {}
+    for item_data in items:
+        slot = "Weapon" if item_data["slot"] == "Melee Weapon" else item_data["slot"]
+        by_slot.setdefault(slot, []).append(item_data)
+    rings = by_slot.pop("Ring", [])
+    choices = [[(item_data,) for item_data in group] for group in by_slot.values()]
+    if rings:
+        choices.append(list(itertools.combinations(rings, min(2, len(rings)))))
+    scores = []
+    for build in itertools.product(*choices):
+        totals = dict.fromkeys(scorer.stat_names(), 0.0)
+        for item_data in itertools.chain.from_iterable(build):
+            level = max(item_data["levels"], key=int)
+            for effect in item_data["levels"][level]["effects"]:
+                if effect["type"] in totals:
+                    totals[effect["type"]] += effect["value"]
+        scores.append(scorer.score(list(totals.values())))
+    return sorted(scores, reverse=True)
+
+
+@pytest.mark.parametrize("processes", [1, 2])
+def test_enumerate_builds_matches_brute_force(processes):
+    items = CATALOG + [_item("Ring C", "Ring", {1: {"max_health": 6}})]
+    scorer = BuildScorer({"armor": 1, "max_health": 0.5}, caps={"armor": 10})
+    result = enumerate_builds(items, scorer, SLOT_NAMES, processes=processes, top_k=100)
+    expected = _brute_force_scores(items, scorer)
+    # 2 casques x 1 plastron x 1 arme x 3 paires d'anneaux distincts
+    assert result.evaluated == len(expected) == 6
+    assert [value for value, _build in result.builds] == expected
+    _value, best = result.builds[0]
+    assert {slot: item["name"] for slot, item in best.items()} == {
+        "Helm": "Iron Helm",
+        "Ring1": "Ring A",
+        "Chest": "Bronze Chest",
+        "Weapon": "Sword",
+        "Ring2": "Ring C",
+    }
+
+
+def test_scorer_set_bonus_and_damage_multiplier():
+    scorer = BuildScorer(
+        {"armor": 2},
+        caps={"armor": 5},
+        set_bonus_value=10,
+        damage_multiplier_stats=["magic_damage"],
+    )
+    assert scorer.stat_names() == ["armor", "magic_damage"]
+    # armor plafonné à 5 -> 10, set complet +10, puis x1.5
+    assert scorer.score([8, 50], {0: 3, 1: 1}, {0: 3, 1: 2}) == pytest.approx(30.0)
@@ -0,0 +1,85 @@
+# tests/test_catalog_generator.py
+"""Catalogues synthétiques : déterminisme, schéma des données livrées, sets, découpage."""
+import json
+
+from utils.catalog_generator import SET_SLOTS, generate_catalog, main, split_catalog
+from utils.catalog_index import CatalogIndex
+from utils.item_stats import available_levels, level_stats
+
+SHIPPED_FIELDS = {
+    "name",
+    "id_wiki",
+    "max_level",
+    "min_level",
+    "rarity",
+    "slot",
+    "durability",
+    "category",
+    "sell_value",
+    "tooltip",
+    "set_bonus",
+    "image_url",
+    "local_image_path",
+    "levels",
+}
+
+
+def test_same_seed_same_catalog():
+    assert generate_catalog(200, seed=4) == generate_catalog(200, seed=4)
+    assert generate_catalog(200, seed=4) != generate_catalog(200, seed=5)
+
+
+def test_items_follow_the_shipped_schema():
+    items = generate_catalog(500, seed=1)
+    assert len(items) == 500
+    assert len({item["name"] for item in items}) == 500
+    for item in items:
+        assert set(item) == SHIPPED_FIELDS
+        assert available_levels(item) == list(range(item["min_level"], item["max_level"] + 1))
+        first, last = item["min_level"], item["max_level"]
+        # Au-delà du premier niveau, les types d'armure portent le gain en suffixe
+        if last > first and item["slot"] in SET_SLOTS:
+            types = [effect["type"] for effect in item["levels"][str(last)]["effects"]]
+            assert all(t.endswith(")") for t in types)
+        assert level_stats(item, first)
+    # Les stats suffixées se ramènent aux mêmes colonnes que le premier niveau
+    assert "armor" in CatalogIndex(items).stat_names
+
+
+def test_sets_are_coherent():
+    items = generate_catalog(2000, seed=2)
+    names = {item["name"] for item in items}
+    pieces = [item for item in items if item["set_bonus"]]
+    assert pieces
+    for item in pieces:
+        assert item["slot"] in SET_SLOTS
+        assert item["name"] in item["set_bonus"]["set_items"]
+        assert len(item["set_bonus"]["set_items"]) == item["set_bonus"]["pieces_required"]
+    complete = [
+        item for item in pieces if set(item["set_bonus"]["set_items"]) <= names
+    ]
+    assert complete
+
+
+def test_split_keeps_slotless_items_with_weapons():
+    items = generate_catalog(300, seed=3)
+    weapons, armor = split_catalog(items)
+    assert len(weapons) + len(armor) == len(items)
+    assert all(item["slot"] in SET_SLOTS for item in armor)
+    assert {item["slot"] for item in weapons} <= {
+        None,
+        "Melee Weapon",
+        "Range Weapon",
+        "Magic Weapon",
+    }
+
+
+def test_cli_writes_split_files(tmp_path):
+    main(["--size", "50", "--seed", "7", "--split", str(tmp_path)])
+    with open(tmp_path / "weapons.json", encoding="utf-8") as f:
+        weapons = json.load(f)
+    with open(tmp_path / "armor.json", encoding="utf-8") as f:
+        armor = json.load(f)
+    assert sorted(item["name"] for item in weapons + armor) == sorted(
+        item["name"] for item in generate_catalog(50, seed=7)
+    )
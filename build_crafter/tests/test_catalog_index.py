@@ -0,0 +1,137 @@
+# tests/test_catalog_index.py
+"""Masques et index en colonnes (lignes par niveau, stats, facettes)."""
+import math
+
+from utils.catalog_index import CatalogIndex
+from utils.masks import (
+    mask_and,
+    mask_eq,
+    mask_from_indices,
+    mask_ge,
+    mask_indices,
+    mask_lt,
+    mask_not,
+    mask_or,
+)
+
+
+def _item(name, slot, levels, rarity="Rare"):
+    """levels: {niveau: {stat: valeur}}"""
+    return {
+        "name": name,
+        "slot": slot,
+        "rarity": rarity,
+        "category": ["Equipment"],
+        "levels": {
+            str(level): {
+                "effects": [
+                    {"type": stat, "value": value, "is_percentage": False, "text": ""}
+                    for stat, value in stats.items()
+                ]
+            }
+            for level, stats in levels.items()
+        },
+    }
+
+
+CATALOG = [
+    _item("Iron Helm", "Helm", {5: {"armor": 4}, 6: {"armor(+1)": 5}, 7: {"armor(+2)": 6}}),
+    _item("Bronze Chest", "Chest", {1: {"armor": 2, "max_health": 10}}, "Common"),
+    _item("Slime Ring", "Ring", {3: {"max_health": 7}, 8: {"max_health(+5)": 12}}),
+    _item("Broken Helm", "Helm", {}),
+]
+
+
+def test_mask_operations():
+    size = 6
+    odd = mask_from_indices(size, [1, 3, 5])
+    low = mask_from_indices(size, [0, 1, 2])
+    assert mask_indices(mask_and(odd, low)) == [1]
+    assert mask_indices(mask_or(odd, low)) == [0, 1, 2, 3, 5]
+    assert mask_indices(mask_not(odd)) == [0, 2, 4]
+
+
+def test_mask_comparisons_mix_int_and_float():
+    levels = [1, 2, 2, 3]
+    assert mask_indices(mask_eq(levels, 2)) == [1, 2]
+    assert mask_indices(mask_eq(levels, 2.0)) == [1, 2]
+    assert mask_indices(mask_eq([1.0, 2.0, 2.5], 2)) == [1]
+    assert mask_indices(mask_ge(levels, 2.5)) == [3]
+    assert mask_indices(mask_lt([0.5, 2.0], 1)) == [0]
+
+
+def test_rows_are_grouped_by_item_and_sorted_by_level():
+    index = CatalogIndex(CATALOG)
+    assert index.item_count == 4
+    assert list(index.row_item) == [0, 0, 0, 1, 2, 2]
+    assert list(index.row_level) == [5, 6, 7, 1, 3, 8]
+    assert list(index.stat_columns["armor"]) == [4, 5, 6, 2, 0, 0]
+    assert index.stat_presence["max_health"] == bytes([0, 0, 0, 1, 1, 1])
+
+
+def test_build_steps_match_one_shot_build():
+    index = CatalogIndex(CATALOG)
+    stepped = CatalogIndex(CATALOG, build=False)
+    assert stepped.row_count == 0
+    steps = sum(1 for _ in stepped.build_steps(chunk_size=1))
+    assert steps > len(CATALOG)
+    for attribute in (
+        "row_item",
+        "row_level",
+        "item_row_start",
+        "stat_names",
+        "stat_columns",
+        "stat_presence",
+        "facet_masks",
+        "facet_labels",
+        "name_token_ids",
+        "name_tokens",
+    ):
+        assert getattr(stepped, attribute) == getattr(index, attribute)
+
+
+def test_rows_at_level():
+    index = CatalogIndex(CATALOG)
+    items = range(index.item_count)
+    assert index.rows_at_level(items) == [2, 3, 5, -1]
+    assert index.rows_at_level(items, 6) == [1, 3, 4, -1]
+    # Sous le niveau minimal : niveau minimal (clamp) ou -1
+    assert index.rows_at_level(items, 2) == [0, 3, 4, -1]
+    assert index.rows_at_level(items, 2, clamp=False) == [-1, 3, -1, -1]
+    assert index.rows_at_level([2, 0], 100) == [5, 2]
+
+
+def test_item_stat_values_are_nan_when_missing_or_unreachable():
+    index = CatalogIndex(CATALOG)
+    values = index.item_stat_values("armor", 6)
+    assert values[:2].tolist() == [5.0, 2.0]
+    assert all(math.isnan(value) for value in values[2:])
+    assert math.isnan(index.item_stat_values("armor", 4)[0])
+    assert all(math.isnan(value) for value in index.item_stat_values("unknown"))
+
+
+def test_stat_and_facet_masks():
+    index = CatalogIndex(CATALOG)
+    assert mask_indices(index.stat_mask("max_health", ">=", 10)) == [1, 2]
+    assert mask_indices(index.stat_mask("max_health", ">=", 10, level=5)) == [1]
+    assert mask_indices(index.stat_mask("armor", "=", 6)) == [0]
+    assert mask_indices(index.facet_mask("slot", ["helm", "RING"])) == [0, 2, 3]
+    assert mask_indices(index.facet_term_mask("rarity", "common")) == [1]
+    assert index.facet_values("slot", within=index.facet_mask("rarity", "Rare")) == [
+        "Helm",
+        "Ring",
+    ]
+
+
+def test_name_prefix_mask():
+    index = CatalogIndex(CATALOG)
+    assert mask_indices(index.name_prefix_mask("he")) == [0, 3]
+    assert mask_indices(index.name_prefix_mask("Bro")) == [1, 3]
+    assert mask_indices(index.name_prefix_mask("zz")) == []
+
+
+def test_order_items_keeps_missing_stats_last():
+    index = CatalogIndex(CATALOG)
+    assert index.order_items("max_health") == [2, 1, 0, 3]
+    assert index.order_items("max_health", descending=False) == [1, 2, 0, 3]
+    assert index.order_items("armor", level=5, top_k=2) == [0, 1]
@@ -0,0 +1,74 @@
+# tests/test_comparison.py
+"""Écarts de stats entre candidats et équipement actuel."""
+from utils.catalog_index import CatalogIndex
+from utils.comparison import ItemComparator
+
+SLOT_NAMES = ["Helm", "Ring1", "Chest", "Weapon", "Ring2"]
+
+
+def _item(name, slot, levels):
+    """levels: {niveau: {stat: valeur}}"""
+    return {
+        "name": name,
+        "slot": slot,
+        "levels": {
+            str(level): {
+                "effects": [
+                    {"type": stat, "value": value, "is_percentage": False, "text": ""}
+                    for stat, value in stats.items()
+                ]
+            }
+            for level, stats in levels.items()
+        },
+    }
+
+
+CATALOG = [
+    _item("Iron Helm", "Helm", {1: {"armor": 3}, 5: {"armor": 7, "max_health": 2}}),
+    _item("Tin Helm", "Helm", {1: {"armor": 5}}),
+    _item("Sword", "Range Weapon", {1: {"range_damage": 9}}),
+    _item("Ring A", "Ring", {1: {"max_health": 4}}),
+    _item("Bomb", None, {1: {"explosive_damage": 30}}),
+]
+
+
+def test_target_slot():
+    comparator = ItemComparator(CatalogIndex(CATALOG), SLOT_NAMES)
+    assert [comparator.target_slot(item) for item in CATALOG] == [
+        "Helm",
+        "Helm",
+        "Weapon",
+        "Ring1",
+        None,
+    ]
+
+
+def test_deltas_against_equipped_slot():
+    comparator = ItemComparator(CatalogIndex(CATALOG), SLOT_NAMES)
+    comparator.set_equipped("Helm", CATALOG[1])
+    deltas = comparator.deltas([0, 1, 2, 3, 4])
+    assert deltas["armor"].tolist() == [2.0, 0.0, 0.0, 0.0, 0.0]
+    assert deltas["max_health"].tolist() == [2.0, 0.0, 0.0, 4.0, 0.0]
+    assert deltas["range_damage"].tolist() == [0.0, 0.0, 9.0, 0.0, 0.0]
+    # Au niveau 1 le casque en fer est moins bon que celui équipé
+    at_level_1 = comparator.deltas([0], level=1)
+    assert list(at_level_1) == ["armor"]
+    assert at_level_1["armor"].tolist() == [-2.0]
+
+
+def test_emptying_a_slot_compares_to_nothing():
+    comparator = ItemComparator(CatalogIndex(CATALOG), SLOT_NAMES)
+    comparator.set_equipped("Helm", CATALOG[1])
+    comparator.set_equipped("Helm", None)
+    assert comparator.deltas([1])["armor"].tolist() == [5.0]
+
+
+def test_delta_badges():
+    comparator = ItemComparator(CatalogIndex(CATALOG), SLOT_NAMES)
+    comparator.set_equipped("Helm", CATALOG[0])
+    assert comparator.delta_badges([0, 1, 3], max_stats=1) == [
+        ("=", 0),
+        ("-2 armor", -1),
+        ("+4 max_health", 1),
+    ]
+    assert comparator.delta_badges([1])[0] == ("-2 armor, -2 max_health", -1)
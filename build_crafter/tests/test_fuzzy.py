@@ -0,0 +1,56 @@
+# tests/test_fuzzy.py
+"""Recherche approximative : distance d'édition, index de trigrammes, index des noms."""
+import random
+
+from utils.catalog_index import CatalogIndex
+from utils.fuzzy import TrigramIndex, levenshtein, max_typos
+
+
+def test_levenshtein():
+    assert levenshtein("iron", "iron") == 0
+    assert levenshtein("iron", "irn") == 1
+    assert levenshtein("helm", "hlem") == 2
+    assert levenshtein("kitten", "sitting") == 3
+    # Au-delà du seuil : seuil + 1
+    assert levenshtein("kitten", "sitting", max_distance=1) == 2
+    assert levenshtein("a", "abcdef", max_distance=2) == 3
+
+
+def test_max_typos_grows_with_term_length():
+    assert [max_typos(term) for term in ("ab", "abc", "abcde", "abcdef")] == [0, 1, 1, 2]
+
+
+def test_matches_typos_and_prefixes():
+    index = TrigramIndex(["obsidian", "octarine", "iron", "irony", "helm", "helmet"])
+    assert index.matches("obsidain") == {"obsidian": 2}
+    assert index.matches("iron") == {"iron": 0, "irony": 0}
+    assert index.matches("helmt") == {"helmet": 1, "helm": 1}
+    assert index.matches("zzzz") == {}
+
+
+def test_containment_comes_from_trigram_candidates():
+    rng = random.Random(3)
+    vocabulary = sorted(
+        {"".join(rng.choice("abcde") for _ in range(rng.randint(1, 8))) for _ in range(400)}
+    )
+    index = TrigramIndex(vocabulary)
+    for _ in range(200):
+        term = "".join(rng.choice("abcde") for _ in range(rng.randint(1, 5)))
+        result = index.matches(term)
+        containing = {word for word in vocabulary if term in word}
+        assert {word for word, distance in result.items() if distance == 0} == containing
+        for word, distance in result.items():
+            assert distance == 0 if word in containing else 0 < distance <= max_typos(term)
+
+
+def test_name_fuzzy_search_on_catalog():
+    items = [
+        {"name": "Obsidian Helm", "levels": {}},
+        {"name": "Iron Helmet", "levels": {}},
+        {"name": "Wood Staff", "levels": {}},
+    ]
+    index = CatalogIndex(items)
+    assert index.fuzzy_item_distances("helmt") == {0: 1, 1: 1}
+    assert index.fuzzy_item_distances("taf") == {2: 0}
+    assert index.fuzzy_item_distances("lm") == {0: 0, 1: 0}
+    assert index.name_fuzzy_mask("obsidain") == bytes([1, 0, 0])
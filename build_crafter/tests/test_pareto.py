@@ -0,0 +1,91 @@
+# tests/test_pareto.py
+"""
+Frontière de Pareto des builds comparée à une énumération exhaustive, sur des
+catalogues qui contiennent des anneaux (absents des données livrées).
+"""
+import itertools
+import random
+
+import pytest
+
+from utils.pareto import pareto_builds
+
+SLOT_NAMES = ["Helm", "Ring1", "Chest", "Weapon", "Ring2"]
+STATS = ["armor", "max_health", "magic_barrier"]
+
+
+def _item(name, slot, stats):
+    effects = [
+        {"type": stat, "value": value, "is_percentage": False, "text": ""}
+        for stat, value in stats.items()
+    ]
+    return {
+        "name": name,
+        "slot": slot,
+        "min_level": 1,
+        "max_level": 1,
+        "levels": {"1": {"effects": effects}},
+    }
+
+
+def _random_catalog(seed):
+    rng = random.Random(seed)
+    items = []
+    for slot, count in (("Helm", 3), ("Chest", 2), ("Melee Weapon", 2), ("Ring", 5)):
+        for number in range(rng.randint(1, count)):
+            stats = {stat: rng.randint(0, 6) for stat in STATS}
+            items.append(_item(f"{slot} {number}", slot, stats))
+    return items
+
+
+def _brute_force_front(items, stats):
+    """Toutes les combinaisons valides (anneaux distincts), puis filtre naïf."""
+    by_slot = {}
+    for item_data in items:
+        slot = "Weapon" if item_data["slot"] == "Melee Weapon" else item_data["slot"]
+        by_slot.setdefault(slot, []).append(item_data)
+    rings = by_slot.pop("Ring", [])
+    choices = [[(item_data,) for item_data in group] for group in by_slot.values()]
+    if rings:
+        choices.append(list(itertools.combinations(rings, min(2, len(rings)))))
+    vectors = set()
+    for build in itertools.product(*choices):
+        totals = dict.fromkeys(stats, 0.0)
+        for item_data in itertools.chain.from_iterable(build):
+            for effect in item_data["levels"]["1"]["effects"]:
+                if effect["type"] in totals:
+                    totals[effect["type"]] += effect["value"]
+        vectors.add(tuple(totals[stat] for stat in stats))
+    return {
+        v
+        for v in vectors
+        if not any(all(o >= x for o, x in zip(other, v)) and other != v for other in vectors)
+    }
+
+
+@pytest.mark.parametrize("seed", range(30))
+@pytest.mark.parametrize("stats", [STATS[:2], STATS])
+def test_matches_brute_force_with_rings(seed, stats):
+    items = _random_catalog(seed)
+    frontier = pareto_builds(items, stats, SLOT_NAMES)
+    assert {values for values, _build in frontier} == _brute_force_front(items, stats)
+
+
+def test_same_ring_never_fills_both_slots():
+    items = [
+        _item("Hat", "Helm", {"armor": 1, "max_health": 20}),
+        _item("RingA", "Ring", {"armor": 10, "max_health": 0}),
+        _item("RingB", "Ring", {"armor": 1, "max_health": 1}),
+    ]
+    frontier = pareto_builds(items, ["armor", "max_health"], SLOT_NAMES)
+    assert [
+        (values, {slot: item_data["name"] for slot, item_data in build.items()})
+        for values, build in frontier
+    ] == [((12.0, 21.0), {"Helm": "Hat", "Ring1": "RingA", "Ring2": "RingB"})]
+
+
+def test_single_ring_leaves_second_slot_empty():
+    items = [_item("Hat", "Helm", {"armor": 1}), _item("RingA", "Ring", {"armor": 3})]
+    [(values, build)] = pareto_builds(items, ["armor", "max_health"], SLOT_NAMES)
+    assert values == (4.0, 0.0)
+    assert sorted(build) == ["Helm", "Ring1"]
@@ -0,0 +1,99 @@
+# tests/test_query.py
+"""Langage de requête : compilation en QueryPlan puis exécution sur un CatalogIndex."""
+from utils.catalog_index import CatalogIndex
+from utils.masks import mask_from_indices
+from utils.query import execute_query, normalize_query, parse_query
+
+
+def _item(name, slot, rarity, stats):
+    return {
+        "name": name,
+        "slot": slot,
+        "rarity": rarity,
+        "category": ["Equipment"],
+        "levels": {
+            "1": {
+                "effects": [
+                    {"type": stat, "value": value, "is_percentage": False, "text": ""}
+                    for stat, value in stats.items()
+                ]
+            }
+        },
+    }
+
+
+CATALOG = [
+    _item("Iron Helm", "Helm", "Common", {"armor": 4, "max_health": 10}),
+    _item("Copper Helm", "Helm", "Rare", {"armor": 3, "max_health": 25}),
+    _item("Iron Sword", "Melee Weapon", "Rare", {"melee_damage": 12}),
+    _item("Crystal Staff", "Magic Weapon", "Epic", {"magic_damage": 20}),
+]
+
+
+def test_normalize_query():
+    assert normalize_query("  Slot : Helm   armor >= 5 ") == "slot:helm armor>=5"
+    assert normalize_query(None) == ""
+
+
+def test_parse_query_terms():
+    plan = parse_query(
+        "slot:helm rarity:rare,epic max_health>20 name:~iron -cat:tool level:10 top:3 sort:-armor"
+    )
+    assert plan.facet_terms == [
+        ("slot", ("helm",), False),
+        ("rarity", ("rare", "epic"), False),
+        ("category", ("tool",), True),
+    ]
+    assert plan.stat_terms == [("max_health", ">", 20.0, False)]
+    assert plan.name_terms == [("fuzzy", "iron", False)]
+    assert (plan.level, plan.top_k, plan.sort_stat, plan.sort_descending) == (
+        10,
+        3,
+        "armor",
+        True,
+    )
+    assert plan.unknown_terms == []
+
+
+def test_parse_query_free_words_and_unknown_fields():
+    plan = parse_query("Iron-Helm -copper color:red slot:")
+    assert plan.name_terms == [
+        ("prefix", "iron", False),
+        ("prefix", "helm", False),
+        ("prefix", "copper", True),
+    ]
+    assert plan.unknown_terms == ["color:red", "slot:"]
+    assert parse_query("sort:armor").sort_descending is False
+
+
+def test_plans_are_cached_on_normalized_text():
+    assert parse_query("Slot:Helm  armor>=5") is parse_query("slot:helm armor >= 5")
+
+
+def test_execute_query_filters_and_sorts():
+    index = CatalogIndex(CATALOG)
+    assert execute_query(index, "") is None
+    assert execute_query(index, "iron") == [0, 2]
+    assert execute_query(index, "slot:weapon") == [2, 3]
+    assert execute_query(index, "slot:helm -rarity:common") == [1]
+    assert execute_query(index, "max_health>=10 sort:-max_health") == [1, 0]
+    assert execute_query(index, "sort:armor") == [1, 0, 2, 3]
+    assert execute_query(index, "top:1", sort_stat="magic_damage") == [3]
+
+
+def test_execute_query_base_mask_and_defaults():
+    index = CatalogIndex(CATALOG)
+    helms = mask_from_indices(index.item_count, [0, 1])
+    assert execute_query(index, "", base_mask=helms) == [0, 1]
+    assert execute_query(index, "", base_mask=helms, sort_stat="armor") == [0, 1]
+    # Le tri de la requête prime sur celui passé en paramètre
+    assert execute_query(index, "sort:armor", sort_stat="max_health") == [1, 0, 2, 3]
+
+
+def test_free_words_fall_back_to_fuzzy_matches():
+    index = CatalogIndex(CATALOG)
+    # Aucun mot ne commence par "irn" : variante approximative "iron"
+    assert execute_query(index, "irn") == [0, 2]
+    # Aucun item n'a à la fois "iron" et "staf" : un seul mot proche suffit
+    assert execute_query(index, "iron staf") == [0, 2, 3]
+    assert execute_query(index, "zzzz") == []
@@ -0,0 +1,150 @@
+# ui/canvas_item_list_display.py
+import logging
+
+from ui.image_cache import thumbnail
+from ui.item_list_display import ItemListDisplay
+from utils.instrumentation import timed
+
+logger = logging.getLogger(__name__)
+
+
+class CanvasItemListDisplay(ItemListDisplay):
+    """
+    Variante d'ItemListDisplay qui dessine les lignes directement sur le canvas
+    (cadre, vignette, nom, badge) au lieu d'un Frame et de Labels par item.
+    Seules les lignes visibles sont dessinées, avec un pool d'items de canvas
+    réutilisés au défilement ; un clic est résolu par sa position verticale.
+    """
+
+    ROW_PADDING = 4  # Marge verticale autour de la vignette
+    POPULATE_CHUNK_SIZE = 2000  # Ajouter une ligne ne coûte qu'une entrée de liste
+
+    def _setup_rows(self):
+        self.row_height = self.item_image_size[1] + 2 * self.ROW_PADDING + 2
+        self.row_pool = []  # [(cadre, image, texte de remplacement, nom, badge)]
+        self.row_badges = {}  # position -> (texte, signe), calculés à l'affichage
+        self._drawn_view = None  # (première ligne, dernière, largeur) dessinées
+        self.canvas.configure(
+            yscrollincrement=self.row_height, yscrollcommand=self._on_yview
+        )
+        self.canvas.bind("<Button-1>", self._on_canvas_click)
+
+    def _on_canvas_configure(self, event):
+        self._redraw()
+
+    def _on_yview(self, first, last):
+        self.scrollbar.set(first, last)
+        self._render_visible()
+
+    def _on_canvas_click(self, event):
+        position = int(self.canvas.canvasy(event.y) // self.row_height)
+        if 0 <= position < len(self.displayed_items):
+            self._on_row_click(position)
+
+    # --- Géométrie des lignes (calculée, aucune mesure de widget) ---
+    def _row_bounds(self, position):
+        top = position * self.row_height
+        return top + 1, top + self.row_height - 1
+
+    def _content_height(self):
+        return len(self.displayed_items) * self.row_height
+
+    # --- Dessin ---
+    def _create_row_items(self):
+        return (
+            self.canvas.create_rectangle(
+                0, 0, 0, 0, outline="black", fill=self.bg_color
+            ),
+            self.canvas.create_image(0, 0),
+            self.canvas.create_text(0, 0, text=""),
+            self.canvas.create_text(0, 0, text="", anchor="w"),
+            self.canvas.create_text(0, 0, text="", anchor="e", font=("Segoe UI", 8)),
+        )
+
+    def _redraw(self):
+        self._drawn_view = None
+        self._render_visible()
+
+    def _render_visible(self):
+        """Dessine les lignes visibles en réutilisant les items du pool."""
+        view_top = self.canvas.canvasy(0)
+        width = self.canvas.winfo_width()
+        first = max(0, int(view_top // self.row_height))
+        last = min(
+            len(self.displayed_items),
+            int((view_top + self.canvas.winfo_height()) // self.row_height) + 1,
+        )
+        if (first, last, width) == self._drawn_view:
+            return
+        self._drawn_view = (first, last, width)
+        positions = range(first, last)
+        self._compute_badges(positions)
+        while len(self.row_pool) < len(positions):
+            self.row_pool.append(self._create_row_items())
+        for row_items, position in zip(self.row_pool, positions):
+            self._draw_row(row_items, position, width)
+        for row_items in self.row_pool[len(positions) :]:
+            for canvas_item in row_items:
+                self.canvas.itemconfig(canvas_item, state="hidden")
+
+    def _draw_row(self, row_items, position, width):
+        frame, image, fallback, name, badge = row_items
+        item_dict = self.displayed_items[position]
+        top, bottom = self._row_bounds(position)
+        middle = (top + bottom) / 2
+        left = self.SELECTION_GUTTER + 2
+        right = max(left, width - 2)
+        image_x = left + 5 + self.item_image_size[0] / 2
+        photo = thumbnail(self, item_dict.get("local_image_path"), self.item_image_size)
+        badge_text, sign = self.row_badges.get(position, ("", 0))
+
+        self.canvas.coords(frame, left, top, right, bottom)
+        self.canvas.coords(image, image_x, middle)
+        self.canvas.itemconfig(image, image=photo or "")
+        self.canvas.coords(fallback, image_x, middle)
+        self.canvas.itemconfig(fallback, text="" if photo else "?")
+        self.canvas.coords(name, left + 15 + self.item_image_size[0], middle)
+        self.canvas.itemconfig(name, text=item_dict.get("name", "Nom Inconnu"))
+        self.canvas.coords(badge, right - 5, middle)
+        self.canvas.itemconfig(
+            badge, text=badge_text, fill=self.BADGE_COLORS.get(sign, "grey")
+        )
+        for canvas_item in row_items:
+            self.canvas.itemconfig(canvas_item, state="normal")
+
+    def _compute_badges(self, positions):
+        """Badges des lignes visibles seulement (jamais de toute la liste)."""
+        if not self.badge_provider:
+            return
+        missing = [p for p in positions if p not in self.row_badges]
+        if not missing:
+            return
+        badges = self.badge_provider([self.displayed_items[p] for p in missing])
+        self.row_badges.update(zip(missing, badges))
+
+    # --- API commune avec ItemListDisplay ---
+    @timed("ItemListDisplay.display_items")
+    def display_items(self, items_list):
+        self._cancel_population()
+        self.displayed_items = []
+        self.row_positions = {}
+        self.row_badges = {}
+        self.canvas.yview_moveto(0)
+        self._append_rows(items_list or [])
+
+    def _append_rows(self, items_list):
+        for item_dict in items_list:
+            if isinstance(item_dict, dict):
+                self.row_positions[id(item_dict)] = len(self.displayed_items)
+                self.displayed_items.append(item_dict)
+            else:
+                logger.error("L'entrée n'est pas un dictionnaire: %r", item_dict)
+        self.canvas.configure(scrollregion=(0, 0, 0, self._content_height()))
+        # L'item sélectionné reste marqué s'il figure encore dans la liste
+        self._place_selection_marker()
+        self._redraw()
+
+    def refresh_badges(self):
+        """Oublie les badges calculés et redessine les lignes visibles."""
+        self.row_badges = {}
+        self._redraw()
@@ -1,26 +1,29 @@
 # ui/equipment_slots_display.py
+import logging
 import tkinter as tk
 from tkinter import ttk
-from PIL import Image, ImageTk
-import os
+from ui.image_cache import sized_image
 from ui.tooltip import HoverTooltip  # Assurez-vous que l'import est correct
+from utils.instrumentation import timed
+from utils.slots import EQUIPMENT_SLOTS
+
+logger = logging.getLogger(__name__)
 
 
 class EquipmentSlotsDisplay(tk.Frame):
     # ... (SLOT_LAYOUT, __init__, _configure_grid, _create_slots, _handle_single_click comme avant) ...
-    SLOT_LAYOUT = {
-        "Helm": (0, 0),
-        "Amulet": (0, 1),
-        "Ring1": (0, 2),
-        "Chest": (1, 0),
-        "Weapon": (1, 1),
-        "Ring2": (1, 2),
-        "Pants": (2, 0),
-        "Offhand": (2, 2),
-        "Accessory": (3, 0),
-        "Gloves": (3, 1),
-        "Pet": (3, 2),
-    }
+    # (ligne, colonne) de chaque slot, dans l'ordre de utils.slots.EQUIPMENT_SLOTS
+    SLOT_LAYOUT = dict(
+        zip(
+            EQUIPMENT_SLOTS,
+            [
+                (0, 0), (0, 1), (0, 2),  # Helm, Amulet, Ring1
+                (1, 0), (1, 1), (1, 2),  # Chest, Weapon, Ring2
+                (2, 0), (2, 2),  # Pants, Offhand
+                (3, 0), (3, 1), (3, 2),  # Accessory, Gloves, Pet
+            ],
+        )
+    )
     GRID_ROWS = 4
     GRID_COLS = 3
 
@@ -51,7 +54,16 @@ class EquipmentSlotsDisplay(tk.Frame):
         self.slot_content = {}
         self.placeholder_images = {}
         self.equipped_item_images = {}
-        self.active_slot_tooltips = {}
+        # Une seule tooltip pour tous les slots : le texte vient du slot survolé
+        self.slot_tooltip = HoverTooltip(
+            None,
+            delay_ms=400,
+            border_image_path="images/tooltip/tooltip_border.png",  # Vérifier ce chemin
+            content_padding=(8, 5),
+            text_bg="#2B2B2B",  # Renommé depuis 'bg'
+            text_fg="white",  # Renommé depuis 'fg'
+            font=("Segoe UI", 9),
+        )
         self._configure_grid()
         self._create_slots()
 
@@ -76,11 +88,11 @@ class EquipmentSlotsDisplay(tk.Frame):
             )
 
     def _create_slots(self):  # Inchangé
-        print("--- Creating Equipment Slots ---")
+        logger.debug("Creating Equipment Slots")
         for slot_name, (row, col) in self.SLOT_LAYOUT.items():
             grid_row = row + 1
             grid_col = col + 1
-            print(f"Creating slot: {slot_name} at ({grid_row}, {grid_col})")
+            logger.debug("Creating slot: %s at (%d, %d)", slot_name, grid_row, grid_col)
             slot_bg = "#4a341f" if slot_name == "Weapon" else "#654321"
             slot_frame = tk.Frame(
                 self,
@@ -109,23 +121,17 @@ class EquipmentSlotsDisplay(tk.Frame):
             )
             slot_frame.bind("<Button-1>", click_handler)
             content_label.bind("<Button-1>", click_handler)
+            self.slot_tooltip.attach(content_label)
             placeholder_filename = f"{slot_name.lower()}_slot.png"
             if slot_name == "Weapon":
                 placeholder_filename = "weapon_slot.png"
             placeholder_path = f"images/placeholders/{placeholder_filename}"
-            if os.path.exists(placeholder_path):
-                try:
-                    img = Image.open(placeholder_path).resize(
-                        (int(self.slot_size * 0.8), int(self.slot_size * 0.8)),
-                        Image.Resampling.NEAREST,
-                    )
-                    photo = ImageTk.PhotoImage(img)
-                    self.placeholder_images[slot_name] = photo
-                    content_label.config(image=photo, text="")
-                    content_label.image = photo
-                except Exception as e:
-                    print(f"Err placeholder {placeholder_path}: {e}")
-                    content_label.config(text=slot_name[:3])
+            placeholder_size = (int(self.slot_size * 0.8), int(self.slot_size * 0.8))
+            photo = sized_image(self, placeholder_path, placeholder_size)
+            if photo:
+                self.placeholder_images[slot_name] = photo
+                content_label.config(image=photo, text="")
+                content_label.image = photo
             else:
                 default_text = "Wpn" if slot_name == "Weapon" else slot_name[:3]
                 content_label.config(text=default_text)
@@ -133,18 +139,18 @@ class EquipmentSlotsDisplay(tk.Frame):
             self.slot_content[slot_name] = content_label
 
     def _handle_single_click(self, slot_name, content_label):  # Inchangé
-        print(f"Single click detected on slot: {slot_name}")
+        logger.debug("Single click detected on slot: %s", slot_name)
         if (
             hasattr(content_label, "equipped_item_data")
             and content_label.equipped_item_data is not None
         ):
-            print(f"Item found in slot '{slot_name}'. Triggering unequip.")
+            logger.debug("Item found in slot '%s'. Triggering unequip.", slot_name)
             if self.on_unequip_callback:
                 self.on_unequip_callback(slot_name)
             else:
-                print("Warning: No unequip callback defined.")
+                logger.warning("No unequip callback defined.")
         else:
-            print(f"Slot '{slot_name}' is empty. No action.")
+            logger.debug("Slot '%s' is empty. No action.", slot_name)
 
     # --- CORRECTION ICI ---
     def _format_slot_tooltip_text(self, item_data):
@@ -183,22 +189,22 @@ class EquipmentSlotsDisplay(tk.Frame):
             text += "(No effects defined)"
         return text.strip()
 
+    @timed("EquipmentSlotsDisplay.update_slot")
     def update_slot(
         self, slot_name, item_data=None
     ):  # Correction appel HoverTooltip comme avant
-        print(f"--- Updating Slot: {slot_name} ---")
+        logger.debug("Updating Slot: %s", slot_name)
         if slot_name not in self.slots:
-            print(f"Erreur: Slot '{slot_name}' inconnu.")
+            logger.error("Slot '%s' inconnu.", slot_name)
             return
         content_label = self.slot_content.get(slot_name)
         if not content_label:
-            print(f"Erreur: Label non trouvé pour '{slot_name}'.")
+            logger.error("Label non trouvé pour '%s'.", slot_name)
             return
 
-        if slot_name in self.active_slot_tooltips:
-            print(f"Destroying old tooltip for {slot_name}")
-            self.active_slot_tooltips[slot_name].unbind()
-            del self.active_slot_tooltips[slot_name]
+        # La tooltip partagée lit ce texte : celle déjà affichée pour ce slot
+        # montrerait l'ancien item, on la cache
+        self.slot_tooltip.hide_for(content_label)
         content_label.tooltip_text = None
 
         if slot_name in self.equipped_item_images:
@@ -208,49 +214,25 @@ class EquipmentSlotsDisplay(tk.Frame):
         if item_data and isinstance(item_data, dict):
             content_label.equipped_item_data = item_data
             content_label.tooltip_text = self._format_slot_tooltip_text(item_data)
-            print(f"Creating tooltip for {slot_name}")
-            tooltip = HoverTooltip(
-                content_label,
-                delay_ms=400,
-                border_image_path="images/tooltip/tooltip_border.png",  # Vérifier ce chemin
-                content_padding=(8, 5),
-                text_bg="#2B2B2B",  # Renommé depuis 'bg'
-                text_fg="white",  # Renommé depuis 'fg'
-                font=("Segoe UI", 9),
-            )
-            self.active_slot_tooltips[slot_name] = tooltip
 
             img_path = item_data.get("local_image_path")
-            if img_path and os.path.exists(img_path):
-                print(f"Loading item image: {img_path}")
-                try:
-                    img = Image.open(img_path).resize(
-                        (int(self.slot_size * 0.9), int(self.slot_size * 0.9)),
-                        Image.Resampling.NEAREST,
-                    )
-                    photo = ImageTk.PhotoImage(img)
-                    content_label.config(image=photo, text="")
-                    content_label.image = photo
-                    self.equipped_item_images[slot_name] = photo
-                    print("Item image updated.")
-                except Exception as e:
-                    print(f"Err img item {img_path}: {e}")
-                    content_label.config(image="", text="ERR")
-                    hasattr(content_label, "image") and delattr(content_label, "image")
+            item_size = (int(self.slot_size * 0.9), int(self.slot_size * 0.9))
+            photo = sized_image(self, img_path, item_size) if img_path else None
+            if photo:
+                content_label.config(image=photo, text="")
+                content_label.image = photo
+                self.equipped_item_images[slot_name] = photo
             else:
-                print(f"No valid image path: {img_path}")
+                logger.debug("No valid image path: %s", img_path)
                 content_label.config(image="", text=item_data.get("name", "?")[:3])
                 hasattr(content_label, "image") and delattr(content_label, "image")
         else:  # Revenir au placeholder
-            print("Reverting to placeholder.")
             placeholder_photo = self.placeholder_images.get(slot_name)
             if placeholder_photo:
                 content_label.config(image=placeholder_photo, text="")
                 content_label.image = placeholder_photo
-                print("Placeholder image restored.")
             else:
                 default_text = "Wpn" if slot_name == "Weapon" else slot_name[:3]
                 content_label.config(image="", text=default_text)
                 hasattr(content_label, "image") and delattr(content_label, "image")
-                print("Placeholder text restored.")
-        print(f"--- Slot Update Complete: {slot_name} ---")
+
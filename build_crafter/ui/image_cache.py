@@ -0,0 +1,57 @@
+# ui/image_cache.py
+"""
+Cache partagé des images Tk.
+
+Une image (chemin, taille) n'est décodée et convertie en PhotoImage qu'une
+fois pour toute l'application, quel que soit le nombre de lignes qui l'affichent.
+Une PhotoImage n'existe que dans l'interpréteur Tk qui l'a créée : les caches
+sont propres à chaque racine et disparaissent avec elle (plusieurs fenêtres
+successives dans un même processus, ex. utils.ui_benchmark).
+"""
+import logging
+import os
+import weakref
+
+from PIL import Image, ImageTk
+
+logger = logging.getLogger(__name__)
+
+_thumbnails = weakref.WeakKeyDictionary()  # racine Tk -> {(chemin, taille): PhotoImage}
+_sized_images = weakref.WeakKeyDictionary()
+
+
+def thumbnail(master, img_path, size):
+    """PhotoImage réduite pour tenir dans `size` (proportions gardées), ou None."""
+    root = master._root()
+    cache = _thumbnails.setdefault(root, {})
+    key = (img_path, tuple(size))
+    if key in cache:
+        return cache[key]
+    photo = None
+    if img_path and os.path.exists(img_path):
+        try:
+            img = Image.open(img_path)
+            img.thumbnail(size, Image.Resampling.LANCZOS)
+            photo = ImageTk.PhotoImage(img, master=root)
+        except Exception as e:
+            logger.warning("Erreur chargement image %s: %s", img_path, e)
+    cache[key] = photo
+    return photo
+
+
+def sized_image(master, img_path, size):
+    """PhotoImage redimensionnée exactement à `size` (NEAREST, pixel art), ou None."""
+    root = master._root()
+    cache = _sized_images.setdefault(root, {})
+    key = (img_path, tuple(size))
+    if key in cache:
+        return cache[key]
+    photo = None
+    if img_path and os.path.exists(img_path):
+        try:
+            img = Image.open(img_path).resize(tuple(size), Image.Resampling.NEAREST)
+            photo = ImageTk.PhotoImage(img, master=root)
+        except Exception as e:
+            logger.warning("Erreur chargement image %s: %s", img_path, e)
+    cache[key] = photo
+    return photo
@@ -1,16 +1,26 @@
 # ui/item_detail_display.py
 import tkinter as tk
+from collections import OrderedDict
 from tkinter import ttk
-from PIL import Image, ImageTk
 import os
 
+from ui.image_cache import sized_image
+from ui.mousewheel import register_scroll_container
+from utils.instrumentation import timed
+
 
 class ItemDetailDisplay(tk.Frame):  # Reste un Frame comme conteneur principal
     """
     Affiche les détails d'un item sélectionné DANS UNE ZONE SCROLLABLE
     de hauteur fixe (définie par le parent via grid).
+    Les données d'affichage (image, niveaux, lignes de détails) sont préparées
+    une fois par item et gardées en cache ; prefetch() les prépare à l'avance.
+    Les lignes de détails et les boutons de niveau sont des widgets réutilisés :
+    changer d'item ou de niveau ne fait que modifier leur texte et leur visibilité.
     """
 
+    PREPARED_CACHE_SIZE = 16
+
     def __init__(
         self,
         parent,
@@ -18,6 +28,7 @@ class ItemDetailDisplay(tk.Frame):  # Reste un Frame comme conteneur principal
         fg_color="white",
         accent_color="#4E9AFA",
         on_equip_callback=None,
+        comparison_provider=None,
         *args,
         **kwargs,
     ):
@@ -28,15 +39,20 @@ class ItemDetailDisplay(tk.Frame):  # Reste un Frame comme conteneur principal
         self.fg_color = fg_color
         self.accent_color = accent_color
         self.on_equip_callback = on_equip_callback
+        # comparison_provider(item_data, niveau) -> texte des écarts avec l'équipement
+        self.comparison_provider = comparison_provider
         self.item_data = None
         self.selected_level = None
-        self.level_buttons = {}
+        self.level_buttons = {}  # niveau affiché -> widgets du pool
+        self.level_pool = []  # [{"frame", "button", "underline"}]
+        self.shown_levels = []  # Niveau porté par chaque bouton du pool
+        self.detail_row_pool = []  # [(libellé, valeur, séparateur)]
         self.image_reference = None
+        self._prepared = OrderedDict()  # id(item_data) -> données préparées (LRU)
 
-        # --- Variables de Debouncing (copiées de ItemListDisplay) ---
-        self._update_scroll_job = None
-        self._update_canvas_width_job = None
-        self._debounce_ms = 100  # Délai plus court peut-être?
+        # --- Mise en page différée (un seul callback idle à la fois) ---
+        self._layout_job = None
+        self._pending_canvas_width = None
 
         # --- Configuration de la grille du Frame principal (pour Canvas+Scrollbar) ---
         self.grid_rowconfigure(0, weight=1)
@@ -62,11 +78,9 @@ class ItemDetailDisplay(tk.Frame):  # Reste un Frame comme conteneur principal
         )
 
         # --- Lier les événements pour le scroll ---
-        self.scrollable_frame.bind("<Configure>", self._on_frame_configure_debounced)
-        self.canvas.bind("<Configure>", self._on_canvas_configure_debounced)
-        self._bind_mousewheel(self)  # Lier au Frame principal
-        self._bind_mousewheel(self.canvas)  # Lier aussi au canvas
-        self._bind_mousewheel(self.scrollable_frame)  # Lier au frame interne
+        self.scrollable_frame.bind("<Configure>", self._schedule_layout)
+        self.canvas.bind("<Configure>", self._on_canvas_configure)
+        register_scroll_container(self, self.canvas)  # Molette : tout le cadre
 
         # --- Configuration de la grille DANS scrollable_frame ---
         self.scrollable_frame.columnconfigure(0, weight=1)  # Une seule colonne
@@ -116,103 +130,82 @@ class ItemDetailDisplay(tk.Frame):  # Reste un Frame comme conteneur principal
         self.details_frame.grid(row=5, column=0, sticky="nsew", padx=20, pady=10)
         self.details_frame.columnconfigure(0, weight=0)
         self.details_frame.columnconfigure(1, weight=1)
-
-        # Lier la molette aux widgets internes importants
-        self._bind_mousewheel(self.name_label)
-        self._bind_mousewheel(self.image_label)
-        self._bind_mousewheel(self.level_selector_frame)
-        self._bind_mousewheel(self.equip_button)
-        self._bind_mousewheel(self.details_frame)
-
-    # --- Méthodes de Debouncing et Scroll (identiques à ItemListDisplay) ---
-    def _on_frame_configure_debounced(self, event=None):
-        if self._update_scroll_job:
-            self.after_cancel(self._update_scroll_job)
-        self._update_scroll_job = self.after(
-            self._debounce_ms, self._update_scrollregion
-        )
-
-    def _on_canvas_configure_debounced(self, event):
-        if self._update_canvas_width_job:
-            self.after_cancel(self._update_canvas_width_job)
-        self._update_canvas_width_job = self.after(
-            self._debounce_ms, lambda w=event.width: self._update_canvas_width(w)
+        self.details_title = tk.Label(
+            self.details_frame,
+            text="Details",
+            font=("Segoe UI", 12, "bold"),
+            bg=self.bg_color,
+            fg=self.fg_color,
+            anchor="w",
         )
-
-    def _update_scrollregion(self):
-        self._update_scroll_job = None
+        self.details_title.grid(row=0, column=0, columnspan=2, sticky="w", pady=(0, 10))
+        self.details_title.grid_remove()
+
+    # --- Mise en page : regroupée en un seul passage idle ---
+    def _schedule_layout(self, event=None):
+        """
+        Planifie la mise à jour de la scrollregion (et de la largeur du cadre).
+        Aucun calcul de géométrie forcé : Tk a déjà placé les widgets quand
+        le callback idle s'exécute, et plusieurs demandes n'en font qu'une.
+        """
+        if self._layout_job is None:
+            self._layout_job = self.after_idle(self._apply_layout)
+
+    def _on_canvas_configure(self, event):
+        self._pending_canvas_width = event.width
+        self._schedule_layout()
+
+    def _apply_layout(self):
+        self._layout_job = None
         try:
+            if self._pending_canvas_width is not None:
+                self.canvas.itemconfig(
+                    self.canvas_frame_id, width=self._pending_canvas_width
+                )
+                self._pending_canvas_width = None
             self.canvas.configure(scrollregion=self.canvas.bbox("all"))
         except tk.TclError:
             pass  # Widget peut être détruit
 
-    def _update_canvas_width(self, canvas_width):
-        self._update_canvas_width_job = None
-        try:
-            self.canvas.itemconfig(self.canvas_frame_id, width=canvas_width)
-        except tk.TclError:
-            pass  # Widget peut être détruit
-
-    def _bind_mousewheel(self, widget):
-        widget.bind("<MouseWheel>", self._on_mousewheel, add="+")
-        widget.bind("<Button-4>", self._on_mousewheel, add="+")
-        widget.bind("<Button-5>", self._on_mousewheel, add="+")
-
-    def _unbind_mousewheel(self, widget):  # Important pour le nettoyage
-        try:
-            widget.unbind("<MouseWheel>")
-            widget.unbind("<Button-4>")
-            widget.unbind("<Button-5>")
-        except tk.TclError:
-            pass
-
-    def _on_mousewheel(self, event):
-        if event.num == 4:
-            delta = -1
-        elif event.num == 5:
-            delta = 1
-        else:
-            delta_val = getattr(event, "delta", 0)
-            delta = -1 * int(delta_val / 120) if delta_val != 0 else 0
-        try:
-            self.canvas.yview_scroll(delta, "units")
-        except tk.TclError:
-            pass
-        return "break"
-
     # --- Logique interne (_clear_display, _select_level, etc.) ---
     def _clear_display(self):
         self.item_data = None
         self.selected_level = None
         self.image_reference = None
-        # Vider les frames internes
-        for widget in self.level_selector_frame.winfo_children():
-            self._unbind_mousewheel(widget)
-            widget.destroy()
-        for widget in self.details_frame.winfo_children():
-            self._unbind_mousewheel(widget)
-            widget.destroy()
+        # Masquer les widgets réutilisables
+        self._show_levels([])
+        self._show_detail_rows([])
         # Mettre à jour les labels/boutons principaux (qui restent)
         self.name_label.config(text="")
         self.image_label.config(image="")
         self.equip_button.config(state=tk.DISABLED)
-        self.level_buttons = {}
         # Reset scroll
         try:
             self.canvas.yview_moveto(0)
-            self._update_scrollregion()
         except tk.TclError:
             pass
+        self._schedule_layout()
 
-    def _select_level(
-        self, level
-    ):  # S'assure de mettre à jour la scrollregion après changement
+    def _select_level(self, level):
         if self.item_data is None or str(level) not in self.item_data.get("levels", {}):
             return
+        # Niveau accepté : alors seulement les boutons changent de style
         self.selected_level = level
+        self._style_level_buttons()
+        self._populate_details()
+        self._schedule_layout()
+
+    def _style_level_buttons(self):
+        """
+        Met en évidence le bouton du niveau sélectionné (aucun si None) ; seuls
+        les boutons dont l'état change sont reconfigurés.
+        """
         for lvl, widgets in self.level_buttons.items():
+            is_selected = lvl == self.selected_level
+            if widgets["selected"] == is_selected:
+                continue
+            widgets["selected"] = is_selected
             button, underline = widgets["button"], widgets["underline"]
-            is_selected = lvl == level
             button.config(
                 fg=self.fg_color if is_selected else "#AAAAAA",
                 font=("Segoe UI", 11, "bold" if is_selected else "normal"),
@@ -220,69 +213,63 @@ class ItemDetailDisplay(tk.Frame):  # Reste un Frame comme conteneur principal
             underline.config(
                 bg=self.accent_color if is_selected else self.bg_color, height=2
             )
-        self._populate_details()
-        # --- Mettre à jour la scrollregion après avoir peuplé les détails ---
-        self.update_idletasks()  # Forcer le calcul de la nouvelle taille
-        self._on_frame_configure_debounced()  # Planifier la mise à jour
 
-    def _populate_levels(self):  # S'assure de lier la molette aux nouveaux widgets
-        # ... (logique de création des boutons comme avant) ...
+    def _populate_levels(self):
         if self.item_data is None:
             return
-        # Vider l'ancien contenu
-        for widget in self.level_selector_frame.winfo_children():
-            self._unbind_mousewheel(widget)
-            widget.destroy()
+        prepared = self._prepare(self.item_data)
+        self._show_levels(prepared["levels"])
+        if prepared["levels"]:
+            self._select_level(prepared["initial_level"])
+
+    def _show_levels(self, levels):
+        """Affiche un bouton par niveau en réutilisant ceux du pool."""
+        while len(self.level_pool) < len(levels):
+            self.level_pool.append(self._create_level_button(len(self.level_pool)))
+        self.shown_levels = list(levels)
         self.level_buttons = {}
-        # ... (logique pour trouver available_levels) ...
-        levels_dict = self.item_data.get("levels", {})
-        min_level = self.item_data.get("min_level")
-        if not levels_dict or min_level is None:
-            return
-        try:
-            available_levels = sorted([int(k) for k in levels_dict.keys()])
-            assert available_levels
-        except:
-            available_levels = [min_level] if min_level else []
-        current_col = 1
-        for i, level in enumerate(available_levels):
-            level_frame = tk.Frame(self.level_selector_frame, bg=self.bg_color)
-            level_frame.grid(row=0, column=current_col, padx=5, sticky="n")
-            current_col += 1
-            button = tk.Button(
-                level_frame,
-                text=str(level),
-                font=("Segoe UI", 11, "normal"),
-                fg="#AAAAAA",
-                bg=self.bg_color,
-                relief=tk.FLAT,
-                bd=0,
-                activebackground=self.bg_color,
-                activeforeground=self.fg_color,
-                cursor="hand2",
-                command=lambda l=level: self._select_level(l),
-            )
-            button.pack()
-            underline = tk.Frame(level_frame, height=2, bg=self.bg_color)
-            underline.pack(fill=tk.X, pady=(2, 0))
-            self.level_buttons[level] = {"button": button, "underline": underline}
-            # --- Lier la molette aux nouveaux éléments ---
-            self._bind_mousewheel(level_frame)
-            self._bind_mousewheel(button)
-            self._bind_mousewheel(underline)
-        initial_level = min(available_levels) if available_levels else None
-        if min_level in available_levels:
-            initial_level = min_level
-        if initial_level is not None:
-            self._select_level(initial_level)
-
-    def _add_detail_row(
-        self, row_index, label_text, value_text
-    ):  # S'assure de lier la molette
-        # ... (création label, value, sep comme avant) ...
+        for i, widgets in enumerate(self.level_pool):
+            if i < len(levels):
+                widgets["button"].config(text=str(levels[i]))
+                widgets["frame"].grid()
+                self.level_buttons[levels[i]] = widgets
+            else:
+                widgets["frame"].grid_remove()
+        # Boutons réutilisés : pas de mise en évidence héritée de l'item précédent
+        # tant qu'aucun niveau n'est accepté (_select_level)
+        self._style_level_buttons()
+
+    def _create_level_button(self, index):
+        level_frame = tk.Frame(self.level_selector_frame, bg=self.bg_color)
+        level_frame.grid(row=0, column=index + 1, padx=5, sticky="n")
+        button = tk.Button(
+            level_frame,
+            text="",
+            font=("Segoe UI", 11, "normal"),
+            fg="#AAAAAA",
+            bg=self.bg_color,
+            relief=tk.FLAT,
+            bd=0,
+            activebackground=self.bg_color,
+            activeforeground=self.fg_color,
+            cursor="hand2",
+            command=lambda i=index: self._select_level(self.shown_levels[i]),
+        )
+        button.pack()
+        underline = tk.Frame(level_frame, height=2, bg=self.bg_color)
+        underline.pack(fill=tk.X, pady=(2, 0))
+        return {
+            "frame": level_frame,
+            "button": button,
+            "underline": underline,
+            "selected": False,
+        }
+
+    def _create_detail_row(self, index):
+        row_index = 1 + 2 * index  # Ligne 0 : titre "Details"
         label = tk.Label(
             self.details_frame,
-            text=label_text,
+            text="",
             font=("Segoe UI", 10, "bold"),
             bg=self.bg_color,
             fg=self.fg_color,
@@ -291,7 +278,7 @@ class ItemDetailDisplay(tk.Frame):  # Reste un Frame comme conteneur principal
         label.grid(row=row_index, column=0, sticky="nw", padx=(0, 15), pady=2)
         value = tk.Label(
             self.details_frame,
-            text=value_text,
+            text="",
             font=("Segoe UI", 10),
             bg=self.bg_color,
             fg="#DDDDDD",
@@ -302,42 +289,114 @@ class ItemDetailDisplay(tk.Frame):  # Reste un Frame comme conteneur principal
         value.grid(row=row_index, column=1, sticky="ew", pady=2)
         sep = ttk.Separator(self.details_frame, orient="horizontal")
         sep.grid(row=row_index + 1, column=0, columnspan=2, sticky="ew", pady=(5, 5))
-        # --- Lier la molette ---
-        self._bind_mousewheel(label)
-        self._bind_mousewheel(value)
-        self._bind_mousewheel(sep)
-        return row_index + 2
+        return label, value, sep
 
-    def _populate_details(self):  # S'assure de lier la molette
+    def _show_detail_rows(self, rows):
+        """Affiche les lignes (libellé, valeur) en réutilisant celles du pool."""
+        while len(self.detail_row_pool) < len(rows):
+            self.detail_row_pool.append(
+                self._create_detail_row(len(self.detail_row_pool))
+            )
+        if rows:
+            self.details_title.grid()
+        else:
+            self.details_title.grid_remove()
+        for i, (label, value, sep) in enumerate(self.detail_row_pool):
+            if i < len(rows):
+                label_text, value_text = rows[i]
+                label.config(text=label_text)
+                value.config(text=value_text)
+                label.grid()
+                value.grid()
+                # Pas de séparateur après la dernière ligne
+                if i < len(rows) - 1:
+                    sep.grid()
+                else:
+                    sep.grid_remove()
+            else:
+                label.grid_remove()
+                value.grid_remove()
+                sep.grid_remove()
+
+    def _populate_details(self):
         if self.item_data is None or self.selected_level is None:
             return
-        # Vider l'ancien contenu des détails et délier la molette
-        for widget in self.details_frame.winfo_children():
-            self._unbind_mousewheel(widget)
-            widget.destroy()
-        row = 0
-        details_title = tk.Label(
-            self.details_frame,
-            text="Details",
-            font=("Segoe UI", 12, "bold"),
-            bg=self.bg_color,
-            fg=self.fg_color,
-            anchor="w",
-        )
-        details_title.grid(row=row, column=0, columnspan=2, sticky="w", pady=(0, 10))
-        self._bind_mousewheel(details_title)
-        row += 1
-        # ... (appels à _add_detail_row comme avant, ils lieront la molette) ...
-        row = self._add_detail_row(row, "Type", self.item_data.get("slot", "N/A"))
-        row = self._add_detail_row(row, "Rarity", self.item_data.get("rarity", "N/A"))
-        row = self._add_detail_row(row, "Level", str(self.selected_level))
-        row = self._add_detail_row(row, "Slot", self.item_data.get("slot", "N/A"))
-        row = self._add_detail_row(
-            row, "Durability", str(self.item_data.get("durability", "N/A"))
-        )
+        rows = []
+        for label_text, value_text in self._detail_rows(
+            self._prepare(self.item_data), self.selected_level
+        ):
+            if value_text is None:  # Comparaison : dépend de l'équipement
+                if not self.comparison_provider:
+                    continue
+                value_text = self.comparison_provider(
+                    self.item_data, self.selected_level
+                )
+                if not value_text:
+                    continue
+            rows.append((label_text, value_text))
+        self._show_detail_rows(rows)
+
+    # --- Données d'affichage préparées (cache + préchargement) ---
+    def _prepare(self, item_data):
+        """Image, niveaux disponibles et niveau initial d'un item (en cache)."""
+        key = id(item_data)
+        prepared = self._prepared.get(key)
+        if prepared is not None and prepared["item"] is item_data:
+            self._prepared.move_to_end(key)
+            return prepared
+        levels_dict = item_data.get("levels", {})
+        min_level = item_data.get("min_level")
+        available_levels = []
+        if levels_dict and min_level is not None:
+            try:
+                available_levels = sorted([int(k) for k in levels_dict.keys()])
+                assert available_levels
+            except:
+                available_levels = [min_level] if min_level else []
+        initial_level = min(available_levels) if available_levels else None
+        if min_level in available_levels:
+            initial_level = min_level
+        photo, image_text = self._load_image(item_data.get("local_image_path"))
+        prepared = {
+            "item": item_data,
+            "photo": photo,
+            "image_text": image_text,
+            "levels": available_levels,
+            "initial_level": initial_level,
+            "rows": {},  # niveau -> [(libellé, valeur)]
+        }
+        self._prepared[key] = prepared
+        if len(self._prepared) > self.PREPARED_CACHE_SIZE:
+            self._prepared.popitem(last=False)
+        return prepared
+
+    def _load_image(self, img_path):
+        """Retourne (PhotoImage, "") ou (None, texte de remplacement)."""
+        if not img_path or not os.path.exists(img_path):
+            return None, "No Img"
+        photo = sized_image(self, img_path, (64, 64))
+        return (photo, "") if photo is not None else (None, "Img Err")
+
+    def _detail_rows(self, prepared, level):
+        """
+        Lignes (libellé, valeur) des détails d'un item à un niveau.
+        La valeur None marque la ligne de comparaison, calculée à l'affichage.
+        """
+        rows = prepared["rows"].get(level)
+        if rows is not None:
+            return rows
+        item_data = prepared["item"]
+        rows = [
+            ("Type", item_data.get("slot", "N/A")),
+            ("Rarity", item_data.get("rarity", "N/A")),
+            ("Level", str(level)),
+            ("Slot", item_data.get("slot", "N/A")),
+            ("Durability", str(item_data.get("durability", "N/A"))),
+        ]
         effects_str = "N/A"
-        levels_data = self.item_data.get("levels", {})
-        level_key = str(self.selected_level)
+        effects_list = []
+        levels_data = item_data.get("levels", {})
+        level_key = str(level)
         if level_key in levels_data:
             effects_list = levels_data[level_key].get("effects", [])
         if effects_list and isinstance(effects_list, list):
@@ -347,57 +406,58 @@ class ItemDetailDisplay(tk.Frame):  # Reste un Frame comme conteneur principal
                     for eff in effects_list
                 ]
             )
-        row = self._add_detail_row(row, "Effects", effects_str)
-        row = self._add_detail_row(row, "Tooltip", self.item_data.get("tooltip", "N/A"))
-        categories = self.item_data.get("category", ["N/A"])
-        row = self._add_detail_row(row, "Category", ", ".join(categories))
-        sell_value = self.item_data.get("sell_value")
-        sell_text = str(sell_value) + "c" if sell_value is not None else "N/A"
-        row = self._add_detail_row(row, "Sell", sell_text)
-        set_bonus = self.item_data.get("set_bonus")
+        rows.append(("Effects", effects_str))
+        rows.append(("Vs équipé", None))
+        rows.append(("Tooltip", item_data.get("tooltip", "N/A")))
+        categories = item_data.get("category", ["N/A"])
+        rows.append(("Category", ", ".join(categories)))
+        sell_value = item_data.get("sell_value")
+        rows.append(("Sell", str(sell_value) + "c" if sell_value is not None else "N/A"))
+        set_bonus = item_data.get("set_bonus")
         if set_bonus:
             bonus_text = f"{set_bonus.get('bonus', 'N/A')} ({set_bonus.get('pieces_required', '?')}p)"
-            row = self._add_detail_row(row, "Set Bonus", bonus_text)
-        children = self.details_frame.winfo_children()
-        if children and isinstance(children[-1], ttk.Separator):
-            self._unbind_mousewheel(children[-1])
-            children[-1].destroy()
+            rows.append(("Set Bonus", bonus_text))
+        prepared["rows"][level] = rows
+        return rows
+
+    def prefetch(self, items):
+        """Prépare à l'avance l'affichage de ces items (appelé en idle)."""
+        for item_data in items:
+            if isinstance(item_data, dict):
+                prepared = self._prepare(item_data)
+                if prepared["initial_level"] is not None:
+                    self._detail_rows(prepared, prepared["initial_level"])
+
+    def refresh_details(self):
+        """Recalcule les lignes de détails (ex. après un changement d'équipement)."""
+        if self.item_data is None or self.selected_level is None:
+            return
+        self._populate_details()
+        self._schedule_layout()
 
     def _handle_equip_click(self):  # Inchangé
         if self.item_data and self.on_equip_callback:
             self.on_equip_callback(self.item_data)
 
-    def update_display(self, item_data):  # Met à jour scrollregion et scroll to top
+    @timed("ItemDetailDisplay.update_display", until_idle=True)
+    def update_display(self, item_data):
         self._clear_display()
         self.item_data = item_data
         if self.item_data is None or not isinstance(self.item_data, dict):
             self.name_label.config(text="Sélectionnez un item")
             self.equip_button.config(state=tk.DISABLED)
-            # --- Mise à jour scrollregion même si vide ---
-            self.update_idletasks()
-            self._on_frame_configure_debounced()
             return  # Pas de hauteur à retourner
 
         self.equip_button.config(state=tk.NORMAL)
         self.name_label.config(text=self.item_data.get("name", "Item Inconnu"))
-        # ... (Image loading) ...
-        img_path = self.item_data.get("local_image_path")
-        if img_path and os.path.exists(img_path):
-            try:
-                img = Image.open(img_path).resize((64, 64), Image.Resampling.NEAREST)
-                self.image_reference = ImageTk.PhotoImage(img)
-                self.image_label.config(image=self.image_reference)
-            except Exception as e:
-                print(f"Err img {img_path}: {e}")
-                self.image_label.config(text="Img Err", image="")
-                self.image_reference = None
+        prepared = self._prepare(self.item_data)
+        self.image_reference = prepared["photo"]
+        if self.image_reference is not None:
+            self.image_label.config(image=self.image_reference)
         else:
-            self.image_label.config(text="No Img", image="")
-            self.image_reference = None
+            self.image_label.config(text=prepared["image_text"], image="")
         self._populate_levels()  # Ceci appelle _populate_details
-        # --- Mise à jour scrollregion et scroll to top APRÈS avoir peuplé ---
-        self.update_idletasks()  # S'assurer que tout est dessiné
-        self._on_frame_configure_debounced()  # Planifier la mise à jour de la scroll region
+        # La scrollregion suivra en idle (planifiée par _clear_display)
         try:
             self.canvas.yview_moveto(0)  # Remettre le scroll en haut
         except tk.TclError:
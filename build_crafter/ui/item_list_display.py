@@ -1,9 +1,15 @@
 # ui/item_list_display.py
+import logging
 import tkinter as tk
 from tkinter import ttk
 from PIL import Image, ImageTk
 import os
 
+from ui.mousewheel import register_scroll_container
+from utils.instrumentation import timed
+
+logger = logging.getLogger(__name__)
+
 
 class ItemListDisplay(tk.Frame):
     """
@@ -12,6 +18,11 @@ class ItemListDisplay(tk.Frame):
     Appelle un callback lorsqu'un item est sélectionné.
     """
 
+    SELECTION_GUTTER = 6  # Bande à gauche des lignes où est dessiné le repère de sélection
+    SELECTION_COLOR = "#4E9AFA"
+    BADGE_COLORS = {1: "#2E7D32", -1: "#C62828", 0: "grey"}
+    POPULATE_CHUNK_SIZE = 40  # Lignes créées par callback (remplissage différé)
+
     # Ajouter le paramètre callback ici
     def __init__(
         self,
@@ -19,6 +30,8 @@ class ItemListDisplay(tk.Frame):
         item_image_size=(32, 32),
         bg_color="white",
         on_item_select_callback=None,  # <<< Ajouté
+        badge_provider=None,
+        prefetch_callback=None,
         *args,
         **kwargs,
     ):
@@ -29,9 +42,20 @@ class ItemListDisplay(tk.Frame):
         self.on_item_select_callback = (
             on_item_select_callback  # <<< Stocker le callback
         )
-        self.selected_widget = (
-            None  # Pour garder une trace de l'item sélectionné visuellement
-        )
+        # Sélection suivie par identité d'item (survit au re-filtrage de la liste)
+        self.selected_item_id = None
+        self.row_widgets = []  # Alignés sur displayed_items
+        self.row_positions = {}  # id(item_data) -> position dans displayed_items
+        # badge_provider(items) -> [(texte, signe), ...] : écart avec l'équipement
+        self.badge_provider = badge_provider
+        # prefetch_callback(items) : appelé en idle avec les voisins de la sélection
+        self.prefetch_callback = prefetch_callback
+        self._prefetch_job = None
+        self._layout_job = None  # Mise en page différée (un seul callback idle)
+        self._populate_job = None  # Prochaine tranche du remplissage différé
+        self._pending_canvas_width = None
+        self.displayed_items = []
+        self.badge_labels = []
 
         # ... (Configuration grille, Canvas, Scrollbar, item_frame - inchangés) ...
         self.grid_rowconfigure(0, weight=1)
@@ -41,55 +65,63 @@ class ItemListDisplay(tk.Frame):
         self.scrollbar = ttk.Scrollbar(
             self, orient="vertical", command=self.canvas.yview
         )
-        self.item_frame = tk.Frame(self.canvas, background=self.bg_color)
 
         self.canvas.configure(yscrollcommand=self.scrollbar.set)
         self.canvas.grid(row=0, column=0, sticky="nsew")
         self.scrollbar.grid(row=0, column=1, sticky="ns")
-        self.canvas_frame_id = self.canvas.create_window(
-            (0, 0), window=self.item_frame, anchor="nw"
+        # Un seul rectangle pour la sélection : un clic ne fait que le déplacer
+        self.selection_marker = self.canvas.create_rectangle(
+            0, 0, 0, 0, fill=self.SELECTION_COLOR, outline="", state="hidden"
         )
-
-        self.item_frame.bind("<Configure>", self._on_frame_configure)
+        self._setup_rows()
         self.canvas.bind("<Configure>", self._on_canvas_configure)
 
-        self._bind_mousewheel(self)
-        self._bind_mousewheel(self.canvas)
+        # --- Navigation clavier (le canvas prend le focus au clic) ---
+        key_steps = {
+            "<Up>": lambda: -1,
+            "<Down>": lambda: 1,
+            "<Prior>": lambda: -self._page_size(),
+            "<Next>": lambda: self._page_size(),
+        }
+        for sequence, step in key_steps.items():
+            self.canvas.bind(
+                sequence, lambda event, step=step: self.move_selection(step())
+            )
+        self.canvas.bind("<Home>", lambda event: self.move_selection_to(0))
+        self.canvas.bind("<End>", lambda event: self.move_selection_to(-1))
 
-    # ... (_on_frame_configure, _on_canvas_configure, _bind_mousewheel, _unbind_mousewheel, _on_mousewheel - inchangés) ...
-    def _on_frame_configure(self, event=None):
-        self.canvas.configure(scrollregion=self.canvas.bbox("all"))
+        register_scroll_container(self, self.canvas)
+
+    def _setup_rows(self):
+        """Conteneur des lignes : un Frame par item dans un Frame du canvas."""
+        self.item_frame = tk.Frame(self.canvas, background=self.bg_color)
+        self.canvas_frame_id = self.canvas.create_window(
+            (self.SELECTION_GUTTER, 0), window=self.item_frame, anchor="nw"
+        )
+        self.item_frame.bind("<Configure>", self._schedule_layout)
+
+    def _schedule_layout(self, event=None):
+        """Regroupe scrollregion, largeur et repère de sélection en un callback idle."""
+        if self._layout_job is None:
+            self._layout_job = self.after_idle(self._apply_layout)
 
     def _on_canvas_configure(self, event):
-        canvas_width = event.width
-        self.canvas.itemconfig(self.canvas_frame_id, width=canvas_width)
-
-    def _bind_mousewheel(self, widget):
-        widget.bind("<MouseWheel>", self._on_mousewheel, add="+")
-        widget.bind("<Button-4>", self._on_mousewheel, add="+")
-        widget.bind("<Button-5>", self._on_mousewheel, add="+")
-
-    def _unbind_mousewheel(self, widget):
-        widget.unbind("<MouseWheel>")
-        widget.unbind("<Button-4>")
-        widget.unbind("<Button-5>")
-
-    def _on_mousewheel(self, event):
-        if event.num == 4:
-            delta = -1
-        elif event.num == 5:
-            delta = 1
-        else:
-            delta_val = getattr(event, "delta", 0)
-            delta = -1 * int(delta_val / 120) if delta_val != 0 else 0
-        self.canvas.yview_scroll(delta, "units")
-        return "break"
+        self._pending_canvas_width = event.width - self.SELECTION_GUTTER
+        self._schedule_layout()
+
+    def _apply_layout(self):
+        self._layout_job = None
+        if self._pending_canvas_width is not None:
+            self.canvas.itemconfig(
+                self.canvas_frame_id, width=self._pending_canvas_width
+            )
+            self._pending_canvas_width = None
+        self.canvas.configure(scrollregion=self.canvas.bbox("all"))
+        self._place_selection_marker()
 
     def _create_item_widget(self, parent_frame, item_dict):
         """Crée le widget pour un seul item et lie l'événement clic."""
-        # Utiliser une couleur de fond légèrement différente pour la sélection
         normal_bg = self.bg_color
-        selected_bg = "#D8D8D8"  # Gris clair pour la sélection
 
         item_widget = tk.Frame(
             parent_frame, background=normal_bg, borderwidth=1, relief=tk.SOLID
@@ -114,11 +146,17 @@ class ItemListDisplay(tk.Frame):
                 self.image_references.append(photo_img)
                 img_label.config(image=photo_img)
             except Exception as e:
-                print(f"Erreur chargement image {img_path}: {e}")
+                logger.warning("Erreur chargement image %s: %s", img_path, e)
                 img_label.config(text="N/A")
         else:
             img_label.config(text="?")
 
+        badge_label = tk.Label(
+            item_widget, text="", background=normal_bg, font=("Segoe UI", 8)
+        )
+        badge_label.pack(side=tk.RIGHT, padx=5, pady=2)
+        self.badge_labels.append(badge_label)
+
         name = item_dict.get("name", "Nom Inconnu")
         name_label = tk.Label(
             item_widget, text=name, background=normal_bg, anchor="w", justify=tk.LEFT
@@ -126,8 +164,6 @@ class ItemListDisplay(tk.Frame):
         name_label.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5, pady=2)
 
         item_widget.item_data = item_dict  # Stocke les données
-        item_widget.normal_bg = normal_bg  # Stocke la couleur normale
-        item_widget.selected_bg = selected_bg  # Stocke la couleur sélectionnée
 
         # --- Lier le clic ---
         # Utiliser lambda pour passer le widget cliqué à la fonction de gestion
@@ -135,70 +171,203 @@ class ItemListDisplay(tk.Frame):
         item_widget.bind("<Button-1>", click_handler)
         img_label.bind("<Button-1>", click_handler)
         name_label.bind("<Button-1>", click_handler)
-
-        # Lier aussi la molette pour ces widgets
-        self._bind_mousewheel(item_widget)
-        self._bind_mousewheel(img_label)
-        self._bind_mousewheel(name_label)
+        badge_label.bind("<Button-1>", click_handler)
 
         return item_widget
 
     def _on_item_click(self, clicked_widget):
         """Gère le clic sur un widget d'item."""
-        # --- Gérer la sélection visuelle ---
-        # Désélectionner l'ancien widget s'il existe
-        if self.selected_widget and self.selected_widget != clicked_widget:
-            try:  # Ajouter un try-except au cas où le widget aurait été détruit
-                self.selected_widget.config(background=self.selected_widget.normal_bg)
-                for child in self.selected_widget.winfo_children():
-                    child.config(background=self.selected_widget.normal_bg)
-            except tk.TclError:
-                self.selected_widget = None  # Le widget n'existe plus
-
-        # Sélectionner le nouveau widget
-        if self.selected_widget != clicked_widget:
-            clicked_widget.config(background=clicked_widget.selected_bg)
-            for child in clicked_widget.winfo_children():
-                child.config(background=clicked_widget.selected_bg)
-            self.selected_widget = clicked_widget
-        else:  # Si on clique à nouveau sur le même, on pourrait désélectionner
-            clicked_widget.config(background=clicked_widget.normal_bg)
-            for child in clicked_widget.winfo_children():
-                child.config(background=clicked_widget.normal_bg)
-            self.selected_widget = None
-            # Appeler le callback avec None pour effacer les stats ? Optionnel.
+        item_data = clicked_widget.item_data  # Récupérer les données associées
+        self._on_row_click(self.row_positions[id(item_data)])
+
+    def _on_row_click(self, position):
+        """Sélectionne la ligne, ou la désélectionne si elle l'était déjà."""
+        item_data = self.displayed_items[position]
+        self.canvas.focus_set()
+        if self.selected_item_id == id(item_data):
+            # Si on clique à nouveau sur le même, on désélectionne
+            self.clear_selection()
             if self.on_item_select_callback:
                 self.on_item_select_callback(None)
-            return  # Sortir pour ne pas rappeler le callback avec l'item
+            return
+        self.select_index(position)
 
-        # --- Appeler le callback ---
+    def select_index(self, position):
+        """Sélectionne la ligne à cette position et appelle le callback."""
+        item_data = self.displayed_items[position]
+        self.selected_item_id = id(item_data)
+        self._place_selection_marker()
         if self.on_item_select_callback:
-            item_data = clicked_widget.item_data  # Récupérer les données associées
             self.on_item_select_callback(item_data)
+        self._schedule_prefetch(position)
+
+    def move_selection(self, step):
+        """Déplace la sélection de `step` lignes (flèches, pages)."""
+        if self.displayed_items:
+            position = self.selected_index()
+            if position is None:
+                target = 0 if step > 0 else len(self.displayed_items) - 1
+            else:
+                target = max(0, min(len(self.displayed_items) - 1, position + step))
+            self._move_selection_to_target(position, target)
+        return "break"
+
+    def move_selection_to(self, target):
+        """Sélectionne la ligne `target` (négative : depuis la fin), ex. début/fin."""
+        if self.displayed_items:
+            target %= len(self.displayed_items)
+            self._move_selection_to_target(self.selected_index(), target)
+        return "break"
+
+    def _move_selection_to_target(self, position, target):
+        if target != position:
+            self.select_index(target)
+            self._scroll_to_row(target)
+
+    def _row_bounds(self, position):
+        """(haut, bas) de la ligne en coordonnées du canvas."""
+        row = self.row_widgets[position]
+        top = row.winfo_y()
+        return top, top + row.winfo_height()
+
+    def _content_height(self):
+        return self.item_frame.winfo_height()
+
+    def _page_size(self):
+        """Nombre de lignes visibles (au moins 1)."""
+        if not self.displayed_items:
+            return 1
+        top, bottom = self._row_bounds(0)
+        return max(1, self.canvas.winfo_height() // max(1, bottom - top))
+
+    def _scroll_to_row(self, position):
+        """Fait défiler juste assez pour que la ligne soit entièrement visible."""
+        total_height = self._content_height()
+        if total_height <= 1:
+            return
+        top, bottom = self._row_bounds(position)
+        view_top = self.canvas.canvasy(0)
+        view_height = self.canvas.winfo_height()
+        if top < view_top:
+            self.canvas.yview_moveto(top / total_height)
+        elif bottom > view_top + view_height:
+            self.canvas.yview_moveto((bottom - view_height) / total_height)
+
+    def _schedule_prefetch(self, position):
+        """Prépare en idle l'affichage des items précédent et suivant."""
+        if not self.prefetch_callback:
+            return
+        if self._prefetch_job:
+            self.after_cancel(self._prefetch_job)
+        self._prefetch_job = self.after_idle(self._prefetch_neighbors, position)
+
+    def _prefetch_neighbors(self, position):
+        self._prefetch_job = None
+        neighbors = [
+            self.displayed_items[p]
+            for p in (position + 1, position - 1)
+            if 0 <= p < len(self.displayed_items)
+        ]
+        if neighbors:
+            self.prefetch_callback(neighbors)
+
+    def clear_selection(self):
+        self.selected_item_id = None
+        self.canvas.itemconfig(self.selection_marker, state="hidden")
+
+    def selected_index(self):
+        """Position de l'item sélectionné dans la liste affichée (None si absent)."""
+        return self.row_positions.get(self.selected_item_id)
+
+    def _place_selection_marker(self):
+        """Déplace le rectangle de sélection en face de la ligne sélectionnée."""
+        position = self.selected_index()
+        if position is None:
+            self.canvas.itemconfig(self.selection_marker, state="hidden")
+            return
+        top, bottom = self._row_bounds(position)
+        self.canvas.coords(
+            self.selection_marker, 0, top, self.SELECTION_GUTTER - 1, bottom
+        )
+        self.canvas.itemconfig(self.selection_marker, state="normal")
 
     # ... (display_items reste conceptuellement pareil, mais appelle _create_item_widget qui lie le clic) ...
+    @timed("ItemListDisplay.display_items")
     def display_items(self, items_list):
-        # Vider l'ancien contenu
-        for widget in self.item_frame.winfo_children():
-            self._unbind_mousewheel(widget)
-            # Délier aussi le clic avant de détruire
-            widget.unbind("<Button-1>")
-            if hasattr(widget, "winfo_children"):
-                for sub_widget in widget.winfo_children():
-                    self._unbind_mousewheel(sub_widget)
-                    sub_widget.unbind("<Button-1>")
+        self._cancel_population()
+        # Vider l'ancien contenu (destroy retire aussi les liaisons des enfants)
+        for widget in self.row_widgets:
             widget.destroy()
         self.image_references.clear()
-        self.selected_widget = None  # Réinitialiser la sélection
+        self.displayed_items = []
+        self.row_widgets = []
+        self.row_positions = {}
+        self.badge_labels = []
 
         # Créer et ajouter les nouveaux widgets
-        if items_list:
-            for item_dict in items_list:
-                if isinstance(item_dict, dict):
-                    widget = self._create_item_widget(self.item_frame, item_dict)
-                else:
-                    print(f"Erreur: L'entrée n'est pas un dictionnaire: {item_dict}")
-
-        self.item_frame.update_idletasks()
-        self._on_frame_configure()
+        self.canvas.itemconfig(self.selection_marker, state="hidden")
+        self._append_rows(items_list or [])
         self.canvas.yview_moveto(0)
+
+    def _append_rows(self, items_list):
+        """Ajoute des lignes en fin de liste (badges calculés pour elles seules)."""
+        first = len(self.displayed_items)
+        for item_dict in items_list:
+            if isinstance(item_dict, dict):
+                widget = self._create_item_widget(self.item_frame, item_dict)
+                self.row_positions[id(item_dict)] = len(self.displayed_items)
+                self.displayed_items.append(item_dict)
+                self.row_widgets.append(widget)
+            else:
+                logger.error("L'entrée n'est pas un dictionnaire: %r", item_dict)
+        self._apply_badges(self.displayed_items[first:], self.badge_labels[first:])
+
+        # Scrollregion et repère de sélection (s'il figure encore dans la
+        # liste) sont mis à jour ensemble en idle, une fois les lignes placées
+        self._schedule_layout()
+
+    # --- Remplissage différé (premier affichage de la fenêtre) ---
+    def display_items_deferred(self, items_list):
+        """
+        Vide la liste puis la remplit par tranches de POPULATE_CHUNK_SIZE, une
+        par callback after() lancé après le passage idle (mise en page, dessin)
+        précédent : la fenêtre s'affiche et reste réactive pendant le
+        remplissage. Un display_items() l'interrompt (ex. filtrage).
+        """
+        self.display_items([])
+        self._populate_job = self.after_idle(
+            self._queue_next_chunk, list(items_list or []), 0
+        )
+
+    def _queue_next_chunk(self, items_list, start):
+        self._populate_job = self.after(0, self._populate_chunk, items_list, start)
+
+    def _populate_chunk(self, items_list, start):
+        end = start + self.POPULATE_CHUNK_SIZE
+        self._populate_job = None
+        self._append_rows(items_list[start:end])
+        if end < len(items_list):
+            self._populate_job = self.after_idle(
+                self._queue_next_chunk, items_list, end
+            )
+
+    @property
+    def populating(self):
+        """Vrai tant qu'un remplissage différé n'est pas terminé."""
+        return self._populate_job is not None
+
+    def _cancel_population(self):
+        if self._populate_job:
+            self.after_cancel(self._populate_job)
+            self._populate_job = None
+
+    def refresh_badges(self):
+        """Met à jour le texte des badges d'écart sans reconstruire les lignes."""
+        self._apply_badges(self.displayed_items, self.badge_labels)
+
+    def _apply_badges(self, items, labels):
+        if not self.badge_provider or not items:
+            return
+        badges = self.badge_provider(items)
+        for label, (text, sign) in zip(labels, badges):
+            label.config(text=text, fg=self.BADGE_COLORS.get(sign, "grey"))
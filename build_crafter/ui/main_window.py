@@ -1,10 +1,21 @@
 # ui/main_window.py
+import logging
 import tkinter as tk
 
 # Importer les composants
 from ui.search_zone import SearchZone
 from ui.item_detail_display import ItemDetailDisplay
 from ui.equipment_slots_display import EquipmentSlotsDisplay
+from ui.pareto_display import ParetoFrontierDisplay
+from ui.timing_overlay import TimingOverlay
+from utils.build_search import best_items_per_slot
+from utils.catalog_index import CatalogIndex
+from utils.comparison import ItemComparator
+from utils.instrumentation import recorder, timed
+from utils.query import execute_query
+from utils.slots import EQUIPMENT_SLOTS, candidate_slots
+
+logger = logging.getLogger(__name__)
 
 
 class MainWindow(tk.Tk):
@@ -14,7 +25,15 @@ class MainWindow(tk.Tk):
 
     FIXED_DETAIL_HEIGHT = 700
 
-    def __init__(self, weapon_data=None, armor_data=None):
+    GLOBAL_SEARCH_PLACEHOLDER = "Rechercher partout (armes + armures)..."
+
+    def __init__(
+        self,
+        weapon_data=None,
+        armor_data=None,
+        global_search=True,
+        list_renderer="frames",
+    ):
         super().__init__()
         # ... (init titre, zoom, data, main_paned_window, left_frame, right_frame, item_detail_display) ...
         self.title("Build Crafter - Adjust Bottom Widths")
@@ -24,6 +43,10 @@ class MainWindow(tk.Tk):
             self.geometry("1200x800")
         self.weapon_data = weapon_data if weapon_data else []
         self.armor_data = armor_data if armor_data else []
+        # Index et comparateur : construits par étapes après le premier
+        # affichage (_build_catalog_index_step), leur coût suit la taille du catalogue
+        self.catalog_index = None
+        self.comparator = None
         self.main_paned_window = tk.PanedWindow(
             self,
             orient=tk.HORIZONTAL,
@@ -34,8 +57,9 @@ class MainWindow(tk.Tk):
         self.main_paned_window.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
         self.left_frame = tk.Frame(self.main_paned_window, bg="#3C3F41", width=400)
         self.left_frame.grid_columnconfigure(0, weight=1)
-        self.left_frame.grid_rowconfigure(0, weight=1)
+        self.left_frame.grid_rowconfigure(0, weight=0)  # Recherche globale
         self.left_frame.grid_rowconfigure(1, weight=1)
+        self.left_frame.grid_rowconfigure(2, weight=1)
         self.left_frame.grid_propagate(False)
         self.right_frame = tk.Frame(self.main_paned_window, bg="#2B2B2B")
         self.right_frame.grid_columnconfigure(0, weight=1)
@@ -49,6 +73,7 @@ class MainWindow(tk.Tk):
             fg_color="white",
             accent_color="#4E9AFA",
             on_equip_callback=self._handle_equip_request,
+            comparison_provider=self._comparison_text,
         )
         self.item_detail_display.grid(row=0, column=0, sticky="nsew")
 
@@ -75,34 +100,54 @@ class MainWindow(tk.Tk):
         self.equipment_display.grid(
             row=0, column=0, sticky="nsew", padx=(5, 2), pady=5
         )  # Reste column=0
-
         # Créer le Frame pour la zone DROITE (col 1) (Stats Build)
         self.build_stats_frame = tk.Frame(self.right_bottom_frame, bg="#3a3d40")
         self.build_stats_frame.grid(
             row=0, column=1, sticky="nsew", padx=(2, 5), pady=5
         )  # Reste column=1
-        label_bs = tk.Label(
+        self.pareto_display = ParetoFrontierDisplay(
             self.build_stats_frame,
-            text="Build Stats (Future)",
-            bg=self.build_stats_frame.cget("bg"),
-            fg="lightgrey",
+            items=self.weapon_data + self.armor_data,
+            slot_names=list(EQUIPMENT_SLOTS),
+            stat_names=[],  # Celles de l'index, une fois construit
+            bg_color=self.build_stats_frame.cget("bg"),
+            on_build_select_callback=self._handle_build_equip_request,
+            on_best_per_slot_callback=self._handle_best_per_slot_request,
         )
-        label_bs.pack(pady=5, padx=5)
+        self.pareto_display.pack(fill=tk.BOTH, expand=True)
 
         # --- Ajout des PANES au PanedWindow HORIZONTAL ---
         self.main_paned_window.add(self.left_frame)
         self.main_paned_window.add(self.right_frame)
 
-        # --- SearchZones ---
+        # --- Recherche globale (optionnelle) : une requête sur l'index partagé ---
+        self.global_search_entry = None
+        if global_search:
+            self.global_search_entry = tk.Entry(
+                self.left_frame, font=("Calibri", 10), fg="grey"
+            )
+            self.global_search_entry.insert(0, self.GLOBAL_SEARCH_PLACEHOLDER)
+            self.global_search_entry.grid(
+                row=0, column=0, sticky="ew", padx=2, pady=(2, 4)
+            )
+            self.global_search_entry.bind("<FocusIn>", self._on_global_search_focus_in)
+            self.global_search_entry.bind("<FocusOut>", self._on_global_search_focus_out)
+            self.global_search_entry.bind("<KeyRelease>", self._on_global_search)
+
+        # --- SearchZones (partageront self.catalog_index, vides jusque-là) ---
         self.search_zone_weapons = SearchZone(
             self.left_frame,
             placeholder="Rechercher Armes...",
             bg_color="#4A2E2E",
             items_to_display=self.weapon_data,
             on_item_select_callback=self.display_item_stats,
+            badge_provider=self._delta_badges,
+            index_pending=True,
+            prefetch_callback=self.item_detail_display.prefetch,
+            list_renderer=list_renderer,
         )
         self.search_zone_weapons.grid(
-            row=0, column=0, sticky="nsew", pady=(0, 2), padx=2
+            row=1, column=0, sticky="nsew", pady=(0, 2), padx=2
         )
         self.search_zone_armor = SearchZone(
             self.left_frame,
@@ -110,8 +155,80 @@ class MainWindow(tk.Tk):
             bg_color="#2E4A2E",
             items_to_display=self.armor_data,
             on_item_select_callback=self.display_item_stats,
+            badge_provider=self._delta_badges,
+            index_pending=True,
+            prefetch_callback=self.item_detail_display.prefetch,
+            list_renderer=list_renderer,
         )
-        self.search_zone_armor.grid(row=1, column=0, sticky="nsew", pady=(2, 0), padx=2)
+        self.search_zone_armor.grid(row=2, column=0, sticky="nsew", pady=(2, 0), padx=2)
+
+        # --- Mesures de temps de réponse : panneau affiché/masqué avec F12 ---
+        self.timing_overlay = None
+        if recorder.enabled:
+            self.timing_overlay = TimingOverlay(self, recorder)
+            self.bind("<F12>", self.timing_overlay.toggle)
+
+        # Comme le remplissage des listes : par étapes, chacune dans un
+        # callback after() lancé après le passage idle (dessin) précédent
+        self._pending_index = CatalogIndex(self.weapon_data + self.armor_data, build=False)
+        self._index_steps = self._pending_index.build_steps()
+        self._index_job = self.after_idle(self._queue_index_step)
+
+    def _queue_index_step(self):
+        self._index_job = self.after(0, self._build_catalog_index_step)
+
+    @timed("MainWindow.build_catalog_index_step")
+    def _build_catalog_index_step(self):
+        self._index_job = None
+        try:
+            next(self._index_steps)
+        except StopIteration:
+            self._attach_catalog_index()
+        else:
+            self._index_job = self.after_idle(self._queue_index_step)
+
+    @timed("MainWindow.attach_catalog_index")
+    def _attach_catalog_index(self):
+        """Fournit l'index construit aux zones, au comparateur, au panneau Pareto."""
+        self.catalog_index = self._pending_index
+        self._pending_index = self._index_steps = None
+        self.comparator = ItemComparator(self.catalog_index, list(EQUIPMENT_SLOTS))
+        for slot_name, content_label in self.equipment_display.slot_content.items():
+            if content_label.equipped_item_data is not None:
+                self.comparator.set_equipped(slot_name, content_label.equipped_item_data)
+        self.pareto_display.set_stat_names(self.catalog_index.stat_names)
+        self.search_zone_weapons.set_catalog_index(self.catalog_index)
+        self.search_zone_armor.set_catalog_index(self.catalog_index)
+        if self.global_search_entry is not None and self._global_search_text():
+            self._on_global_search()
+
+    # --- Recherche globale ---
+    def _global_search_text(self):
+        text = self.global_search_entry.get()
+        return "" if text == self.GLOBAL_SEARCH_PLACEHOLDER else text.strip()
+
+    def _on_global_search(self, event=None):
+        """Exécute la requête une seule fois et répartit les résultats entre les zones."""
+        zones = (self.search_zone_weapons, self.search_zone_armor)
+        text = self._global_search_text()
+        if self.catalog_index is None:
+            return  # Relancée par _attach_catalog_index
+        item_ids = execute_query(self.catalog_index, text) if text else None
+        for zone in zones:
+            if item_ids is None:
+                zone.filter_list()  # Retour à la recherche propre à la zone
+            else:
+                zone.show_results(item_ids)
+
+    def _on_global_search_focus_in(self, event):
+        if self.global_search_entry.get() == self.GLOBAL_SEARCH_PLACEHOLDER:
+            self.global_search_entry.delete(0, "end")
+            self.global_search_entry.config(fg="black")
+
+    def _on_global_search_focus_out(self, event):
+        if self.global_search_entry.get() == "":
+            self.global_search_entry.insert(0, self.GLOBAL_SEARCH_PLACEHOLDER)
+            self.global_search_entry.config(fg="grey")
 
     # --- Callbacks (inchangés) ---
     # ... (display_item_stats, _handle_equip_request, _handle_unequip_request) ...
@@ -119,54 +236,78 @@ class MainWindow(tk.Tk):
         self.item_detail_display.update_display(item_data)
 
     def _handle_equip_request(self, item_data):  # Callback équipement
-        print("\n--- Handling Equip Request ---")
         if not item_data or not isinstance(item_data, dict):
-            print("Equip Request: Invalid item_data.")
-            print("--- End Equip Request ---")
+            logger.warning("Equip Request: Invalid item_data.")
             return
         item_name = item_data.get("name", "Inconnu")
         slot_name_from_json = item_data.get("slot")
-        print(f"Item: '{item_name}', Original Slot: '{slot_name_from_json}'")
+        logger.debug("Equip Request: '%s', Original Slot: '%s'", item_name, slot_name_from_json)
         if not slot_name_from_json:
-            print(f"Equip Request: No slot for {item_name}.")
-            print("--- End Equip Request ---")
+            logger.warning("Equip Request: No slot for %s.", item_name)
             return
-        target_slot = None
-        weapon_slot_types = {"melee weapon", "range weapon", "magic weapon"}
-        if slot_name_from_json.lower() in weapon_slot_types:
-            if "Weapon" in self.equipment_display.slots:
-                target_slot = "Weapon"
-                print(f"Mapped '{slot_name_from_json}' to '{target_slot}'")
-            else:
-                print(f"ERROR: Generic 'Weapon' slot not found!")
-        elif slot_name_from_json == "Ring":
-            if "Ring1" in self.equipment_display.slots:
-                target_slot = "Ring1"
-            elif "Ring2" in self.equipment_display.slots:
-                target_slot = "Ring2"
-            if target_slot:
-                print(f"Mapped 'Ring' to '{target_slot}'")
-            else:
-                print("ERROR: No Ring1 or Ring2 slot found!")
-        elif slot_name_from_json in self.equipment_display.slots:
-            target_slot = slot_name_from_json
-            print(f"Direct match found: '{target_slot}'")
-        else:
-            print(f"Warning: Slot '{slot_name_from_json}' no match.")
+        targets = candidate_slots(slot_name_from_json, self.equipment_display.slots)
+        target_slot = targets[0] if targets else None
         if target_slot and target_slot in self.equipment_display.slots:
-            print(f"Calling update_slot for '{target_slot}'...")
-            self.equipment_display.update_slot(target_slot, item_data)
+            logger.debug("Mapped '%s' to '%s'", slot_name_from_json, target_slot)
+            self._set_slot(target_slot, item_data)
         elif target_slot:
-            print(f"ERROR: Target slot '{target_slot}' not in slots keys.")
+            logger.error("Target slot '%s' not in slots keys.", target_slot)
         else:
-            print(f"ERROR: Could not determine target slot. Equip failed.")
-        print("--- End Equip Request ---")
+            logger.error("Slot '%s' no match. Equip failed.", slot_name_from_json)
+
+    def _handle_build_equip_request(self, build):  # Callback build complet (Pareto)
+        for slot_name, item_data in build.items():
+            if slot_name in self.equipment_display.slots:
+                self._set_slot(slot_name, item_data)
+
+    def _handle_best_per_slot_request(self, weights, max_level, keep_equipped):
+        """Équipe le meilleur item par slot sous le niveau max (slots équipés verrouillés)."""
+        if self.catalog_index is None:
+            return
+        locks = {}
+        if keep_equipped:
+            for slot_name, content_label in self.equipment_display.slot_content.items():
+                if content_label.equipped_item_data is not None:
+                    locks[slot_name] = content_label.equipped_item_data
+        best = best_items_per_slot(
+            self.catalog_index,
+            weights,
+            list(EQUIPMENT_SLOTS),
+            max_level=max_level,
+            locks=locks,
+        )
+        for slot_name, (item_data, _level, _score) in best.items():
+            if slot_name not in locks:
+                self._set_slot(slot_name, item_data)
 
     def _handle_unequip_request(self, slot_name):  # Callback déséquipement
-        print(f"\n--- Handling Unequip Request for Slot: {slot_name} ---")
+        logger.debug("Unequip Request for Slot: %s", slot_name)
         if slot_name and slot_name in self.equipment_display.slots:
-            print(f"Calling update_slot for '{slot_name}' with None...")
-            self.equipment_display.update_slot(slot_name, None)
+            self._set_slot(slot_name, None)
         else:
-            print(f"ERROR: Cannot unequip, slot '{slot_name}' not found.")
-        print(f"--- End Unequip Request: {slot_name} ---")
+            logger.error("Cannot unequip, slot '%s' not found.", slot_name)
+
+    # --- Comparaison avec l'équipement ---
+    def _set_slot(self, slot_name, item_data):
+        """Équipe/vide un slot et met à jour les écarts affichés."""
+        self.equipment_display.update_slot(slot_name, item_data)
+        if self.comparator is not None:
+            self.comparator.set_equipped(slot_name, item_data)
+        self.search_zone_weapons.item_list_display.refresh_badges()
+        self.search_zone_armor.item_list_display.refresh_badges()
+        self.item_detail_display.refresh_details()
+
+    def _delta_badges(self, items):
+        item_ids = [self.catalog_index.item_id_of(item_data) for item_data in items]
+        known = [item_id for item_id in item_ids if item_id is not None]
+        badges = iter(self.comparator.delta_badges(known))
+        return [next(badges) if item_id is not None else ("", 0) for item_id in item_ids]
+
+    def _comparison_text(self, item_data, level):
+        if self.catalog_index is None:
+            return None
+        item_id = self.catalog_index.item_id_of(item_data)
+        if item_id is None:
+            return None
+        text, _sign = self.comparator.delta_badges([item_id], level, max_stats=6)[0]
+        return text.replace(", ", "\n")
@@ -0,0 +1,62 @@
+# ui/mousewheel.py
+"""
+Molette de la souris : un seul gestionnaire pour toute l'application.
+
+Les conteneurs scrollables s'enregistrent avec le canvas qu'ils font défiler.
+Le gestionnaire, lié une seule fois avec bind_all, remonte du widget sous le
+pointeur jusqu'au premier conteneur enregistré ; les widgets des lignes n'ont
+donc aucune liaison à créer ni à défaire.
+"""
+import tkinter as tk
+import weakref
+
+_containers = {}  # Chemin Tk du conteneur -> canvas à faire défiler
+# Racines où le gestionnaire est lié. Références faibles : un id() pourrait être
+# réutilisé par une nouvelle racine après destruction de la précédente.
+_installed_roots = weakref.WeakSet()
+
+
+def register_scroll_container(container, canvas):
+    """La molette au-dessus de `container` (ou d'un descendant) fait défiler `canvas`."""
+    path = str(container)
+    _containers[path] = canvas
+
+    def forget(event):
+        if str(event.widget) == path:
+            _containers.pop(path, None)
+
+    container.bind("<Destroy>", forget, add="+")
+    root = container.winfo_toplevel()._root()
+    if root not in _installed_roots:
+        _installed_roots.add(root)
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            root.bind_all(sequence, _on_mousewheel, add="+")
+
+
+def _scroll_delta(event):
+    if event.num == 4:
+        return -1
+    if event.num == 5:
+        return 1
+    delta_val = getattr(event, "delta", 0)
+    return -1 * int(delta_val / 120) if delta_val != 0 else 0
+
+
+def _on_mousewheel(event):
+    if isinstance(event.widget, str):  # Widgets internes de Tk (ex. popdown ttk)
+        return None
+    try:
+        widget = event.widget.winfo_containing(event.x_root, event.y_root)
+    except (tk.TclError, KeyError):
+        return None
+    path = str(widget) if widget is not None else ""
+    while path:
+        canvas = _containers.get(path)
+        if canvas is not None:
+            try:
+                canvas.yview_scroll(_scroll_delta(event), "units")
+            except tk.TclError:
+                pass  # Widget peut être détruit
+            return "break"
+        path = path.rpartition(".")[0]
+    return None
@@ -0,0 +1,195 @@
+# ui/pareto_display.py
+import tkinter as tk
+from tkinter import ttk
+
+from utils.item_stats import catalog_stat_names
+from utils.pareto import pareto_builds
+
+
+class ParetoFrontierDisplay(tk.Frame):
+    """
+    Affiche la frontière de Pareto des builds sur 2 ou 3 stats choisies.
+    Un double-clic sur une ligne appelle on_build_select_callback({slot: item_data}).
+    stat_names: stats proposées (ex. CatalogIndex.stat_names) ; None les
+    recherche dans items. Elles peuvent aussi être fournies plus tard
+    (set_stat_names), une fois l'index du catalogue construit.
+    """
+
+    NO_STAT = "(aucune)"
+    DEFAULT_STATS = ("max_health", "magic_damage", "magic_barrier")
+
+    def __init__(
+        self,
+        parent,
+        items=None,
+        slot_names=(),
+        stat_names=None,
+        bg_color="#3a3d40",
+        fg_color="lightgrey",
+        on_build_select_callback=None,
+        on_best_per_slot_callback=None,
+        *args,
+        **kwargs,
+    ):
+        super().__init__(parent, bg=bg_color, *args, **kwargs)
+        self.items = items if items else []
+        self.slot_names = list(slot_names)
+        self.bg_color = bg_color
+        self.fg_color = fg_color
+        self.on_build_select_callback = on_build_select_callback
+        self.on_best_per_slot_callback = on_best_per_slot_callback
+        self.frontier = []
+
+        self.grid_columnconfigure(0, weight=1)
+        self.grid_rowconfigure(2, weight=1)
+
+        title = tk.Label(
+            self,
+            text="Frontière de Pareto",
+            font=("Segoe UI", 10, "bold"),
+            bg=bg_color,
+            fg=fg_color,
+        )
+        title.grid(row=0, column=0, sticky="w", padx=5, pady=(5, 2))
+
+        # --- Choix des stats, niveau max et bouton de calcul ---
+        controls = tk.Frame(self, bg=bg_color)
+        controls.grid(row=1, column=0, sticky="ew", padx=5)
+        self.stat_vars = []
+        self.stat_combos = []
+        for i in range(len(self.DEFAULT_STATS)):
+            var = tk.StringVar(value="")
+            combo = ttk.Combobox(controls, textvariable=var, width=14, state="readonly")
+            combo.grid(row=0, column=i, padx=(0, 4))
+            self.stat_vars.append(var)
+            self.stat_combos.append(combo)
+        if stat_names is None:
+            stat_names = catalog_stat_names(self.items)
+        self.set_stat_names(stat_names)
+        tk.Label(controls, text="Niv. max", bg=bg_color, fg=fg_color).grid(
+            row=0, column=3, padx=(4, 2)
+        )
+        self.level_var = tk.StringVar(value="")
+        tk.Entry(controls, textvariable=self.level_var, width=4).grid(row=0, column=4)
+        tk.Button(
+            controls,
+            text="Calculer",
+            bg="#555555",
+            fg="white",
+            activebackground="#666666",
+            activeforeground="white",
+            relief=tk.RAISED,
+            bd=1,
+            cursor="hand2",
+            command=self.compute,
+        ).grid(row=0, column=5, padx=(6, 0))
+        tk.Button(
+            controls,
+            text="Meilleur/slot",
+            bg="#555555",
+            fg="white",
+            activebackground="#666666",
+            activeforeground="white",
+            relief=tk.RAISED,
+            bd=1,
+            cursor="hand2",
+            command=self._request_best_per_slot,
+        ).grid(row=0, column=6, padx=(4, 0))
+        self.keep_equipped_var = tk.BooleanVar(value=True)
+        tk.Checkbutton(
+            controls,
+            text="Garder équipés",
+            variable=self.keep_equipped_var,
+            bg=bg_color,
+            fg=fg_color,
+            selectcolor="#2B2B2B",
+            activebackground=bg_color,
+        ).grid(row=0, column=7, padx=(4, 0))
+
+        # --- Liste des builds de la frontière ---
+        list_frame = tk.Frame(self, bg=bg_color)
+        list_frame.grid(row=2, column=0, sticky="nsew", padx=5, pady=5)
+        list_frame.grid_columnconfigure(0, weight=1)
+        list_frame.grid_rowconfigure(0, weight=1)
+        self.listbox = tk.Listbox(
+            list_frame,
+            bg="#2B2B2B",
+            fg="white",
+            selectbackground="#4E9AFA",
+            font=("Consolas", 9),
+            activestyle="none",
+            borderwidth=0,
+            highlightthickness=0,
+        )
+        scrollbar = ttk.Scrollbar(list_frame, orient="vertical", command=self.listbox.yview)
+        self.listbox.configure(yscrollcommand=scrollbar.set)
+        self.listbox.grid(row=0, column=0, sticky="nsew")
+        scrollbar.grid(row=0, column=1, sticky="ns")
+        self.listbox.bind("<Double-Button-1>", self._on_double_click)
+
+        self.status_label = tk.Label(self, text="", bg=bg_color, fg=fg_color, anchor="w")
+        self.status_label.grid(row=3, column=0, sticky="ew", padx=5, pady=(0, 5))
+
+    def set_stat_names(self, stat_names):
+        """Stats proposées dans les listes (la 3e est optionnelle)."""
+        stat_choices = list(stat_names)
+        for i, (var, combo, default) in enumerate(
+            zip(self.stat_vars, self.stat_combos, self.DEFAULT_STATS)
+        ):
+            values = stat_choices if i < 2 else [self.NO_STAT] + stat_choices
+            combo.configure(values=values)
+            if var.get() not in values:
+                var.set(default if default in values else (values[0] if values else ""))
+
+    def _selected_stats(self):
+        stats = []
+        for var in self.stat_vars:
+            stat = var.get()
+            if stat and stat != self.NO_STAT and stat not in stats:
+                stats.append(stat)
+        return stats
+
+    def _selected_level(self):
+        text = self.level_var.get().strip()
+        try:
+            return int(text) if text else None
+        except ValueError:
+            return None
+
+    def compute(self):
+        """Recalcule la frontière avec les stats choisies et remplit la liste."""
+        stats = self._selected_stats()
+        self.listbox.delete(0, tk.END)
+        self.frontier = []
+        if len(stats) < 2:
+            self.status_label.config(text="Choisissez au moins 2 stats différentes.")
+            return
+        self.frontier = pareto_builds(
+            self.items, stats, self.slot_names, self._selected_level()
+        )
+        header = " | ".join(f"{stat[:12]:>12}" for stat in stats)
+        self.status_label.config(
+            text=f"{len(self.frontier)} builds non dominés  ({header})"
+        )
+        for values, build in self.frontier:
+            stats_text = " | ".join(f"{value:>12.1f}" for value in values)
+            names = ", ".join(item.get("name", "?") for item in build.values())
+            self.listbox.insert(tk.END, f"{stats_text}  {names}")
+
+    def _request_best_per_slot(self):
+        """Demande le meilleur item par slot (poids 1 sur chaque stat choisie)."""
+        stats = self._selected_stats()
+        if not stats or not self.on_best_per_slot_callback:
+            return
+        self.on_best_per_slot_callback(
+            {stat: 1.0 for stat in stats},
+            self._selected_level(),
+            self.keep_equipped_var.get(),
+        )
+
+    def _on_double_click(self, event=None):
+        selection = self.listbox.curselection()
+        if not selection or not self.on_build_select_callback:
+            return
+        _values, build = self.frontier[selection[0]]
+        self.on_build_select_callback(build)
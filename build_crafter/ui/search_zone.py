@@ -1,8 +1,16 @@
 # ui/search_zone.py
 import tkinter as tk
+from array import array
+from collections import OrderedDict
+from tkinter import ttk
+from ui.canvas_item_list_display import CanvasItemListDisplay
 from ui.item_list_display import (
     ItemListDisplay,
 )  # Assurez-vous que l'import est correct
+from utils.catalog_index import CatalogIndex
+from utils.instrumentation import timed
+from utils.masks import mask_and, mask_from_indices, mask_not
+from utils.query import execute_query, normalize_query, parse_query
 
 
 class SearchZone(tk.Frame):
@@ -10,8 +18,23 @@ class SearchZone(tk.Frame):
     Un widget Frame réutilisable qui contient une barre de recherche
     et utilise ItemListDisplay pour afficher les résultats.
     Peut appeler un callback lorsqu'un item est sélectionné.
+    Les résultats peuvent être filtrés par facettes (slot, rareté, catégorie,
+    plages de stats) et triés (et limités à un top K) sur une stat à un niveau.
+
+    Avec catalog_index, la zone partage l'index d'un catalogue plus large et
+    n'en affiche que ses propres items (masque de zone). Avec index_pending,
+    cet index est fourni plus tard (set_catalog_index) : la zone reste vide
+    jusque-là, ce qui permet d'afficher la fenêtre avant de construire l'index.
+
+    list_renderer choisit l'affichage de la liste : "frames" (un Frame par
+    ligne) ou "canvas" (lignes dessinées sur le canvas, visibles seulement).
     """
 
+    NO_SORT = "(ordre du fichier)"
+    ALL_VALUES = "(tous)"
+    RESULT_CACHE_SIZE = 32  # Requêtes récentes gardées (ids des résultats)
+    LIST_RENDERERS = {"frames": ItemListDisplay, "canvas": CanvasItemListDisplay}
+
     # Ajouter le paramètre callback ici
     def __init__(
         self,
@@ -20,6 +43,11 @@ class SearchZone(tk.Frame):
         bg_color="lightgrey",
         items_to_display=None,
         on_item_select_callback=None,  # <<< Ajouté
+        badge_provider=None,
+        catalog_index=None,
+        index_pending=False,
+        prefetch_callback=None,
+        list_renderer="frames",
         *args,
         **kwargs
     ):
@@ -27,6 +55,17 @@ class SearchZone(tk.Frame):
 
         self.placeholder_text = placeholder
         self.all_zone_items = items_to_display if items_to_display else []
+        self.index = None  # Voir set_catalog_index
+        self.zone_mask = None
+        self.sort_stat = None
+        self.level = None  # Niveau utilisé pour le tri et les plages de stats
+        self.sort_descending = True
+        self.top_k = None
+        self.facet_filters = {}  # {facette: [valeurs]}
+        self.stat_filters = []  # [(stat, opérateur, valeur, exclure)]
+        # LRU : clé de requête -> array('i') des ids résultats (None = tout afficher)
+        self._result_cache = OrderedDict()
+        self._displayed_key = None
         self.on_item_select_callback = (
             on_item_select_callback  # <<< Stocker le callback
         )
@@ -34,7 +73,9 @@ class SearchZone(tk.Frame):
         # --- Configuration grille, Barre de recherche (inchangés) ---
         self.grid_columnconfigure(0, weight=1)
         self.grid_rowconfigure(0, weight=0)
-        self.grid_rowconfigure(1, weight=1)
+        self.grid_rowconfigure(1, weight=0)
+        self.grid_rowconfigure(2, weight=0)
+        self.grid_rowconfigure(3, weight=1)
 
         self.search_entry = tk.Entry(self, font=("Calibri", 10), fg="grey")
         self.search_entry.grid(row=0, column=0, sticky="ew", padx=5, pady=(5, 5))
@@ -43,32 +84,249 @@ class SearchZone(tk.Frame):
         self.search_entry.bind("<FocusOut>", self.on_focusout)
         self.search_entry.bind("<KeyRelease>", self.filter_list)
 
+        # --- Barre de tri : stat, niveau, sens, top K ---
+        sort_bar = tk.Frame(self, bg=bg_color)
+        sort_bar.grid(row=1, column=0, sticky="ew", padx=5, pady=(0, 5))
+        sort_bar.grid_columnconfigure(0, weight=1)
+        self.sort_var = tk.StringVar(value=self.NO_SORT)
+        self.sort_combo = ttk.Combobox(
+            sort_bar,
+            textvariable=self.sort_var,
+            values=[self.NO_SORT],
+            state="readonly",
+        )
+        self.sort_combo.grid(row=0, column=0, sticky="ew")
+        self.sort_combo.bind("<<ComboboxSelected>>", self._on_sort_controls_changed)
+        self.sort_direction_button = tk.Button(
+            sort_bar, text="↓", width=2, command=self._toggle_sort_direction
+        )
+        self.sort_direction_button.grid(row=0, column=1, padx=(4, 0))
+        tk.Label(sort_bar, text="Niv.", bg=bg_color, fg="white").grid(
+            row=0, column=2, padx=(6, 2)
+        )
+        self.level_var = tk.StringVar(value="")
+        level_entry = tk.Entry(sort_bar, textvariable=self.level_var, width=4)
+        level_entry.grid(row=0, column=3)
+        tk.Label(sort_bar, text="Top", bg=bg_color, fg="white").grid(
+            row=0, column=4, padx=(6, 2)
+        )
+        self.top_k_var = tk.StringVar(value="")
+        top_entry = tk.Entry(sort_bar, textvariable=self.top_k_var, width=4)
+        top_entry.grid(row=0, column=5)
+        level_entry.bind("<KeyRelease>", self._on_sort_controls_changed)
+        top_entry.bind("<KeyRelease>", self._on_sort_controls_changed)
+
+        # --- Barre de facettes : slot, rareté, catégorie, plages de stats ---
+        facet_bar = tk.Frame(self, bg=bg_color)
+        facet_bar.grid(row=2, column=0, sticky="ew", padx=5, pady=(0, 5))
+        self.facet_vars = {}
+        self.facet_combos = {}
+        for column, facet in enumerate(CatalogIndex.FACETS):
+            facet_bar.grid_columnconfigure(column, weight=1)
+            var = tk.StringVar(value=self.ALL_VALUES)
+            combo = ttk.Combobox(
+                facet_bar,
+                textvariable=var,
+                values=[self.ALL_VALUES],
+                state="readonly",
+                width=10,
+            )
+            combo.grid(row=0, column=column, sticky="ew", padx=(0, 4))
+            combo.bind("<<ComboboxSelected>>", self._on_facet_controls_changed)
+            self.facet_vars[facet] = var
+            self.facet_combos[facet] = combo
+        facet_bar.grid_columnconfigure(3, weight=2)
+        self.stat_filter_entry = tk.Entry(facet_bar, font=("Calibri", 10))
+        self.stat_filter_entry.grid(row=0, column=3, sticky="ew")
+        self.stat_filter_entry.bind("<KeyRelease>", self._on_facet_controls_changed)
+
         # --- Zone de contenu : Utilisation de ItemListDisplay ---
         # Passer le callback au constructeur de ItemListDisplay
-        self.item_list_display = ItemListDisplay(
+        self.item_list_display = self.LIST_RENDERERS[list_renderer](
             self,
             bg_color=bg_color,
             on_item_select_callback=self.on_item_select_callback,  # <<< Passé ici
+            badge_provider=badge_provider,
+            prefetch_callback=prefetch_callback,
         )
-        self.item_list_display.grid(row=1, column=0, sticky="nsew", padx=5, pady=(0, 5))
+        self.item_list_display.grid(row=3, column=0, sticky="nsew", padx=5, pady=(0, 5))
 
-        self.item_list_display.display_items(self.all_zone_items)
         self.grid_propagate(False)
+        if catalog_index is not None:
+            self.set_catalog_index(catalog_index)
+        elif not index_pending:
+            # L'index ne contient que les items de la zone : pas de masque de zone
+            self.set_catalog_index(CatalogIndex(self.all_zone_items), shared=False)
+
+    def set_catalog_index(self, catalog_index, shared=True):
+        """
+        Branche l'index (partagé : la zone n'en affiche que ses propres items),
+        remplit les listes de tri et de facettes, puis la liste d'items : par
+        tranches après le premier affichage, ou filtrée si une recherche a déjà
+        été saisie.
+        """
+        self.index = catalog_index
+        self.zone_mask = None
+        if shared:
+            zone_ids = (self.index.item_id_of(item) for item in self.all_zone_items)
+            self.zone_mask = mask_from_indices(
+                self.index.item_count, [i for i in zone_ids if i is not None]
+            )
+        self.sort_combo.configure(values=[self.NO_SORT] + self.index.stat_names)
+        for facet, combo in self.facet_combos.items():
+            combo.configure(
+                values=[self.ALL_VALUES]
+                + self.index.facet_values(facet, within=self.zone_mask)
+            )
+        self._result_cache.clear()
+        self._displayed_key = None
+        if self.get_search_term() or self.stat_filter_entry.get().strip():
+            self._on_facet_controls_changed()
+        else:
+            self.item_list_display.display_items_deferred(self.all_zone_items)
+
+    @property
+    def populating(self):
+        """Vrai tant que la liste initiale n'est pas entièrement affichée."""
+        return self.index is None or self.item_list_display.populating
 
     # --- filter_list, on_entry_click, on_focusout, get_search_term (inchangés) ---
+    @timed("SearchZone.filter_list", until_idle=True)
     def filter_list(self, event=None):
-        search_term = self.get_search_term().lower()
-        if not search_term:
-            filtered_items = self.all_zone_items
-        else:
-            filtered_items = [
-                item_dict
-                for item_dict in self.all_zone_items
-                if isinstance(item_dict, dict)
-                and "name" in item_dict
-                and search_term in item_dict["name"].lower()
-            ]
-        self.item_list_display.display_items(filtered_items)
+        """
+        Exécute la requête de la barre de recherche (voir utils.query) combinée
+        aux facettes et au tri choisis ; le tri/niveau/top de la requête priment.
+        """
+        if self.index is None:
+            return  # Index pas encore construit : set_catalog_index filtrera
+        key, item_ids = self._query_results()
+        if key == self._displayed_key:
+            return  # Même requête (ex. touche fléchée) : la liste affichée est à jour
+        self._displayed_key = key
+        if item_ids is None:
+            self.item_list_display.display_items(self.all_zone_items)
+            return
+        self.item_list_display.display_items([self.index.items[i] for i in item_ids])
+
+    def _query_results(self):
+        """(clé, ids) de la requête courante, ids servis depuis le cache LRU si possible."""
+        key = (
+            normalize_query(self.get_search_term()),
+            tuple(sorted((f, tuple(v)) for f, v in self.facet_filters.items())),
+            tuple(self.stat_filters),
+            self.level,
+            self.sort_stat,
+            self.sort_descending,
+            self.top_k,
+        )
+        if key in self._result_cache:
+            self._result_cache.move_to_end(key)
+            return key, self._result_cache[key]
+        masks = [
+            mask
+            for mask in (self.zone_mask, self._filter_mask(self.level))
+            if mask is not None
+        ]
+        item_ids = execute_query(
+            self.index,
+            self.get_search_term(),
+            base_mask=mask_and(*masks) if masks else None,
+            level=self.level,
+            sort_stat=self.sort_stat,
+            descending=self.sort_descending,
+            top_k=self.top_k,
+        )
+        if item_ids is not None:
+            item_ids = array("i", item_ids)
+        self._result_cache[key] = item_ids
+        if len(self._result_cache) > self.RESULT_CACHE_SIZE:
+            self._result_cache.popitem(last=False)
+        return key, item_ids
+
+    def show_results(self, item_ids):
+        """
+        Affiche des résultats calculés ailleurs (recherche globale) :
+        seuls les ids appartenant à la zone sont gardés, dans l'ordre donné.
+        """
+        if self.index is None:
+            return
+        if self.zone_mask is not None:
+            item_ids = [i for i in item_ids if self.zone_mask[i]]
+        self._displayed_key = None
+        self.item_list_display.display_items([self.index.items[i] for i in item_ids])
+
+    def _filter_mask(self, level=None):
+        """Masque d'items des facettes et plages de stats actives (None si aucun filtre)."""
+        masks = [
+            self.index.facet_mask(facet, values)
+            for facet, values in self.facet_filters.items()
+            if values
+        ]
+        for stat, operator, value, exclude in self.stat_filters:
+            mask = self.index.stat_mask(stat, operator, value, level)
+            masks.append(mask_not(mask) if exclude else mask)
+        return mask_and(*masks) if masks else None
+
+    def set_filters(self, slot=None, rarity=None, category=None, stat_filters=()):
+        """
+        Filtres à facettes : chaque facette accepte une valeur ou une liste de valeurs,
+        stat_filters une liste de (stat, opérateur, valeur[, exclure]),
+        ex. ("magic_damage", ">=", 5) ; même forme que QueryPlan.stat_terms.
+        """
+        self.facet_filters = {}
+        for facet, values in (("slot", slot), ("rarity", rarity), ("category", category)):
+            if isinstance(values, str):
+                values = [values]
+            if values:
+                self.facet_filters[facet] = list(values)
+        stat_columns = self.index.stat_columns if self.index else {}
+        self.stat_filters = [
+            (stat, operator, float(value), bool(exclude and exclude[0]))
+            for stat, operator, value, *exclude in stat_filters
+            if stat in stat_columns
+        ]
+        self.filter_list()
+
+    def _on_facet_controls_changed(self, event=None):
+        selected = {
+            facet: (var.get() if var.get() != self.ALL_VALUES else None)
+            for facet, var in self.facet_vars.items()
+        }
+        # Même grammaire que la barre de recherche ("armor >= 5 -max_health<10") ;
+        # seuls les termes de stats de ce champ sont pris en compte
+        plan = parse_query(self.stat_filter_entry.get())
+        self.set_filters(stat_filters=plan.stat_terms, **selected)
+
+    def set_sort(self, stat=None, level=None, descending=True, top_k=None):
+        """Trie les résultats sur `stat` au niveau `level` (None : ordre du fichier)."""
+        stat_columns = self.index.stat_columns if self.index else {}
+        self.sort_stat = stat if stat in stat_columns else None
+        self.level = level
+        self.sort_descending = descending
+        self.top_k = top_k
+        self.sort_var.set(self.sort_stat or self.NO_SORT)
+        self.sort_direction_button.config(text="↓" if descending else "↑")
+        self.filter_list()
+
+    def _on_sort_controls_changed(self, event=None):
+        self.set_sort(
+            self.sort_var.get(),
+            self._int_or_none(self.level_var.get()),
+            self.sort_descending,
+            self._int_or_none(self.top_k_var.get()),
+        )
+
+    def _toggle_sort_direction(self):
+        self.sort_descending = not self.sort_descending
+        self._on_sort_controls_changed()
+
+    @staticmethod
+    def _int_or_none(text):
+        try:
+            value = int(text.strip())
+        except (AttributeError, ValueError):
+            return None
+        return value if value > 0 else None
 
     def on_entry_click(self, event):
         if self.search_entry.get() == self.placeholder_text:
@@ -0,0 +1,52 @@
+# ui/timing_overlay.py
+import tkinter as tk
+
+
+class TimingOverlay(tk.Label):
+    """
+    Petit panneau superposé (coin bas-droit) : dernière durée et p95 de chaque
+    mesure de utils.instrumentation, rafraîchi tant qu'il est visible.
+    """
+
+    REFRESH_MS = 500
+
+    def __init__(self, parent, recorder, *args, **kwargs):
+        super().__init__(
+            parent,
+            font=("Consolas", 8),
+            bg="#000000",
+            fg="#7CFC00",
+            justify=tk.LEFT,
+            anchor="nw",
+            padx=6,
+            pady=4,
+            *args,
+            **kwargs,
+        )
+        self.recorder = recorder
+        self.visible = False
+        self._refresh_job = None
+
+    def toggle(self, event=None):
+        if self.visible:
+            self.visible = False
+            self.place_forget()
+            if self._refresh_job:
+                self.after_cancel(self._refresh_job)
+                self._refresh_job = None
+        else:
+            self.visible = True
+            self.place(relx=1.0, rely=1.0, anchor="se", x=-8, y=-8)
+            self.lift()
+            self._refresh()
+
+    def _refresh(self):
+        self._refresh_job = None
+        if not self.visible:
+            return
+        lines = [
+            f"{name:<28} {stats['last']:7.1f} ms  p95 {stats['p95']:7.1f}"
+            for name, stats in self.recorder.summary().items()
+        ]
+        self.config(text="\n".join(lines) or "(aucune mesure)")
+        self._refresh_job = self.after(self.REFRESH_MS, self._refresh)
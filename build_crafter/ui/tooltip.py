@@ -1,12 +1,173 @@
 # ui/tooltip.py
+import logging
 import tkinter as tk
 import platform
 from PIL import Image, ImageTk
 import os
+import weakref
+
+logger = logging.getLogger(__name__)
+
+# --- Caches partagés par toutes les tooltips de l'application ---
+_border_images = {}  # chemin -> image de bordure RGBA (None si introuvable)
+# racine Tk -> {(chemin, taille des coins): _NineSlice} ; une PhotoImage
+# n'existe que dans l'interpréteur qui l'a créée
+_nine_slices = weakref.WeakKeyDictionary()
+_tooltip_windows = {}  # racine Tk -> _TooltipWindow (une seule Toplevel par app)
+
+
+def _load_border_image(border_image_path):
+    """Image de bordure originale, lue sur disque une seule fois par chemin."""
+    if border_image_path not in _border_images:
+        border_img = None
+        if os.path.exists(border_image_path):
+            try:
+                # Charger en RGBA pour gérer la transparence
+                border_img = Image.open(border_image_path).convert("RGBA")
+                logger.debug("Image de bordure chargée: %s", border_image_path)
+            except Exception as e:
+                logger.warning("Erreur chargement image bordure %s: %s", border_image_path, e)
+        else:
+             logger.warning("Image de bordure non trouvée: %s", border_image_path)
+        _border_images[border_image_path] = border_img
+    return _border_images[border_image_path]
+
+
+class _NineSlice:
+    """
+    Bordure découpée en neuf : les 4 coins sont convertis une fois, les 4 bords
+    sont répétés (tuiles) sur la longueur voulue. Le centre de l'image est
+    transparent et recouvert par le texte : il n'est pas dessiné.
+    Le coût d'affichage suit le périmètre de la tooltip, pas sa surface.
+    """
+    def __init__(self, border_img, slice_size, master):
+        width, height = border_img.size
+        s = self.slice_size = max(1, min(slice_size, (width - 1) // 2, (height - 1) // 2))
+        self.corners = {
+            "nw": ImageTk.PhotoImage(border_img.crop((0, 0, s, s)), master=master),
+            "ne": ImageTk.PhotoImage(border_img.crop((width - s, 0, width, s)), master=master),
+            "sw": ImageTk.PhotoImage(border_img.crop((0, height - s, s, height)), master=master),
+            "se": ImageTk.PhotoImage(border_img.crop((width - s, height - s, width, height)), master=master),
+        }
+        # Bandes des bords (sans les coins), découpées en tuiles à la demande
+        self.edges = {
+            "n": border_img.crop((s, 0, width - s, s)),
+            "s": border_img.crop((s, height - s, width - s, height)),
+            "w": border_img.crop((0, s, s, height - s)),
+            "e": border_img.crop((width - s, s, width, height - s)),
+        }
+        self._tiles = {}  # (bord, longueur) -> PhotoImage
+
+    def _tile(self, canvas, edge, length):
+        key = (edge, length)
+        if key not in self._tiles:
+            s = self.slice_size
+            box = (0, 0, length, s) if edge in ("n", "s") else (0, 0, s, length)
+            self._tiles[key] = ImageTk.PhotoImage(self.edges[edge].crop(box), master=canvas)
+        return self._tiles[key]
+
+    def draw(self, canvas, width, height, tag="border"):
+        """Dessine la bordure (width x height) sur le canvas, sous le tag donné."""
+        canvas.delete(tag)
+        s = self.slice_size
+        for edge, y in (("n", 0), ("s", height - s)):
+            tile_length = self.edges[edge].width
+            for x in range(s, width - s, tile_length):
+                length = min(tile_length, width - s - x)
+                canvas.create_image(x, y, image=self._tile(canvas, edge, length), anchor="nw", tags=tag)
+        for edge, x in (("w", 0), ("e", width - s)):
+            tile_length = self.edges[edge].height
+            for y in range(s, height - s, tile_length):
+                length = min(tile_length, height - s - y)
+                canvas.create_image(x, y, image=self._tile(canvas, edge, length), anchor="nw", tags=tag)
+        for corner, x, y in (("nw", 0, 0), ("ne", width - s, 0),
+                             ("sw", 0, height - s), ("se", width - s, height - s)):
+            canvas.create_image(x, y, image=self.corners[corner], anchor="nw", tags=tag)
+
+
+def _nine_slice(master, border_image_path, slice_size=None):
+    """Découpe (en cache) de l'image de bordure ; coins d'un tiers par défaut."""
+    border_img = _load_border_image(border_image_path)
+    if slice_size is None:
+        slice_size = min(border_img.size) // 3
+    root = master._root()
+    cache = _nine_slices.setdefault(root, {})
+    key = (border_image_path, slice_size)
+    if key not in cache:
+        cache[key] = _NineSlice(border_img, slice_size, root)
+    return cache[key]
+
+
+class _TooltipWindow:
+    """
+    Toplevel unique de l'application, cachée (withdraw) entre deux affichages.
+    Les labels de bordure et de texte sont créés une fois puis reconfigurés.
+    """
+    def __init__(self, root):
+        self.owner = None  # HoverTooltip actuellement affichée
+        self.toplevel = tk.Toplevel(root)
+        self.toplevel.withdraw()
+        self.toplevel.wm_overrideredirect(True) # Sans décorations OS
+
+        # --- Rendre la Toplevel TRANSPARENTE ---
+        transparent_color = "#abcdef" # Fallback
+        try: _t = tk.Label(self.toplevel, fg="systemTransparent"); _t.destroy(); transparent_color = "systemTransparent"
+        except: pass
+        try:
+             self.toplevel.config(background=transparent_color)
+             # Sur Windows, rendre cette couleur transparente aux clics
+             if platform.system().lower() == "windows":
+                 self.toplevel.wm_attributes("-transparentcolor", transparent_color)
+             # Garder au dessus
+             self.toplevel.wm_attributes("-topmost", True)
+        except tk.TclError as e:
+             logger.warning("Échec config transparence Toplevel: %s", e)
+
+        # --- Canvas de la bordure (neuf morceaux) qui couvre la Toplevel ---
+        self.border_canvas = tk.Canvas(self.toplevel, borderwidth=0, highlightthickness=0)
+        # Le fond du canvas doit être la couleur transparente pour que les
+        # parties transparentes de l'image laissent voir le fond de la Toplevel
+        try:
+            self.border_canvas.config(bg=transparent_color)
+        except tk.TclError: # Fallback si couleur invalide
+             self.border_canvas.config(bg="white")
+        self.border_canvas.place(x=0, y=0, relwidth=1, relheight=1)
+
+        # --- Label de TEXTE par-dessus, centré ---
+        self.content_label = tk.Label(self.toplevel, justify=tk.LEFT)
+        self.content_label.place(relx=0.5, rely=0.5, anchor=tk.CENTER)
+
+    @classmethod
+    def for_widget(cls, widget):
+        root = widget._root()
+        window = _tooltip_windows.get(root)
+        if window is None or not window.toplevel.winfo_exists():
+            window = _tooltip_windows[root] = cls(root)
+            toplevel = window.toplevel
+
+            def forget(event):
+                # Racine détruite : l'entrée ne doit pas la garder en vie
+                if event.widget is toplevel:
+                    _tooltip_windows.pop(root, None)
+
+            toplevel.bind("<Destroy>", forget, add="+")
+        return window
+
+    def hide(self, owner):
+        if self.owner is owner:
+            self.owner = None
+            try: self.toplevel.withdraw()
+            except tk.TclError: pass
+
 
 class HoverTooltip:
     """
-    Crée une tooltip Toplevel utilisant une image de bordure personnalisée.
+    Affiche une tooltip avec une image de bordure personnalisée.
+    L'image, ses versions redimensionnées et la Toplevel sont partagées par
+    toutes les instances : un survol ne fait ni lecture disque ni
+    redimensionnement après le premier affichage d'une taille donnée.
+    Une même instance peut servir plusieurs widgets (attach) : le texte est lu
+    sur l'attribut tooltip_text du widget survolé.
     """
     def __init__(self, host_widget,
                  # Chemin vers l'image AVEC centre transparent
@@ -17,39 +178,39 @@ class HoverTooltip:
                  # Couleur de fond pour le texte lui-même
                  text_bg="#2B2B2B",
                  text_fg="white",
-                 font=("Segoe UI", 9)):
+                 font=("Segoe UI", 9),
+                 # Taille des coins de la bordure (None : un tiers de l'image)
+                 border_slice=None):
 
-        self.host_widget = host_widget
+        self.host_widget = None  # Widget survolé en dernier
+        self.hosts = []
         self.border_image_path = border_image_path
         self.content_padding = content_padding
         self.delay_ms = delay_ms
         self.text_bg = text_bg # Renommé pour clarté
         self.text_fg = text_fg # Renommé pour clarté
         self.font = font
+        self.border_slice = border_slice
         self.tooltip_window = None
         self.after_id = None
-        self._platform = platform.system().lower()
-        self.border_photo_ref = None
-        self.original_border_img = None
+        # Charger l'image de bordure originale (une seule lecture par chemin)
+        self.original_border_img = _load_border_image(self.border_image_path)
 
-        # Charger l'image de bordure originale
-        if os.path.exists(self.border_image_path):
-            try:
-                # Charger en RGBA pour gérer la transparence
-                self.original_border_img = Image.open(self.border_image_path).convert("RGBA")
-                print(f"Image de bordure chargée: {self.border_image_path}")
-            except Exception as e:
-                print(f"Erreur chargement image bordure {self.border_image_path}: {e}")
-        else:
-             print(f"Erreur: Image de bordure non trouvée: {self.border_image_path}")
+        if host_widget is not None:
+            self.attach(host_widget)
 
+    def attach(self, widget):
+        """Affiche aussi la tooltip au survol de `widget` (texte: widget.tooltip_text)."""
         # --- Bindings ---
-        self.host_widget.bind("<Enter>", self._schedule_show, add='+')
-        self.host_widget.bind("<Leave>", self._hide_now, add='+')
-        self.host_widget.bind("<ButtonPress>", self._hide_now, add='+')
+        widget.bind("<Enter>", self._schedule_show, add='+')
+        widget.bind("<Leave>", self._hide_now, add='+')
+        widget.bind("<ButtonPress>", self._hide_now, add='+')
+        self.hosts.append(widget)
+        if self.host_widget is None: self.host_widget = widget
 
     def _schedule_show(self, event=None):
         self._cancel_schedule(); self._hide_now()
+        if event is not None: self.host_widget = event.widget
         self.after_id = self.host_widget.after(self.delay_ms, self._show)
 
     def _cancel_schedule(self):
@@ -58,100 +219,61 @@ class HoverTooltip:
     def _hide_now(self, event=None):
         self._cancel_schedule()
         if self.tooltip_window:
-            try: self.tooltip_window.destroy()
-            except tk.TclError: pass
+            self.tooltip_window.hide(self)
             self.tooltip_window = None
-        self.border_photo_ref = None # Important pour libérer référence
+
+    def hide_for(self, widget):
+        """Cache la tooltip si elle est (ou va être) affichée pour `widget` (contenu changé)."""
+        if self.host_widget is widget: self._hide_now()
 
     def _show(self):
         """Crée et affiche la tooltip avec bordure image."""
         if self.tooltip_window or not self.original_border_img:
-            # print("Debug: Tooltip déjà visible ou image bordure manquante.")
+            # Tooltip déjà visible ou image bordure manquante
             return
         text_to_display = getattr(self.host_widget, 'tooltip_text', None)
         if not text_to_display:
-            # print("Debug: Pas de texte tooltip trouvé sur le widget hôte.")
+            # Pas de texte tooltip sur le widget hôte
             return
 
-        # --- Créer la Toplevel (Fenêtre externe) ---
-        self.tooltip_window = tk.Toplevel(self.host_widget)
-        self.tooltip_window.wm_overrideredirect(True) # Sans décorations OS
-
-        # --- Rendre la Toplevel TRANSPARENTE ---
-        transparent_color = "#abcdef" # Fallback
-        try: _t = tk.Label(fg="systemTransparent"); _t.destroy(); transparent_color = "systemTransparent"
-        except: pass
-        try:
-             self.tooltip_window.config(background=transparent_color)
-             # Sur Windows, rendre cette couleur transparente aux clics
-             if self._platform == "windows":
-                 self.tooltip_window.wm_attributes("-transparentcolor", transparent_color)
-             # Garder au dessus
-             self.tooltip_window.wm_attributes("-topmost", True)
-        except tk.TclError as e:
-             print(f"Warning: Échec config transparence Toplevel: {e}")
-
-
-        # --- Calculer la taille requise par le TEXTE ---
-        # Utiliser un label temporaire DANS la toplevel pour le calcul
-        temp_text_label = tk.Label(self.tooltip_window, text=text_to_display, font=self.font,
-                                   padx=self.content_padding[0], pady=self.content_padding[1])
-        temp_text_label.update_idletasks() # Calculer taille
-        req_text_width = temp_text_label.winfo_reqwidth()
-        req_text_height = temp_text_label.winfo_reqheight()
-        temp_text_label.destroy()
-
-        # --- Redimensionner l'image de BORDURE pour correspondre à la taille du texte ---
-        # La taille totale de la tooltip sera dictée par cette image redimensionnée
-        total_width = req_text_width
-        total_height = req_text_height
-
-        try:
-            # Utiliser NEAREST pour pixel art, ou LANCZOS/ANTIALIAS si image lisse
-            resized_border_img = self.original_border_img.resize((total_width, total_height), Image.Resampling.NEAREST)
-            self.border_photo_ref = ImageTk.PhotoImage(resized_border_img)
-        except Exception as e:
-             print(f"Erreur redimensionnement image bordure ({total_width}x{total_height}): {e}")
-             self._hide_now(); return
-
-        # --- Placer l'IMAGE de bordure pour couvrir la Toplevel ---
-        border_label = tk.Label(self.tooltip_window, image=self.border_photo_ref, borderwidth=0)
-        # Important: le background du label doit être la couleur transparente
-        # pour que les parties transparentes de l'image laissent voir le fond de la Toplevel
-        # (qui est lui-même transparent)
-        try:
-            border_label.config(bg=transparent_color)
-        except: # Fallback si couleur invalide
-             border_label.config(bg="white") # Ou une autre couleur visible pour debug
-
-        border_label.place(x=0, y=0)
-
-        # --- Placer le Label de TEXTE par-dessus, centré ---
-        content_label = tk.Label(
-            self.tooltip_window, # Parent est la Toplevel
+        window = _TooltipWindow.for_widget(self.host_widget)
+        window.content_label.config(
             text=text_to_display,
-            justify=tk.LEFT,
             background=self.text_bg,  # Fond OPAQUE pour le texte
             foreground=self.text_fg,
             font=self.font,
             padx=self.content_padding[0],
             pady=self.content_padding[1]
         )
-        # Placer au centre de la zone de l'image de bordure
-        content_label.place(relx=0.5, rely=0.5, anchor=tk.CENTER)
+        # --- La taille requise par le TEXTE dicte celle de la bordure ---
+        # (la taille demandée par un Label est calculée dès sa configuration)
+        total_width = window.content_label.winfo_reqwidth()
+        total_height = window.content_label.winfo_reqheight()
+        try:
+            _nine_slice(window.border_canvas, self.border_image_path, self.border_slice).draw(
+                window.border_canvas, total_width, total_height)
+        except Exception as e:
+             logger.warning("Erreur dessin bordure (%dx%d): %s", total_width, total_height, e)
+             return
 
-        # --- Positionner la Toplevel ---
+        # --- Positionner et montrer la Toplevel ---
         try:
             x = self.host_widget.winfo_pointerx() + 15
             y = self.host_widget.winfo_pointery() + 10
-            self.tooltip_window.update_idletasks()
-            # Définir la taille de la Toplevel = taille de l'image redimensionnée
-            self.tooltip_window.geometry(f"{total_width}x{total_height}+{x}+{y}")
+            # Définir la taille de la Toplevel = taille du texte (bordure comprise)
+            window.toplevel.geometry(f"{total_width}x{total_height}+{x}+{y}")
+            if window.owner is not None and window.owner is not self:
+                window.owner.tooltip_window = None  # Une autre tooltip cède la place
+            window.owner = self
+            self.tooltip_window = window
+            window.toplevel.deiconify()
+            window.toplevel.lift()
         except tk.TclError:
              self._hide_now()
 
-    # --- unbind (inchangé) ---
     def unbind(self):
-        try: self.host_widget.unbind("<Enter>"); self.host_widget.unbind("<Leave>"); self.host_widget.unbind("<ButtonPress>")
-        except tk.TclError: pass
-        self._hide_now()
\ No newline at end of file
+        self._hide_now()
+        for widget in self.hosts:
+            try: widget.unbind("<Enter>"); widget.unbind("<Leave>"); widget.unbind("<ButtonPress>")
+            except tk.TclError: pass
+        self.hosts = []
\ No newline at end of file
@@ -0,0 +1,443 @@
+# utils/build_search.py
+"""
+Recherche exhaustive de builds (une combinaison d'items par slot d'équipement).
+
+Les règles de score ne sont pas décomposables slot par slot (bonus de set,
+plafonds, multiplicateurs de dégâts) : il faut donc évaluer chaque combinaison.
+L'énumération est répartie sur un pool multiprocessing ; la matrice des stats
+(une ligne par item candidat, une colonne par stat utile au score) est placée
+une seule fois en mémoire partagée, les tâches ne transportent que des indices.
+"""
+import argparse
+import heapq
+import itertools
+import multiprocessing
+import os
+import time
+from array import array
+from multiprocessing import shared_memory
+
+from utils.item_stats import level_stats, resolve_level
+from utils.masks import mask_and, mask_eq, mask_indices, mask_not
+from utils.slots import EQUIPMENT_SLOTS, candidate_slots
+
+
+class BuildScorer:
+    """
+    Score d'un build à partir des stats cumulées de ses items.
+
+    weights: {stat: poids} pour la somme pondérée.
+    caps: {stat: plafond} appliqué au total de la stat avant pondération.
+    set_bonus_value: points ajoutés pour chaque bonus de set complété.
+    damage_multiplier_stats: stats en % qui multiplient le score final
+        (ex. "magic_damage" : score * (1 + total / 100)).
+    """
+
+    def __init__(
+        self, weights, caps=None, set_bonus_value=0.0, damage_multiplier_stats=()
+    ):
+        self.weights = dict(weights)
+        self.caps = dict(caps or {})
+        self.set_bonus_value = float(set_bonus_value)
+        self.damage_multiplier_stats = tuple(damage_multiplier_stats)
+
+    def stat_names(self):
+        """Stats nécessaires au calcul du score (colonnes de la matrice)."""
+        names = list(self.weights)
+        for stat in itertools.chain(self.caps, self.damage_multiplier_stats):
+            if stat not in names:
+                names.append(stat)
+        return names
+
+    def score(self, totals, set_counts=None, set_sizes=None):
+        """
+        totals: stats cumulées, dans l'ordre de stat_names().
+        set_counts: {set_id: pièces équipées}, set_sizes: {set_id: pièces requises}.
+        """
+        names = self.stat_names()
+        capped = {}
+        for stat, total in zip(names, totals):
+            cap = self.caps.get(stat)
+            capped[stat] = min(total, cap) if cap is not None else total
+        value = sum(weight * capped[stat] for stat, weight in self.weights.items())
+        if set_counts and self.set_bonus_value:
+            for set_id, count in set_counts.items():
+                if count >= set_sizes.get(set_id, 0) > 0:
+                    value += self.set_bonus_value
+        for stat in self.damage_multiplier_stats:
+            value *= 1.0 + capped[stat] / 100.0
+        return value
+
+
+class BuildSearchResult:
+    """Meilleurs builds trouvés et mesures de l'énumération."""
+
+    def __init__(self, builds, evaluated, elapsed, processes):
+        self.builds = builds  # [(score, {slot: item_data}), ...] du meilleur au moins bon
+        self.evaluated = evaluated
+        self.elapsed = elapsed
+        self.processes = processes
+
+    @property
+    def builds_per_sec(self):
+        return self.evaluated / self.elapsed if self.elapsed > 0 else 0.0
+
+
+def build_candidates(items, slot_names, level=None):
+    """
+    Regroupe les items par slot d'équipement.
+    Retourne (slots, candidates, rows) :
+    - slots : slots ayant au moins un candidat, dans l'ordre de slot_names ;
+    - candidates : pour chaque slot, la liste des indices de ligne candidates ;
+    - rows : (item_data, niveau, stats) par ligne.
+    Des slots interchangeables (Ring1/Ring2) ont la même liste de candidats
+    (voir twin_slots) ; s'il y a moins de candidats que de tels slots, les
+    derniers restent vides et sont retirés.
+    """
+    rows = []
+    row_of_item = {}
+    candidates = {slot: [] for slot in slot_names}
+    for item_data in items:
+        if not isinstance(item_data, dict):
+            continue
+        targets = candidate_slots(item_data.get("slot"), slot_names)
+        if not targets:
+            continue
+        item_level = resolve_level(item_data, level)
+        if item_level is None:
+            continue
+        key = id(item_data)
+        if key not in row_of_item:
+            row_of_item[key] = len(rows)
+            rows.append((item_data, item_level, level_stats(item_data, item_level)))
+        for slot in targets:
+            candidates[slot].append(row_of_item[key])
+    slots = []
+    for slot in slot_names:
+        slot_rows = candidates[slot]
+        twins = sum(1 for kept in slots if candidates[kept] == slot_rows)
+        if len(slot_rows) > twins:
+            slots.append(slot)
+    return slots, [candidates[slot] for slot in slots], rows
+
+
+def twin_slots(candidates):
+    """
+    [(p, q), ...] : le slot p partage ses candidats avec le slot q < p
+    (Ring1/Ring2). Un item ne pouvant occuper deux slots et l'ordre des deux
+    anneaux étant indifférent, un build valide a ligne[p] > ligne[q].
+    """
+    twins = []
+    for p, slot_rows in enumerate(candidates):
+        for q in range(p - 1, -1, -1):
+            if candidates[q] == slot_rows:
+                twins.append((p, q))
+                break
+    return tuple(twins)
+
+
+def _valid_combo(combo, twins):
+    """Vrai si chaque paire de slots jumeaux porte deux lignes distinctes, dans l'ordre."""
+    return all(combo[p] > combo[q] for p, q in twins if p < len(combo))
+
+
+# --- État des workers (initialisé une fois par processus) ---
+_worker = {}
+
+
+def _init_worker(
+    shm_name, n_stats, candidates, twins, set_ids, set_sizes, scorer, top_k
+):
+    shm = shared_memory.SharedMemory(name=shm_name)
+    _worker.update(
+        shm=shm,  # Garder la référence : la vue mémoire en dépend
+        matrix=shm.buf.cast("d"),
+        n_stats=n_stats,
+        candidates=candidates,
+        twins=twins,
+        set_ids=set_ids,
+        set_sizes=set_sizes,
+        scorer=scorer,
+        top_k=top_k,
+    )
+
+
+def _evaluate_prefix(prefix):
+    """Énumère toutes les combinaisons commençant par `prefix` (indices de ligne)."""
+    matrix = _worker["matrix"]
+    n_stats = _worker["n_stats"]
+    candidates = _worker["candidates"]
+    twins = _worker["twins"]
+    set_ids = _worker["set_ids"]
+    set_sizes = _worker["set_sizes"]
+    scorer = _worker["scorer"]
+    top_k = _worker["top_k"]
+    use_sets = bool(set_sizes) and scorer.set_bonus_value != 0.0
+
+    base = [0.0] * n_stats
+    for row in prefix:
+        offset = row * n_stats
+        for k in range(n_stats):
+            base[k] += matrix[offset + k]
+
+    best = []
+    evaluated = 0
+    for combo in itertools.product(*candidates[len(prefix):]):
+        if twins and not _valid_combo(prefix + combo, twins):
+            continue  # Même anneau deux fois, ou paire déjà vue dans l'autre ordre
+        totals = list(base)
+        for row in combo:
+            offset = row * n_stats
+            for k in range(n_stats):
+                totals[k] += matrix[offset + k]
+        set_counts = None
+        if use_sets:
+            set_counts = {}
+            for row in itertools.chain(prefix, combo):
+                set_id = set_ids[row]
+                if set_id >= 0:
+                    set_counts[set_id] = set_counts.get(set_id, 0) + 1
+        value = scorer.score(totals, set_counts, set_sizes)
+        evaluated += 1
+        entry = (value, prefix + combo)
+        if len(best) < top_k:
+            heapq.heappush(best, entry)
+        elif entry > best[0]:
+            heapq.heapreplace(best, entry)
+    return evaluated, best
+
+
+def _split_prefixes(candidates, min_tasks, twins=()):
+    """Découpe l'espace des combinaisons en préfixes fixés (une tâche par préfixe)."""
+    depth = 0
+    count = 1
+    while depth < len(candidates) - 1 and count < min_tasks:
+        count *= len(candidates[depth])
+        depth += 1
+    return [
+        prefix
+        for prefix in itertools.product(*candidates[:depth])
+        if _valid_combo(prefix, twins)
+    ]
+
+
+def enumerate_builds(items, scorer, slot_names, level=None, processes=None, top_k=10):
+    """
+    Évalue tous les builds possibles et retourne un BuildSearchResult.
+    processes=1 exécute l'énumération dans le processus courant (sans pool).
+    """
+    processes = processes or os.cpu_count() or 1
+    slots, candidates, rows = build_candidates(items, slot_names, level)
+    if not slots:
+        return BuildSearchResult([], 0, 0.0, processes)
+    twins = twin_slots(candidates)
+
+    stat_names = scorer.stat_names()
+    n_stats = max(1, len(stat_names))
+    flat = array("d", [0.0]) * (len(rows) * n_stats)
+    set_ids = array("i", [-1]) * len(rows)
+    set_index = {}
+    set_sizes = {}
+    for row, (item_data, _level, stats) in enumerate(rows):
+        for k, stat in enumerate(stat_names):
+            flat[row * n_stats + k] = stats.get(stat, 0.0)
+        set_bonus = item_data.get("set_bonus")
+        if isinstance(set_bonus, dict) and set_bonus.get("set_items"):
+            key = tuple(sorted(set_bonus["set_items"]))
+            if key not in set_index:
+                set_index[key] = len(set_index)
+                set_sizes[set_index[key]] = int(set_bonus.get("pieces_required") or 0)
+            set_ids[row] = set_index[key]
+
+    shm = shared_memory.SharedMemory(create=True, size=max(8, len(flat) * 8))
+    try:
+        shm.buf[: len(flat) * 8] = flat.tobytes()
+        init_args = (
+            shm.name,
+            n_stats,
+            tuple(tuple(c) for c in candidates),
+            twins,
+            set_ids,
+            set_sizes,
+            scorer,
+            top_k,
+        )
+        prefixes = _split_prefixes(candidates, processes * 8, twins)
+        start = time.perf_counter()
+        if processes == 1:
+            _init_worker(*init_args)
+            try:
+                results = [_evaluate_prefix(p) for p in prefixes]
+            finally:
+                _worker["matrix"].release()
+                _worker.pop("shm").close()
+                _worker.clear()
+        else:
+            with multiprocessing.Pool(
+                processes, initializer=_init_worker, initargs=init_args
+            ) as pool:
+                results = pool.map(_evaluate_prefix, prefixes, chunksize=1)
+        elapsed = time.perf_counter() - start
+    finally:
+        shm.close()
+        shm.unlink()
+
+    evaluated = sum(count for count, _best in results)
+    best = heapq.nlargest(top_k, itertools.chain.from_iterable(b for _c, b in results))
+    builds = [
+        (value, {slot: rows[row][0] for slot, row in zip(slots, combo)})
+        for value, combo in best
+    ]
+    return BuildSearchResult(builds, evaluated, elapsed, processes)
+
+
+def measure_scaling(items, scorer, slot_names, level=None, process_counts=None):
+    """
+    Lance l'énumération avec différents nombres de processus et retourne
+    [{processes, builds, seconds, builds_per_sec, speedup}, ...].
+    """
+    if process_counts is None:
+        cpu = os.cpu_count() or 1
+        process_counts = sorted({1, 2, 4, 8, cpu} & set(range(1, cpu + 1)))
+    report = []
+    baseline = None
+    for processes in process_counts:
+        result = enumerate_builds(items, scorer, slot_names, level, processes, top_k=1)
+        if baseline is None:
+            baseline = result.builds_per_sec
+        report.append(
+            {
+                "processes": processes,
+                "builds": result.evaluated,
+                "seconds": result.elapsed,
+                "builds_per_sec": result.builds_per_sec,
+                "speedup": result.builds_per_sec / baseline if baseline else 0.0,
+            }
+        )
+    return report
+
+
+def _best_row(index, score, rows, minimum=None):
+    """
+    (score, ligne) maximal parmi les lignes du masque ; None si le masque est
+    vide ou si le meilleur score ne dépasse pas `minimum`. À égalité : l'item
+    de plus petit nom, à son plus haut niveau (indépendant de l'ordre du
+    catalogue). Maximum et égalités se lisent par masques ; seules les lignes
+    à égalité (en général une seule) sont départagées en Python.
+    """
+    selected = array("d", itertools.compress(score, rows))
+    if not selected:
+        return None
+    top = max(selected)
+    if minimum is not None and top <= minimum:
+        return None
+    tied = mask_indices(mask_and(rows, mask_eq(score, top)))
+    row = min(
+        tied,
+        key=lambda row: (
+            str(index.items[index.row_item[row]].get("name") or ""),
+            -index.row_level[row],
+        ),
+    )
+    return top, row
+
+
+def best_items_per_slot(index, weights, slot_names, max_level=None, locks=None):
+    """
+    Meilleur item par slot d'équipement, au meilleur niveau atteignable <= max_level.
+
+    index: CatalogIndex du catalogue ; weights: {stat: poids}.
+    locks: {slot: item_data} conservés tels quels (ex. l'arme actuellement équipée).
+    Retourne {slot: (item_data, niveau, score)} ; les slots sans candidat de
+    score > 0 (aucune stat pondérée) sont absents et gardent leur item actuel.
+    """
+    locks = locks or {}
+    score = index.score_column(weights)
+    allowed = index.max_level_mask(max_level)
+    result = {}
+
+    # Les items verrouillés gardent leur slot et ne sont plus candidats ailleurs
+    for slot, item_data in locks.items():
+        item_id = index.item_id_of(item_data)
+        if item_id is None:
+            result[slot] = (item_data, resolve_level(item_data, max_level), 0.0)
+            continue
+        item_rows = index.item_rows_mask(item_id)
+        best = _best_row(index, score, mask_and(item_rows, allowed))
+        if best is None:
+            result[slot] = (item_data, None, 0.0)
+        else:
+            result[slot] = (item_data, index.row_level[best[1]], best[0])
+        allowed = mask_and(allowed, mask_not(item_rows))
+
+    for slot in slot_names:
+        if slot in locks:
+            continue
+        slot_rows = mask_and(index.slot_mask(slot, slot_names), allowed)
+        best = _best_row(index, score, slot_rows, minimum=0.0)
+        if best is None:
+            continue
+        value, row = best
+        item_id = index.row_item[row]
+        result[slot] = (index.items[item_id], index.row_level[row], value)
+        # Un même item ne peut pas occuper deux slots (Ring1/Ring2)
+        allowed = mask_and(allowed, mask_not(index.item_rows_mask(item_id)))
+    return result
+
+
+def _parse_mapping(text):
+    """'max_health=1,armor=2' -> {'max_health': 1.0, 'armor': 2.0}"""
+    mapping = {}
+    for part in filter(None, (p.strip() for p in (text or "").split(","))):
+        stat, _, value = part.partition("=")
+        mapping[stat.strip()] = float(value) if value else 1.0
+    return mapping
+
+
+def main(argv=None):
+    # Imports locaux : inutiles aux workers (spawn sous Windows)
+    from utils.catalog_generator import generate_catalog
+    from utils.data_loader import load_data_from_file
+
+    parser = argparse.ArgumentParser(description="Recherche parallèle de builds")
+    parser.add_argument("--weights", default="max_health=1,armor=1")
+    parser.add_argument("--caps", default="")
+    parser.add_argument("--set-bonus", type=float, default=0.0)
+    parser.add_argument("--multiply", default="", help="stats %% multiplicatives")
+    parser.add_argument("--level", type=int, default=None)
+    parser.add_argument("--processes", default="", help="ex. 1,2,4 (mesure de scaling)")
+    parser.add_argument("--top", type=int, default=5)
+    parser.add_argument(
+        "--synthetic", type=int, default=0, help="catalogue synthétique de N items"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    if args.synthetic:
+        items = generate_catalog(args.synthetic, args.seed)
+    else:
+        items = load_data_from_file(os.path.join("data", "weapons.json"))
+        items += load_data_from_file(os.path.join("data", "armor.json"))
+    scorer = BuildScorer(
+        _parse_mapping(args.weights),
+        caps=_parse_mapping(args.caps),
+        set_bonus_value=args.set_bonus,
+        damage_multiplier_stats=[s for s in args.multiply.split(",") if s],
+    )
+    slot_names = list(EQUIPMENT_SLOTS)
+
+    counts = [int(p) for p in args.processes.split(",") if p] or None
+    for line in measure_scaling(items, scorer, slot_names, args.level, counts):
+        print(
+            f"{line['processes']:>3} proc: {line['builds']} builds en "
+            f"{line['seconds']:.2f}s -> {line['builds_per_sec']:.0f} builds/s "
+            f"(x{line['speedup']:.2f})"
+        )
+    result = enumerate_builds(items, scorer, slot_names, args.level, top_k=args.top)
+    for value, build in result.builds:
+        names = ", ".join(f"{slot}: {item['name']}" for slot, item in build.items())
+        print(f"{value:.1f} -> {names}")
+
+
+if __name__ == "__main__":
+    main()
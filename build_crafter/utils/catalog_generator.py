@@ -0,0 +1,353 @@
+# utils/catalog_generator.py
+"""
+Catalogues synthétiques fidèles au schéma de data/*.json, pour les tests de
+montée en charge.
+
+Chaque item a les mêmes champs que les données livrées (id_wiki, slot,
+rarity, category, set_bonus, image_url, local_image_path, levels...) et des
+niveaux min_level..max_level dont les effets évoluent comme dans le wiki :
+types suffixés "(+x)" sur les armures, dégâts {min, max} sur les armes.
+Les proportions (slots, raretés, écarts de niveaux, sets de 3 pièces)
+reprennent celles des données livrées. Même taille + même graine -> même
+catalogue.
+
+    python -m utils.catalog_generator --size 50000 --seed 1 --split out/
+"""
+import argparse
+import json
+import os
+import random
+
+from utils.slots import WEAPON_SLOT_TYPES
+
+IMAGE_URL_ROOT = "https://static.wikia.nocookie.net/core-keeper/images"
+
+# Proportions des données livrées (266 items)
+SLOT_WEIGHTS = {
+    "Helm": 69,
+    "Chest": 63,
+    "Pants": 52,
+    "Melee Weapon": 33,
+    "Range Weapon": 20,
+    "Magic Weapon": 15,
+    None: 14,
+}
+RARITY_WEIGHTS = {"Common": 28, "Uncommon": 79, "Rare": 101, "Epic": 56, "Legendary": 2}
+RARITY_FACTORS = {"Common": 1.0, "Uncommon": 1.3, "Rare": 1.7, "Epic": 2.2, "Legendary": 3.0}
+LEVEL_SPANS = (9, 3, 12, 2, 16, 6, 14, 11)  # max_level - min_level, du plus fréquent
+SET_SHARE = 0.3  # Part des armures appartenant à un set (casque, plastron, jambières)
+SET_PIECES_REQUIRED = 3
+SET_BONUSES = (
+    "+15% of magic barrier is added as magic damage",
+    "+10% melee damage",
+    "+20% range attack speed",
+    "+1 max minion count",
+    "+8% critical hit chance",
+    "+25 max health",
+)
+
+PREFIXES = (
+    "Ancient", "Apprentice", "Bronze", "Copper", "Crystal", "Desert", "Galaxite",
+    "Ghost", "Iron", "Larva", "Mold", "Obsidian", "Octarine", "Scarlet", "Slime",
+    "Solarite", "Tin", "Wood", "Frost", "Ember", "Clay", "Coral", "Void", "Titan",
+)
+SECONDARIES = ("Wide Slash", "Charged Shot", "Piercing Bolt", "Spin Attack", "Burst")
+EFFECT_TEXTS = (
+    ("critical hit damage", True),
+    ("chance to knockback on melee hit", True),
+    ("critical hit chance", True),
+    ("damage against bosses", True),
+    ("life on hit", False),
+)
+
+# Profil par slot : catégories, noms, stats d'armure ou type de dégâts d'arme.
+# Stats : (type, libellé, valeur de base, gain par niveau, en %)
+ARMOR_STATS = (
+    ("max_health", "max health", 8, 0.3, False),
+    ("armor", "armor", 4, 0.25, False),
+    ("magic_barrier", "magic barrier", 12, 0.15, False),
+    ("dodge_chance", "dodge chance", 2, 0.1, True),
+    ("movement_speed", "movement speed", 2.5, 0.1, True),
+    ("critical_hit_chance", "critical hit chance", 2, 0.1, True),
+    ("damage", "damage", 3.1, 0.25, True),
+    ("max_minion_count", "max minion count", 1, 0.0, False),
+    ("max_mana", "max mana", 10, 0.2, False),
+)
+SLOT_PROFILES = {
+    "Helm": {
+        "category": ["Equipment", "Helm"],
+        "nouns": ("Helm", "Hat", "Mask", "Hood", "Crown"),
+        "durability": (90, 95, 100),
+    },
+    "Chest": {
+        "category": ["Equipment", "Breast armor"],
+        "nouns": ("Breastplate", "Robe", "Chestplate", "Vest", "Shirt"),
+        "durability": (90, 95, 100),
+    },
+    "Pants": {
+        "category": ["Equipment", "Pants armor"],
+        "nouns": ("Pants", "Leggings", "Greaves", "Trousers"),
+        "durability": (90, 95, 100),
+    },
+    "Melee Weapon": {
+        "category": ["Equipment", "Melee weapon"],
+        "nouns": ("Sword", "Axe", "Hammer", "Dagger", "Spear"),
+        "damage": "melee_damage",
+        "durability": (350,),
+    },
+    "Range Weapon": {
+        "category": ["Equipment", "Range weapon"],
+        "nouns": ("Bow", "Blaster", "Crossbow", "Slingshot"),
+        "damage": "range_damage",
+        "durability": (350,),
+    },
+    "Magic Weapon": {
+        "category": ["Equipment", "Magic weapon"],
+        "nouns": ("Staff", "Wand", "Tome", "Scepter"),
+        "damage": "magic_damage",
+        "durability": (350,),
+    },
+    None: {
+        "category": ["Explosives"],
+        "nouns": ("Bomb", "Dynamite", "Grenade"),
+        "damage": "explosive_damage",
+        "durability": (None,),
+    },
+}
+SET_SLOTS = ("Helm", "Chest", "Pants")
+
+
+def _format_number(value):
+    return f"{value:g}"
+
+
+def _armor_effects(stats, level, min_level, rarity_factor):
+    """Effets d'une armure à ce niveau ; au-delà du premier, types suffixés du gain."""
+    effects = []
+    for stat_type, label, base, growth, is_percentage in stats:
+        def value_at(lvl):
+            raw = base * rarity_factor * (1 + growth * (lvl - min_level))
+            return round(raw, 1) if is_percentage else int(round(raw))
+
+        value = value_at(level)
+        unit = "%" if is_percentage else ""
+        text = f"+{_format_number(value)}{unit} {label}"
+        suffix = ""
+        if level > min_level:
+            suffix = f"(+{_format_number(round(value - value_at(min_level), 1))}{unit})"
+        effects.append(
+            {
+                "type": stat_type + suffix,
+                "value": value,
+                "is_percentage": is_percentage,
+                "text": text + suffix,
+            }
+        )
+    return effects
+
+
+def _weapon_effects(profile, traits, level, min_level, rarity_factor):
+    """Effets d'une arme : dégâts {min, max}, cadence, attaque secondaire, texte libre."""
+    base_min = traits["damage"] * rarity_factor
+    gain = 1 + 0.08 * (level - min_level)
+    low, high = int(base_min * gain), int(base_min * 1.22 * gain)
+    delta = low - int(base_min)
+    damage_text = f"{low}−{high}" + (f" (+{delta})" if level > min_level else "")
+    effects = [
+        {"type": profile["damage"], "value": {"min": low, "max": high}, "text": damage_text},
+        {
+            "type": "attack_rate",
+            "value": traits["attack_rate"],
+            "text": f"{traits['attack_rate']} per second",
+        },
+    ]
+    if traits["secondary"]:
+        effects.append(
+            {
+                "type": "secondary",
+                "value": traits["secondary"],
+                "is_percentage": False,
+                "text": traits["secondary"],
+            }
+        )
+    label, is_percentage = traits["effect"]
+    value = float(int(traits["effect_value"] * gain))
+    unit = "%" if is_percentage else ""
+    text = f"+{_format_number(value)}{unit} {label}"
+    if level > min_level:
+        text += f" (+{_format_number(value - int(traits['effect_value']))}{unit})"
+    effects.append(
+        {"type": "effects", "value": value, "is_percentage": is_percentage, "text": text}
+    )
+    return effects
+
+
+class CatalogGenerator:
+    """Génère des items au schéma des données livrées à partir d'une graine."""
+
+    def __init__(self, seed=0, image_paths=None):
+        self.rng = random.Random(seed)
+        # Chemins d'images existants à réutiliser (sinon chemins dérivés du nom)
+        self.image_paths = list(image_paths or [])
+        self.names = set()
+        self.set_count = 0
+        self.open_sets = []  # [(noms restants par slot, set_bonus)]
+
+    def _unique_name(self, slot):
+        rng = self.rng
+        name = f"{rng.choice(PREFIXES)} {rng.choice(SLOT_PROFILES[slot]['nouns'])}"
+        if name in self.names:
+            name = f"{name} {len(self.names)}"
+        self.names.add(name)
+        return name
+
+    def _levels(self, slot, rarity):
+        """(min_level, max_level, levels) avec des effets pour chaque niveau."""
+        rng = self.rng
+        profile = SLOT_PROFILES[slot]
+        min_level = rng.randint(1, 20)
+        max_level = min_level + rng.choice(LEVEL_SPANS)
+        rarity_factor = RARITY_FACTORS[rarity]
+        if "damage" in profile:
+            traits = {
+                "damage": rng.randint(10, 300),
+                "attack_rate": rng.choice((0.83, 1.25, 1.67, 2.5, 3.33)),
+                "secondary": rng.choice(SECONDARIES) if rng.random() < 0.3 else None,
+                "effect": rng.choice(EFFECT_TEXTS),
+                "effect_value": rng.randint(3, 40),
+            }
+            effects_at = lambda lvl: _weapon_effects(
+                profile, traits, lvl, min_level, rarity_factor
+            )
+        else:
+            stats = rng.sample(ARMOR_STATS[:2], rng.randint(1, 2))
+            stats += rng.sample(ARMOR_STATS[2:], rng.randint(0, 3))
+            effects_at = lambda lvl: _armor_effects(stats, lvl, min_level, rarity_factor)
+        levels = {
+            str(level): {"effects": effects_at(level)}
+            for level in range(min_level, max_level + 1)
+        }
+        return min_level, max_level, levels
+
+    def item(self, slot, name=None, set_bonus=None):
+        rng = self.rng
+        rarity = rng.choices(list(RARITY_WEIGHTS), list(RARITY_WEIGHTS.values()))[0]
+        name = name or self._unique_name(slot)
+        snake = name.lower().replace(" ", "_")
+        min_level, max_level, levels = self._levels(slot, rarity)
+        profile = SLOT_PROFILES[slot]
+        if self.image_paths:
+            local_image_path = rng.choice(self.image_paths)
+        else:
+            local_image_path = f"images/{snake}.png"
+        file_name = name.replace(" ", "_") + ".png"
+        return {
+            "name": name,
+            "id_wiki": snake,
+            "max_level": max_level,
+            "min_level": min_level,
+            "rarity": rarity,
+            "slot": slot,
+            "durability": rng.choice(profile["durability"]),
+            "category": list(profile["category"]),
+            "sell_value": int(rng.randint(5, 60) * RARITY_FACTORS[rarity] * min_level),
+            "tooltip": f"A {rarity.lower()} {profile['nouns'][0].lower()} ({name}).",
+            "set_bonus": set_bonus,
+            "image_url": f"{IMAGE_URL_ROOT}/{snake[0]}/{snake[:2]}/{file_name}",
+            "local_image_path": local_image_path,
+            "levels": levels,
+        }
+
+    def _set_piece(self, slot):
+        """(nom, set_bonus) d'une pièce de set : complète un set ouvert ou en ouvre un."""
+        for open_set in self.open_sets:
+            if slot in open_set[0]:
+                break
+        else:
+            self.set_count += 1
+            prefix = f"{self.rng.choice(PREFIXES)} Set{self.set_count}"
+            names = {
+                set_slot: f"{prefix} {self.rng.choice(SLOT_PROFILES[set_slot]['nouns'])}"
+                for set_slot in SET_SLOTS
+            }
+            self.names.update(names.values())
+            set_bonus = {
+                "pieces_required": SET_PIECES_REQUIRED,
+                "bonus": self.rng.choice(SET_BONUSES),
+                "set_items": sorted(names.values()),
+            }
+            open_set = (names, set_bonus)
+            self.open_sets.append(open_set)
+        names, set_bonus = open_set
+        name = names.pop(slot)
+        if not names:
+            self.open_sets.remove(open_set)
+        return name, dict(set_bonus, set_items=list(set_bonus["set_items"]))
+
+    def catalog(self, size):
+        """
+        `size` items tirés selon SLOT_WEIGHTS. Une part des armures forme des
+        sets : chaque pièce complète un set ouvert, ce qui garde les
+        proportions de slots. La probabilité d'être une pièce de set est
+        pondérée pour que chaque slot en fournisse autant ; quelques sets
+        restent incomplets, comme dans les données livrées.
+        """
+        slots = list(SLOT_WEIGHTS)
+        weights = list(SLOT_WEIGHTS.values())
+        rarest = min(SLOT_WEIGHTS[slot] for slot in SET_SLOTS)
+        set_chances = {
+            slot: SET_SHARE * rarest / SLOT_WEIGHTS[slot] for slot in SET_SLOTS
+        }
+        items = []
+        for _ in range(size):
+            slot = self.rng.choices(slots, weights)[0]
+            if self.rng.random() < set_chances.get(slot, 0.0):
+                items.append(self.item(slot, *self._set_piece(slot)))
+            else:
+                items.append(self.item(slot))
+        return items
+
+
+def generate_catalog(size, seed=0, image_paths=None):
+    """Liste de `size` items synthétiques, identique pour une même graine."""
+    return CatalogGenerator(seed, image_paths).catalog(size)
+
+
+def split_catalog(items):
+    """
+    Sépare un catalogue en (armes, armures) comme data/*.json : les items sans
+    slot (explosifs...) sont rangés avec les armes.
+    """
+    weapons, armor = [], []
+    for item_data in items:
+        slot = item_data.get("slot")
+        is_weapon = slot is None or str(slot).lower() in WEAPON_SLOT_TYPES
+        (weapons if is_weapon else armor).append(item_data)
+    return weapons, armor
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Catalogue synthétique")
+    parser.add_argument("--size", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="", help="fichier JSON (défaut: stdout)")
+    parser.add_argument(
+        "--split", default="", help="dossier où écrire weapons.json et armor.json"
+    )
+    args = parser.parse_args(argv)
+
+    items = generate_catalog(args.size, args.seed)
+    if args.split:
+        os.makedirs(args.split, exist_ok=True)
+        for file_name, part in zip(("weapons.json", "armor.json"), split_catalog(items)):
+            with open(os.path.join(args.split, file_name), "w", encoding="utf-8") as f:
+                json.dump(part, f, indent=2)
+    elif args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(items, f, indent=2)
+    else:
+        print(json.dumps(items, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,372 @@
+# utils/catalog_index.py
+"""
+Index en colonnes d'un catalogue d'items.
+
+Chaque ligne correspond à un couple (item, niveau) ; les lignes d'un même item
+sont contiguës et triées par niveau. Les stats numériques de chaque niveau sont
+extraites une seule fois dans des colonnes `array('d')` (0.0 si absente) et un
+masque de présence par stat, pour que les requêtes se fassent par masques.
+
+Les facettes (slot, rareté, catégorie) ont un masque d'items précalculé par
+valeur : une requête composite n'est qu'une suite de ET/OU sur ces masques.
+"""
+import re
+from array import array
+from bisect import bisect_left, bisect_right
+from itertools import compress, islice
+from operator import mul
+
+from utils.fuzzy import TrigramIndex
+from utils.item_stats import available_levels, level_stats
+from utils.masks import (
+    empty_mask,
+    full_mask,
+    mask_and,
+    mask_from_indices,
+    mask_from_range,
+    mask_ge,
+    mask_gt,
+    mask_le,
+    mask_lt,
+    mask_or,
+)
+from utils.slots import candidate_slots
+
+
+_NAME_TOKEN = re.compile(r"[a-z0-9]+")
+
+
+def tokenize_name(name):
+    """Mots (minuscules, alphanumériques) d'un nom d'item ou d'une recherche."""
+    return _NAME_TOKEN.findall(name.lower()) if isinstance(name, str) else []
+
+
+class CatalogIndex:
+    FACETS = ("slot", "rarity", "category")
+    STAT_OPERATORS = {">=": mask_ge, ">": mask_gt, "<=": mask_le, "<": mask_lt}
+
+    BUILD_CHUNK_SIZE = 250  # Items indexés entre deux pauses (construction par étapes)
+
+    def __init__(self, items, build=True):
+        """
+        build=False laisse l'index vide : il faut alors épuiser build_steps()
+        avant toute requête (construction répartie sur plusieurs callbacks).
+        """
+        self.items = [item for item in items if isinstance(item, dict)]
+        self._item_ids = {id(item_data): i for i, item_data in enumerate(self.items)}
+        self.row_item = array("i")
+        self.row_level = array("i")
+        self.item_row_start = array("i")  # item i -> lignes [start[i], start[i+1])
+        self.stat_names = []
+        self.stat_columns = {}
+        self.stat_presence = {}
+        self.facet_labels = {facet: {} for facet in self.FACETS}
+        self.facet_masks = {facet: {} for facet in self.FACETS}
+        self.name_token_ids = {}
+        self.name_tokens = []
+
+        self._slot_masks = {}
+        self._item_stat_values = {}
+        self._level_rows = {}  # niveau -> ligne de chaque item (valeurs, tris)
+        self._facet_term_keys = {}
+        self._name_trigrams = None  # Construit à la première recherche approximative
+        self._fuzzy_matches = {}
+        self._sort_orders = {}  # (stat, niveau) -> (ordre décroissant, nb d'items ayant la stat)
+        if build:
+            for _ in self.build_steps():
+                pass
+
+    def build_steps(self, chunk_size=None):
+        """
+        Construit l'index par étapes courtes : rend la main tous les
+        `chunk_size` items, puis tous les `chunk_size * 100` lignes de chaque
+        colonne de stat. L'index n'est utilisable qu'une fois le générateur
+        épuisé.
+        """
+        chunk_size = chunk_size or self.BUILD_CHUNK_SIZE
+        per_row_stats = []
+        stat_names = set()
+        facet_ids = {facet: {} for facet in self.FACETS}
+        name_token_ids = self.name_token_ids
+        for item_id, item_data in enumerate(self.items):
+            self.item_row_start.append(len(self.row_item))
+            for level in available_levels(item_data):
+                self.row_item.append(item_id)
+                self.row_level.append(level)
+                stats = level_stats(item_data, level)
+                per_row_stats.append(stats)
+                stat_names.update(stats)
+
+            # Facettes (valeurs en minuscules)
+            for facet in self.FACETS:
+                values = item_data.get(facet)
+                if not isinstance(values, list):
+                    values = [values]
+                for value in values:
+                    if isinstance(value, str) and value:
+                        facet_ids[facet].setdefault(value.lower(), []).append(item_id)
+                        self.facet_labels[facet].setdefault(value.lower(), value)
+
+            # Index des mots des noms : mot -> ids d'items
+            for token in set(tokenize_name(item_data.get("name"))):
+                name_token_ids.setdefault(token, array("i")).append(item_id)
+            if (item_id + 1) % chunk_size == 0:
+                yield
+        self.item_row_start.append(len(self.row_item))
+
+        # Colonnes de stats, par tranches de lignes (environ dix lignes par item)
+        self.stat_names = sorted(stat_names)
+        row_chunk = chunk_size * 100
+        for stat in self.stat_names:
+            column = array("d")
+            presence = bytearray()
+            for start in range(0, len(per_row_stats), row_chunk):
+                rows = per_row_stats[start : start + row_chunk]
+                column.extend([stats.get(stat, 0.0) for stats in rows])
+                presence.extend([stat in stats for stats in rows])
+                yield
+            self.stat_columns[stat] = column
+            self.stat_presence[stat] = bytes(presence)
+
+        # Masques par valeur de facette, mots triés pour les préfixes
+        for facet, values in facet_ids.items():
+            self.facet_masks[facet] = {
+                value: mask_from_indices(len(self.items), ids)
+                for value, ids in values.items()
+            }
+            yield
+        self.name_tokens = sorted(name_token_ids)
+
+    @property
+    def row_count(self):
+        return len(self.row_item)
+
+    @property
+    def item_count(self):
+        return len(self.items)
+
+    # --- Facettes et plages de stats (masques d'items) ---
+    def facet_values(self, facet, within=None):
+        """
+        Valeurs connues d'une facette, avec leur casse d'origine
+        (limitées aux items du masque `within` si fourni).
+        """
+        labels = self.facet_labels.get(facet, {})
+        if within is None:
+            return sorted(labels.values())
+        within_bits = int.from_bytes(within, "little")
+        return sorted(
+            labels[value]
+            for value, mask in self.facet_masks.get(facet, {}).items()
+            if int.from_bytes(mask, "little") & within_bits
+        )
+
+    def facet_mask(self, facet, values):
+        """Items dont la facette vaut l'une des `values` (insensible à la casse)."""
+        if isinstance(values, str):
+            values = [values]
+        masks = self.facet_masks.get(facet, {})
+        selected = [masks[v.lower()] for v in values if v and v.lower() in masks]
+        if not selected:
+            return empty_mask(len(self.items))
+        return mask_or(*selected)
+
+    def facet_term_mask(self, facet, term):
+        """
+        Items dont la facette correspond à `term` : valeur exacte, sinon valeurs
+        contenant ce mot (ex. slot:weapon -> Melee/Range/Magic Weapon).
+        """
+        key = (facet, term.lower())
+        if key not in self._facet_term_keys:
+            values = self.facet_masks.get(facet, {})
+            if key[1] in values:
+                matches = [key[1]]
+            else:
+                matches = [v for v in values if key[1] in tokenize_name(v)]
+            self._facet_term_keys[key] = matches
+        return self.facet_mask(facet, self._facet_term_keys[key])
+
+    # --- Recherche par nom (index des mots) ---
+    def _ids_mask(self, id_arrays):
+        mask = bytearray(len(self.items))
+        for ids in id_arrays:
+            for item_id in ids:
+                mask[item_id] = 1
+        return bytes(mask)
+
+    def name_prefix_mask(self, prefix):
+        """Items dont un mot du nom commence par `prefix`."""
+        prefix = prefix.lower()
+        start = bisect_left(self.name_tokens, prefix)
+        stop = bisect_left(self.name_tokens, prefix + "\uffff", start)
+        return self._ids_mask(
+            self.name_token_ids[token] for token in self.name_tokens[start:stop]
+        )
+
+    def fuzzy_token_distances(self, term):
+        """Mots du vocabulaire proches de `term` (contenant ou à quelques fautes près)."""
+        term = term.lower()
+        if term not in self._fuzzy_matches:
+            if self._name_trigrams is None:
+                self._name_trigrams = TrigramIndex(self.name_tokens)
+            self._fuzzy_matches[term] = self._name_trigrams.matches(term)
+        return self._fuzzy_matches[term]
+
+    def name_fuzzy_mask(self, term):
+        """Items dont un mot du nom est proche de `term`."""
+        return self._ids_mask(
+            self.name_token_ids[token] for token in self.fuzzy_token_distances(term)
+        )
+
+    def fuzzy_item_distances(self, term):
+        """{item_id: meilleure distance} pour les items ayant un mot proche de `term`."""
+        distances = {}
+        for token, distance in self.fuzzy_token_distances(term).items():
+            for item_id in self.name_token_ids[token]:
+                if distance < distances.get(item_id, distance + 1):
+                    distances[item_id] = distance
+        return distances
+
+    def item_stat_values(self, stat, level=None):
+        """
+        Valeur de `stat` pour chaque item au niveau donné (plus haut niveau <= level,
+        niveau max si None), NaN si l'item n'a pas la stat ou pas encore ce niveau.
+        """
+        key = (stat, level)
+        if key not in self._item_stat_values:
+            nan = float("nan")
+            column = self.stat_columns.get(stat)
+            if column is None:
+                values = array("d", [nan]) * len(self.items)
+            else:
+                # Ligne sentinelle en fin de colonne : les lignes -1 y tombent.
+                # NaN là où la stat est absente : valeur * (1.0 ou nan)
+                column = column + array("d", [nan])
+                present = self.stat_presence[stat] + b"\x00"
+                rows = self._all_item_rows(level)
+                factors = map((nan, 1.0).__getitem__, map(present.__getitem__, rows))
+                values = array("d", map(mul, map(column.__getitem__, rows), factors))
+            self._item_stat_values[key] = values
+        return self._item_stat_values[key]
+
+    def _all_item_rows(self, level):
+        """rows_at_level(tous les items, level, clamp=False), commun à toutes les stats."""
+        if level not in self._level_rows:
+            self._level_rows[level] = self.rows_at_level(
+                range(len(self.items)), level, clamp=False
+            )
+        return self._level_rows[level]
+
+    def stat_mask(self, stat, operator, value, level=None):
+        """Items vérifiant `stat <operator> value` au niveau donné (ex. ">=", 5)."""
+        values = self.item_stat_values(stat, level)
+        if operator in ("=", "=="):
+            return mask_and(mask_ge(values, value), mask_le(values, value))
+        return self.STAT_OPERATORS[operator](values, value)
+
+    def item_id_of(self, item_data):
+        """Identifiant (position) d'un dictionnaire d'item dans l'index, ou None."""
+        return self._item_ids.get(id(item_data))
+
+    def rows_at_level(self, item_ids, level=None, clamp=True):
+        """
+        Ligne de chaque item au niveau demandé : le plus haut niveau <= level
+        (level=None : niveau maximal). Si level est sous le niveau minimal de
+        l'item, on prend ce niveau minimal (clamp=True) ou -1 (clamp=False).
+        -1 également pour un item sans niveau.
+        """
+        rows = []
+        row_level = self.row_level
+        for item_id in item_ids:
+            start = self.item_row_start[item_id]
+            stop = self.item_row_start[item_id + 1]
+            if start == stop:
+                rows.append(-1)
+            elif level is None:
+                rows.append(stop - 1)
+            else:
+                position = bisect_right(row_level, level, start, stop)
+                if position == start and not clamp:
+                    rows.append(-1)
+                else:
+                    rows.append(max(position - 1, start))
+        return rows
+
+    def item_rows_mask(self, item_id):
+        """Masque des lignes (tous niveaux) d'un item."""
+        return mask_from_range(
+            self.row_count,
+            self.item_row_start[item_id],
+            self.item_row_start[item_id + 1],
+        )
+
+    def max_level_mask(self, max_level):
+        """Lignes dont le niveau est <= max_level (toutes si None)."""
+        if max_level is None:
+            return full_mask(self.row_count)
+        return mask_le(self.row_level, max_level)
+
+    def slot_mask(self, slot_name, slot_names):
+        """Lignes des items pouvant aller dans le slot d'équipement `slot_name`."""
+        key = (slot_name, tuple(slot_names))
+        if key not in self._slot_masks:
+            mask = bytearray(self.row_count)
+            for item_id, item_data in enumerate(self.items):
+                if slot_name in candidate_slots(item_data.get("slot"), slot_names):
+                    start = self.item_row_start[item_id]
+                    stop = self.item_row_start[item_id + 1]
+                    mask[start:stop] = b"\x01" * (stop - start)
+            self._slot_masks[key] = bytes(mask)
+        return self._slot_masks[key]
+
+    def score_column(self, weights):
+        """Somme pondérée des colonnes de stats : une valeur par ligne."""
+        score = array("d", bytes(8 * self.row_count))
+        for stat, weight in weights.items():
+            column = self.stat_columns.get(stat)
+            if column is None or not weight:
+                continue
+            weighted = map(float(weight).__mul__, column)
+            score = array("d", map(float.__add__, score, weighted))
+        return score
+
+    def sort_order(self, stat, level=None):
+        """
+        Ids d'items triés par valeur décroissante de `stat` au niveau donné
+        (niveau max si None), calculés une fois puis mis en cache. Un item
+        qui n'est pas encore disponible à ce niveau est classé sans la stat.
+        Retourne (ordre, n) : les n premiers ids ont la stat, les autres non.
+        """
+        key = (stat, level)
+        if key not in self._sort_orders:
+            column = self.stat_columns.get(stat)
+            item_count = len(self.items)
+            if column is None:
+                self._sort_orders[key] = (array("i", range(item_count)), 0)
+                return self._sort_orders[key]
+            rows = self._all_item_rows(level)
+            presence = self.stat_presence[stat]
+            keys = [
+                (presence[row], column[row]) if row >= 0 else (0, 0.0) for row in rows
+            ]
+            order = array(
+                "i", sorted(range(item_count), key=keys.__getitem__, reverse=True)
+            )
+            present = sum(1 for row in rows if row >= 0 and presence[row])
+            self._sort_orders[key] = (order, present)
+        return self._sort_orders[key]
+
+    def order_items(self, stat, level=None, descending=True, item_ids=None, top_k=None):
+        """
+        Trie un sous-ensemble d'ids d'items (tout le catalogue si None) sur `stat`.
+        Les items sans cette stat restent en fin de liste ; top_k limite le résultat.
+        """
+        order, present = self.sort_order(stat, level)
+        if not descending:
+            order = order[present - 1 :: -1] + order[present:] if present else order
+        if item_ids is not None:
+            members = bytearray(len(self.items))
+            for item_id in item_ids:
+                members[item_id] = 1
+            order = compress(order, map(members.__getitem__, order))
+        return list(islice(order, top_k))
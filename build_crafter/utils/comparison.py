@@ -0,0 +1,105 @@
+# utils/comparison.py
+"""
+Comparaison d'items candidats avec l'équipement actuel.
+
+Pour chaque candidat, le slot cible est déterminé comme lors de l'équipement
+(utils.slots.candidate_slots, premier choix), puis l'écart de chaque stat est
+calculé colonne par colonne sur tous les candidats à la fois.
+"""
+from array import array
+from itertools import repeat
+from operator import sub
+
+from utils.item_stats import level_stats, resolve_level
+from utils.slots import candidate_slots
+
+
+class ItemComparator:
+    def __init__(self, index, slot_names):
+        self.index = index
+        self.slot_names = list(slot_names)
+        self._slot_ids = {slot: i for i, slot in enumerate(self.slot_names)}
+        self._no_slot = len(self.slot_names)  # Items sans slot : comparés à "rien"
+        self.item_slot_ids = array(
+            "i",
+            [self._target_slot_id(item_data) for item_data in index.items],
+        )
+        self.equipped = {}  # slot -> (item_data, stats)
+        # stat -> valeur équipée par id de slot (dernière case : aucun slot)
+        self._equipped_values = {}
+
+    def _target_slot_id(self, item_data):
+        targets = candidate_slots(item_data.get("slot"), self.slot_names)
+        return self._slot_ids[targets[0]] if targets else self._no_slot
+
+    def target_slot(self, item_data):
+        """Slot qu'occuperait l'item s'il était équipé (None si aucun)."""
+        targets = candidate_slots(item_data.get("slot"), self.slot_names)
+        return targets[0] if targets else None
+
+    def set_equipped(self, slot_name, item_data, level=None):
+        """Enregistre l'item équipé dans un slot (None pour vider). level=None : niveau max."""
+        if item_data is None:
+            self.equipped.pop(slot_name, None)
+        else:
+            stats = level_stats(item_data, resolve_level(item_data, level))
+            self.equipped[slot_name] = (item_data, stats)
+        self._equipped_values = {}
+        for slot, (_item, stats) in self.equipped.items():
+            slot_id = self._slot_ids.get(slot)
+            if slot_id is None:
+                continue
+            for stat, value in stats.items():
+                values = self._equipped_values.setdefault(
+                    stat, [0.0] * (len(self.slot_names) + 1)
+                )
+                values[slot_id] = value
+
+    def deltas(self, item_ids, level=None):
+        """
+        Écarts candidat - équipé pour une liste d'ids d'items.
+        Retourne {stat: array('d')} aligné sur item_ids, limité aux stats
+        ayant au moins un écart non nul.
+        """
+        rows = self.index.rows_at_level(item_ids, level)
+        has_missing = -1 in rows
+        slot_ids = [self.item_slot_ids[item_id] for item_id in item_ids]
+        result = {}
+        for stat in self.index.stat_names:
+            column = self.index.stat_columns[stat]
+            if has_missing:
+                values = [column[row] if row >= 0 else 0.0 for row in rows]
+            else:
+                values = map(column.__getitem__, rows)
+            equipped_values = self._equipped_values.get(stat)
+            if equipped_values is None:
+                baseline = repeat(0.0)
+            else:
+                baseline = map(equipped_values.__getitem__, slot_ids)
+            delta = array("d", map(sub, values, baseline))
+            if any(delta):
+                result[stat] = delta
+        return result
+
+    def delta_badges(self, item_ids, level=None, max_stats=2):
+        """
+        Texte court par item ("+12 armor, -3 max_health") et signe de l'écart principal.
+        Retourne une liste de (texte, signe) alignée sur item_ids ; signe vaut 1, -1 ou 0.
+        """
+        deltas = self.deltas(item_ids, level)
+        badges = []
+        for position in range(len(item_ids)):
+            changes = [
+                (delta[position], stat)
+                for stat, delta in deltas.items()
+                if delta[position]
+            ]
+            if not changes:
+                badges.append(("=", 0))
+                continue
+            changes.sort(key=lambda change: abs(change[0]), reverse=True)
+            text = ", ".join(
+                f"{value:+.4g} {stat}" for value, stat in changes[:max_stats]
+            )
+            badges.append((text, 1 if changes[0][0] > 0 else -1))
+        return badges
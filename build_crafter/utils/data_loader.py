@@ -1,29 +1,32 @@
 # utils/data_loader.py
 import json
+import logging
 import os
 
+logger = logging.getLogger(__name__)
+
 def load_data_from_file(filepath):
     """Charge une liste de dictionnaires depuis un fichier JSON."""
     data = []
-    print(f"Attempting to load data from: {filepath}") # <<< Print 1
+    logger.debug("Attempting to load data from: %s", filepath)
     if not os.path.exists(filepath):
-        print(f"Error: Data file '{filepath}' does not exist.") # <<< Print 2
+        logger.error("Data file '%s' does not exist.", filepath)
         return data
     try:
         with open(filepath, 'r', encoding='utf-8') as f:
             data = json.load(f)
             if not isinstance(data, list):
-                print(f"Error: Content of '{filepath}' is not a valid JSON list. Type found: {type(data)}") # <<< Print 3
+                logger.error("Content of '%s' is not a valid JSON list. Type found: %s", filepath, type(data))
                 return []
-        print(f"Successfully loaded {len(data)} entries from {filepath}") # <<< Print 4
-        if data: # Check if list is not empty
-            print(f"Type of first element from {filepath}: {type(data[0])}") # <<< Print 5
+        logger.info("Successfully loaded %d entries from %s", len(data), filepath)
+        if data and logger.isEnabledFor(logging.DEBUG): # Check if list is not empty
+            logger.debug("Type of first element from %s: %s", filepath, type(data[0]))
             if isinstance(data[0], dict):
-                 print(f"Keys of first dictionary element: {list(data[0].keys())}") # <<< Print 6 (show keys)
+                 logger.debug("Keys of first dictionary element: %s", list(data[0].keys()))
         return data
     except json.JSONDecodeError:
-        print(f"Error: JSON file '{filepath}' is malformed.") # <<< Print 7
+        logger.error("JSON file '%s' is malformed.", filepath)
+        return []
+    except Exception:
+        logger.exception("Unexpected error loading %s", filepath)
         return []
-    except Exception as e:
-        print(f"Unexpected error loading {filepath}: {e}") # <<< Print 8
-        return []
\ No newline at end of file
@@ -0,0 +1,99 @@
+# utils/fuzzy.py
+"""
+Recherche approximative sur les mots des noms d'items.
+
+Un index de trigrammes sur le vocabulaire fournit les mots candidats (ceux qui
+partagent assez de trigrammes avec le terme cherché) ; la distance d'édition
+n'est calculée que sur ces candidats, jamais sur tout le catalogue.
+"""
+from collections import Counter
+
+
+def max_typos(term):
+    """Nombre de fautes tolérées selon la longueur du terme."""
+    if len(term) <= 2:
+        return 0
+    if len(term) <= 5:
+        return 1
+    return 2
+
+
+def levenshtein(a, b, max_distance=None):
+    """
+    Distance d'édition entre deux mots. Avec max_distance, le calcul s'arrête
+    dès que ce seuil est dépassé et retourne max_distance + 1.
+    """
+    if a == b:
+        return 0
+    if len(a) < len(b):
+        a, b = b, a
+    if max_distance is not None and len(a) - len(b) > max_distance:
+        return max_distance + 1
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(
+                min(
+                    previous[j] + 1,
+                    current[j - 1] + 1,
+                    previous[j - 1] + (char_a != char_b),
+                )
+            )
+        if max_distance is not None and min(current) > max_distance:
+            return max_distance + 1
+        previous = current
+    return previous[-1]
+
+
+def trigrams(word):
+    padded = f"$${word}$"
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+class TrigramIndex:
+    """Index trigramme -> mots du vocabulaire."""
+
+    def __init__(self, words):
+        self.words = list(words)
+        self.postings = {}
+        for word_id, word in enumerate(self.words):
+            for gram in trigrams(word):
+                self.postings.setdefault(gram, []).append(word_id)
+
+    def matches(self, term):
+        """
+        Mots proches de `term` : {mot: distance}, à max_typos(term) fautes près
+        sur le mot entier ou sur son début (un mot qui contient le terme vaut 0).
+        À partir de 3 caractères, un mot qui contient le terme partage tous ses
+        trigrammes intérieurs et passe donc le seuil : les candidats du trigramme
+        suffisent, sans parcourir le vocabulaire.
+        """
+        if len(term) < 3:
+            # Plus court qu'un trigramme (aucune faute tolérée) : une occurrence au
+            # milieu d'un mot ne partage aucun trigramme avec le terme, d'où un
+            # parcours du vocabulaire, limité à ces termes d'un ou deux caractères
+            return {word: 0 for word in self.words if term in word}
+        budget = max_typos(term)
+        grams = trigrams(term)
+        # Chaque faute détruit au plus 3 trigrammes ; le trigramme de fin ("rd$")
+        # et celui de début peuvent manquer pour un préfixe ou une sous-chaîne.
+        threshold = max(1, len(grams) - 3 * budget - 2)
+        counts = Counter()
+        for gram in grams:
+            counts.update(self.postings.get(gram, ()))
+        result = {}
+        for word_id, shared in counts.items():
+            if shared < threshold:
+                continue
+            word = self.words[word_id]
+            if term in word:
+                result[word] = 0
+                continue
+            distance = min(
+                levenshtein(term, word, budget),
+                levenshtein(term, word[: len(term)], budget),
+            )
+            if distance <= budget:
+                result[word] = distance
+        return result
@@ -0,0 +1,139 @@
+# utils/instrumentation.py
+"""
+Mesure des temps de réponse de l'interface.
+
+Les méthodes décorées par @timed("nom") enregistrent leur durée (ms) quand la
+mesure est active. Avec until_idle=True, le temps écoulé jusqu'au passage idle
+suivant de Tk (mise en page et redessin compris) est aussi enregistré, sous
+"nom->idle" : c'est la latence perçue (frappe -> liste redessinée, clic ->
+détails affichés).
+
+Inactive par défaut (un seul test de drapeau par appel). Elle s'active avec
+enable() ou la variable d'environnement BUILD_CRAFTER_TIMINGS : "1" affiche le
+rapport sur stderr à la sortie, un chemin de fichier l'écrit en JSON.
+"""
+import atexit
+import functools
+import json
+import os
+import sys
+import time
+from bisect import bisect_left
+
+# Bornes supérieures (ms) des classes de l'histogramme ; une classe de plus au-delà
+HISTOGRAM_BOUNDS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+ENVIRONMENT_VARIABLE = "BUILD_CRAFTER_TIMINGS"
+
+
+class TimingRecorder:
+    """Durées enregistrées par nom de mesure, avec histogramme et percentiles."""
+
+    def __init__(self):
+        self.enabled = False
+        self.samples = {}  # nom -> [durées en ms]
+        self._report_registered = False
+
+    def record(self, name, duration_ms):
+        self.samples.setdefault(name, []).append(duration_ms)
+
+    def reset(self):
+        self.samples = {}
+
+    def summary(self):
+        """{nom: {count, mean, p50, p95, max, last, histogram}} (durées en ms)."""
+        result = {}
+        for name, durations in sorted(self.samples.items()):
+            ordered = sorted(durations)
+            histogram = [0] * (len(HISTOGRAM_BOUNDS_MS) + 1)
+            for duration in durations:
+                histogram[bisect_left(HISTOGRAM_BOUNDS_MS, duration)] += 1
+            result[name] = {
+                "count": len(ordered),
+                "mean": sum(ordered) / len(ordered),
+                "p50": _percentile(ordered, 0.50),
+                "p95": _percentile(ordered, 0.95),
+                "max": ordered[-1],
+                "last": durations[-1],
+                "histogram": histogram,
+            }
+        return result
+
+    def report_text(self):
+        """Rapport lisible : une ligne de statistiques et l'histogramme par mesure."""
+        labels = [f"<{bound}" for bound in HISTOGRAM_BOUNDS_MS]
+        labels.append(f">={HISTOGRAM_BOUNDS_MS[-1]}")
+        lines = ["Temps de réponse (ms)"]
+        for name, stats in self.summary().items():
+            lines.append(
+                f"{name:<32} n={stats['count']:<5} moy={stats['mean']:7.2f} "
+                f"p50={stats['p50']:7.2f} p95={stats['p95']:7.2f} max={stats['max']:7.2f}"
+            )
+            lines.append(
+                "    "
+                + "  ".join(
+                    f"{label}:{count}"
+                    for label, count in zip(labels, stats["histogram"])
+                    if count
+                )
+            )
+        return "\n".join(lines)
+
+
+def _percentile(ordered, fraction):
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+recorder = TimingRecorder()
+
+
+def timed(name, until_idle=False):
+    """
+    Décorateur de méthode de widget : enregistre la durée de l'appel sous `name`.
+    until_idle: mesure aussi jusqu'au passage idle suivant (self.after_idle).
+    """
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not recorder.enabled:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                recorder.record(name, (time.perf_counter() - start) * 1000)
+                if until_idle:
+                    args[0].after_idle(
+                        lambda: recorder.record(
+                            f"{name}->idle", (time.perf_counter() - start) * 1000
+                        )
+                    )
+
+        return wrapper
+
+    return decorator
+
+
+def enable(report_path=None):
+    """Active la mesure ; le rapport est écrit à la sortie (stderr ou report_path)."""
+    recorder.enabled = True
+    if not recorder._report_registered:
+        recorder._report_registered = True
+        atexit.register(dump_report, report_path)
+
+
+def enable_from_environment():
+    value = os.environ.get(ENVIRONMENT_VARIABLE, "").strip()
+    if value and value.lower() not in ("0", "false", "no"):
+        enable(None if value.lower() in ("1", "true", "yes") else value)
+    return recorder.enabled
+
+
+def dump_report(report_path=None):
+    if not recorder.samples:
+        return
+    if report_path:
+        with open(report_path, "w", encoding="utf-8") as f:
+            json.dump(recorder.summary(), f, indent=2)
+    else:
+        sys.stderr.write(recorder.report_text() + "\n")
@@ -0,0 +1,98 @@
+# utils/item_stats.py
+import re
+
+# Les types d'effets des niveaux > min_level portent le delta en suffixe :
+# "max_health(+3)", "magic_damage(+0.8%)"...
+_DELTA_SUFFIX = re.compile(r"\s*\(.*\)\s*$")
+
+# Types d'effets sans valeur numérique exploitable (texte libre, compétence secondaire).
+NON_NUMERIC_EFFECT_TYPES = {"effects", "secondary"}
+
+
+def normalize_effect_type(raw_type):
+    """Retourne le nom de stat sans le suffixe de delta ('armor(+2)' -> 'armor')."""
+    if not isinstance(raw_type, str):
+        return None
+    name = _DELTA_SUFFIX.sub("", raw_type).strip().lower()
+    return name or None
+
+
+def effect_numeric_value(effect):
+    """
+    Valeur numérique d'un effet, ou None.
+    Les valeurs {min, max} (dégâts) sont ramenées à leur moyenne.
+    """
+    if not isinstance(effect, dict):
+        return None
+    value = effect.get("value")
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, dict):
+        low, high = value.get("min"), value.get("max")
+        if isinstance(low, (int, float)) and isinstance(high, (int, float)):
+            return (float(low) + float(high)) / 2.0
+    return None
+
+
+def available_levels(item_data):
+    """Liste triée des niveaux (int) présents dans item_data["levels"]."""
+    levels = item_data.get("levels") if isinstance(item_data, dict) else None
+    if not isinstance(levels, dict):
+        return []
+    result = []
+    for key in levels:
+        try:
+            result.append(int(key))
+        except (TypeError, ValueError):
+            continue
+    return sorted(result)
+
+
+def resolve_level(item_data, level=None):
+    """
+    Niveau effectivement utilisé pour un item :
+    - level=None : le niveau le plus haut disponible ;
+    - sinon le plus haut niveau disponible <= level (None si aucun).
+    """
+    levels = available_levels(item_data)
+    if not levels:
+        return None
+    if level is None:
+        return levels[-1]
+    reachable = [lvl for lvl in levels if lvl <= level]
+    return reachable[-1] if reachable else None
+
+
+def level_stats(item_data, level):
+    """Dictionnaire {stat: valeur} des effets numériques d'un item à un niveau donné."""
+    stats = {}
+    if level is None or not isinstance(item_data, dict):
+        return stats
+    level_data = item_data.get("levels", {}).get(str(level), {})
+    effects = level_data.get("effects", []) if isinstance(level_data, dict) else []
+    if not isinstance(effects, list):
+        return stats
+    for effect in effects:
+        if not isinstance(effect, dict):
+            continue
+        stat = normalize_effect_type(effect.get("type"))
+        if not stat or stat in NON_NUMERIC_EFFECT_TYPES:
+            continue
+        value = effect_numeric_value(effect)
+        if value is None:
+            continue
+        stats[stat] = stats.get(stat, 0.0) + value
+    return stats
+
+
+def catalog_stat_names(items):
+    """Ensemble trié de toutes les stats numériques présentes dans un catalogue."""
+    names = set()
+    for item_data in items:
+        if not isinstance(item_data, dict):
+            continue
+        for level in available_levels(item_data):
+            names.update(level_stats(item_data, level))
+    return sorted(names)
@@ -0,0 +1,23 @@
+# utils/log.py
+"""
+Configuration des logs de l'application.
+
+Chaque module déclare `logger = logging.getLogger(__name__)` et passe ses
+valeurs en arguments (logger.debug("slot %s", nom)) : le message n'est formaté
+que si son niveau est actif. Par défaut seuls les avertissements et erreurs
+sont affichés ; la variable d'environnement BUILD_CRAFTER_LOG (ex. DEBUG)
+ou l'argument level changent le niveau.
+"""
+import logging
+import os
+
+DEFAULT_LEVEL = "WARNING"
+LOG_FORMAT = "%(asctime)s %(levelname)s %(name)s: %(message)s"
+
+
+def configure_logging(level=None):
+    """Configure le logger racine (à appeler une fois, au démarrage)."""
+    level_name = (level or os.environ.get("BUILD_CRAFTER_LOG") or DEFAULT_LEVEL).upper()
+    logging.basicConfig(
+        level=getattr(logging, level_name, logging.WARNING), format=LOG_FORMAT
+    )
@@ -0,0 +1,80 @@
+# utils/masks.py
+"""
+Masques de sélection sur les lignes d'un index : un objet `bytes` de longueur n
+contenant 0 ou 1 par ligne.
+
+Toutes les opérations passent par des primitives C (int.from_bytes, map, bytes,
+itertools.compress) : aucun code Python n'est exécuté par ligne, ce qui remplace
+les boucles de filtrage item par item.
+"""
+from itertools import compress
+
+
+def full_mask(size):
+    return b"\x01" * size
+
+
+def empty_mask(size):
+    return bytes(size)
+
+
+def mask_and(first, *others):
+    value = int.from_bytes(first, "little")
+    for other in others:
+        value &= int.from_bytes(other, "little")
+    return value.to_bytes(len(first), "little")
+
+
+def mask_or(first, *others):
+    value = int.from_bytes(first, "little")
+    for other in others:
+        value |= int.from_bytes(other, "little")
+    return value.to_bytes(len(first), "little")
+
+
+def mask_not(mask):
+    size = len(mask)
+    value = int.from_bytes(mask, "little") ^ int.from_bytes(full_mask(size), "little")
+    return value.to_bytes(size, "little")
+
+
+def mask_from_indices(size, indices):
+    mask = bytearray(size)
+    for index in indices:
+        mask[index] = 1
+    return bytes(mask)
+
+
+def mask_from_range(size, start, stop):
+    return bytes(start) + b"\x01" * (stop - start) + bytes(size - stop)
+
+
+def mask_indices(mask):
+    """Indices des lignes sélectionnées, dans l'ordre."""
+    return list(compress(range(len(mask)), mask))
+
+
+def mask_count(mask):
+    return mask.count(1)
+
+
+def mask_ge(column, threshold):
+    """Lignes où column[i] >= threshold."""
+    return bytes(map(float(threshold).__le__, column))
+
+
+def mask_gt(column, threshold):
+    return bytes(map(float(threshold).__lt__, column))
+
+
+def mask_le(column, threshold):
+    return bytes(map(float(threshold).__ge__, column))
+
+
+def mask_lt(column, threshold):
+    return bytes(map(float(threshold).__gt__, column))
+
+
+def mask_eq(column, value):
+    # float.__eq__ compare aussi aux int ; int.__eq__(float) renverrait NotImplemented
+    return bytes(map(float(value).__eq__, column))
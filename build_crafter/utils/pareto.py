@@ -0,0 +1,110 @@
+# utils/pareto.py
+"""
+Frontière de Pareto des builds sur 2 ou 3 stats (toutes à maximiser).
+
+Les stats choisies sont additives : un item dominé dans son slot ne peut
+jamais faire partie d'un build non dominé. On élague donc chaque slot à sa
+propre frontière, puis on combine les slots un par un en ré-élaguant après
+chaque fusion, ce qui évite d'énumérer le produit complet du catalogue.
+
+Les slots interchangeables (Ring1/Ring2) sont fusionnés ensemble : leurs
+candidats sont les combinaisons d'items distincts, chacune comptée une fois.
+"""
+import itertools
+
+from utils.build_search import build_candidates, twin_slots
+
+
+def _dominates(a, b):
+    """a domine b : au moins aussi bon partout et strictement meilleur quelque part."""
+    return all(x >= y for x, y in zip(a, b)) and a != b
+
+
+def pareto_front(entries):
+    """
+    Filtre une liste de (valeurs, payload) pour ne garder que les entrées non dominées.
+    Les doublons de valeurs ne sont gardés qu'une fois.
+    """
+    # Tri décroissant : une entrée ne peut être dominée que par une entrée placée avant elle
+    ordered = sorted(entries, key=lambda entry: entry[0], reverse=True)
+    front = []
+    seen = set()
+    if ordered and len(ordered[0][0]) == 2:
+        best_second = float("-inf")
+        for values, payload in ordered:
+            if values[1] > best_second and values not in seen:
+                front.append((values, payload))
+                seen.add(values)
+                best_second = values[1]
+        return front
+    for values, payload in ordered:
+        if values in seen:
+            continue
+        if any(_dominates(kept, values) for kept, _payload in front):
+            continue
+        front.append((values, payload))
+        seen.add(values)
+    return front
+
+
+def _group_front(vectors, slot_rows, size):
+    """
+    Frontière des combinaisons non ordonnées de `size` lignes distinctes.
+    Une ligne dominée par au moins `size` autres n'y figure jamais : l'une
+    d'elles, absente de la combinaison, la remplacerait avantageusement.
+    """
+    if size == 1:
+        return pareto_front([(vectors[row], (row,)) for row in slot_rows])
+    kept = [
+        row
+        for row in slot_rows
+        if sum(_dominates(vectors[other], vectors[row]) for other in slot_rows) < size
+    ]
+    return pareto_front(
+        [
+            (tuple(map(sum, zip(*(vectors[row] for row in combo)))), combo)
+            for combo in itertools.combinations(kept, size)
+        ]
+    )
+
+
+def pareto_builds(items, stats, slot_names, level=None):
+    """
+    Calcule la frontière de Pareto des builds sur `stats` (2 ou 3 noms de stat).
+    Retourne [(valeurs, {slot: item_data}), ...] trié sur la première stat.
+    """
+    if not 2 <= len(stats) <= 3:
+        raise ValueError("La frontière de Pareto se calcule sur 2 ou 3 stats.")
+    slots, candidates, rows = build_candidates(items, slot_names, level)
+    vectors = [
+        tuple(row_stats.get(stat, 0.0) for stat in stats)
+        for _item, _level, row_stats in rows
+    ]
+
+    # Groupes de slots jumeaux : {premier slot: [positions]}
+    twin_of = dict(twin_slots(candidates))
+    groups = {}
+    for position in range(len(slots)):
+        first = position
+        while first in twin_of:
+            first = twin_of[first]
+        groups.setdefault(first, []).append(position)
+
+    # combo : ((position du slot, ligne), ...)
+    frontier = [(tuple(0.0 for _ in stats), ())]
+    for positions in groups.values():
+        group_front = _group_front(vectors, candidates[positions[0]], len(positions))
+        merged = [
+            (
+                tuple(a + b for a, b in zip(values, group_values)),
+                combo + tuple(zip(positions, group_rows)),
+            )
+            for values, combo in frontier
+            for group_values, group_rows in group_front
+        ]
+        frontier = pareto_front(merged)
+
+    return [
+        (values, {slots[position]: rows[row][0] for position, row in sorted(combo)})
+        for values, combo in frontier
+    ]
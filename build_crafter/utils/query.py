@@ -0,0 +1,226 @@
+# utils/query.py
+"""
+Mini langage de requête de la barre de recherche.
+
+    slot:helm rarity:rare,epic max_health>20 name:~iron sort:-magic_damage
+
+- mot libre / name:xxx : un mot du nom commence par xxx ;
+- name:~xxx : recherche approximative (un mot contient xxx ou s'en approche
+  à quelques fautes près), résultats classés par distance ;
+- slot:, rarity:, category: : facettes (plusieurs valeurs séparées par des virgules) ;
+- stat>=valeur (>, <, <=, =) : plage de stat, au niveau donné par level: ;
+- level:10 (ou lvl:10), sort:stat / sort:-stat (décroissant), top:10 ;
+- un '-' devant un filtre l'exclut (-rarity:common).
+
+Le texte est normalisé puis compilé une seule fois en QueryPlan (cache LRU) ;
+l'exécution ne fait que combiner les masques prébâtis de CatalogIndex.
+Si les mots libres ne donnent rien, with_fallbacks() fournit des variantes
+approximatives : tous les mots à quelques fautes près, puis au moins un mot.
+"""
+import copy
+import re
+from functools import lru_cache
+
+from utils.catalog_index import tokenize_name
+from utils.masks import mask_and, mask_count, mask_indices, mask_not, mask_or
+
+_STAT_TERM = re.compile(r"^([a-z_]+)(>=|<=|>|<|=)(-?\d+(?:\.\d+)?)%?$")
+_FACET_FIELDS = {
+    "slot": "slot",
+    "rarity": "rarity",
+    "category": "category",
+    "cat": "category",
+}
+_LEVEL_FIELDS = {"level", "lvl"}
+_TOP_FIELDS = {"top", "limit"}
+
+
+class QueryPlan:
+    """Requête compilée ; indépendante de l'index sur lequel elle est exécutée."""
+
+    def __init__(self):
+        self.facet_terms = []  # (facette, (termes...), exclure)
+        self.stat_terms = []  # (stat, opérateur, valeur, exclure)
+        self.name_terms = []  # ("prefix" | "fuzzy", texte, exclure)
+        self.match_any_name = False  # True : un seul terme fuzzy suffit
+        self.level = None
+        self.sort_stat = None
+        self.sort_descending = True
+        self.top_k = None
+        self.unknown_terms = []
+        self._fallbacks = None
+
+    @property
+    def has_filters(self):
+        return bool(self.facet_terms or self.stat_terms or self.name_terms)
+
+    @property
+    def fuzzy_terms(self):
+        return [
+            text
+            for mode, text, exclude in self.name_terms
+            if mode == "fuzzy" and not exclude
+        ]
+
+    def with_fallbacks(self):
+        """Le plan lui-même puis ses variantes approximatives (si mots libres)."""
+        if self._fallbacks is None:
+            self._fallbacks = [self]
+            free_words = [
+                text
+                for mode, text, exclude in self.name_terms
+                if mode == "prefix" and not exclude
+            ]
+            if free_words:
+                strict = copy.copy(self)
+                strict.name_terms = [
+                    ("fuzzy" if mode == "prefix" and not exclude else mode, text, exclude)
+                    for mode, text, exclude in self.name_terms
+                ]
+                strict._fallbacks = None
+                relaxed = copy.copy(strict)
+                relaxed.match_any_name = True
+                self._fallbacks += [strict, relaxed]
+        return self._fallbacks
+
+    def rank(self, index, item_ids):
+        """
+        Classe des ids d'items par pertinence des termes approximatifs :
+        nombre de termes trouvés (recouvrement), puis distance d'édition totale.
+        """
+        terms = self.fuzzy_terms
+        if not terms:
+            return list(item_ids)
+        distances = [index.fuzzy_item_distances(term) for term in terms]
+
+        def relevance(item_id):
+            found = [d[item_id] for d in distances if item_id in d]
+            return (len(terms) - len(found), sum(found))
+
+        return sorted(item_ids, key=relevance)
+
+    def filter_mask(self, index, level=None):
+        """Masque d'items des filtres de la requête (None si aucun filtre)."""
+        if not self.has_filters:
+            return None
+        level = self.level if self.level is not None else level
+        masks = []
+        for facet, terms, exclude in self.facet_terms:
+            mask = mask_or(*[index.facet_term_mask(facet, term) for term in terms])
+            masks.append(mask_not(mask) if exclude else mask)
+        for stat, operator, value, exclude in self.stat_terms:
+            mask = index.stat_mask(stat, operator, value, level)
+            masks.append(mask_not(mask) if exclude else mask)
+        any_name_masks = []
+        for mode, text, exclude in self.name_terms:
+            if mode == "fuzzy":
+                mask = index.name_fuzzy_mask(text)
+            else:
+                mask = index.name_prefix_mask(text)
+            if exclude:
+                masks.append(mask_not(mask))
+            elif self.match_any_name:
+                any_name_masks.append(mask)
+            else:
+                masks.append(mask)
+        if any_name_masks:
+            masks.append(mask_or(*any_name_masks))
+        return mask_and(*masks)
+
+
+def normalize_query(text):
+    """Forme canonique : minuscules, espaces simples, pas d'espace autour des opérateurs."""
+    text = (text or "").strip().lower()
+    text = re.sub(r"\s*(>=|<=|>|<|=|:)\s*", r"\1", text)
+    return " ".join(text.split())
+
+
+def parse_query(text):
+    """Compile une requête en QueryPlan (mis en cache sur sa forme normalisée)."""
+    return _parse_normalized(normalize_query(text))
+
+
+@lru_cache(maxsize=256)
+def _parse_normalized(query):
+    plan = QueryPlan()
+    for raw_term in query.split():
+        exclude = raw_term.startswith("-") and len(raw_term) > 1
+        term = raw_term[1:] if exclude else raw_term
+
+        stat_match = _STAT_TERM.match(term)
+        if stat_match:
+            stat, operator, value = stat_match.groups()
+            plan.stat_terms.append((stat, operator, float(value), exclude))
+            continue
+
+        field, sep, value = term.partition(":")
+        if not sep:
+            for token in tokenize_name(term):
+                plan.name_terms.append(("prefix", token, exclude))
+            continue
+        if not value:
+            plan.unknown_terms.append(raw_term)
+        elif field == "name":
+            if value.startswith("~"):
+                for token in tokenize_name(value[1:]):
+                    plan.name_terms.append(("fuzzy", token, exclude))
+            else:
+                for token in tokenize_name(value):
+                    plan.name_terms.append(("prefix", token, exclude))
+        elif field in _FACET_FIELDS:
+            terms = tuple(v for v in value.split(",") if v)
+            if terms:
+                plan.facet_terms.append((_FACET_FIELDS[field], terms, exclude))
+        elif field in _LEVEL_FIELDS and value.isdigit():
+            plan.level = int(value)
+        elif field in _TOP_FIELDS and value.isdigit() and int(value) > 0:
+            plan.top_k = int(value)
+        elif field == "sort":
+            # "sort:-stat" décroissant, "sort:stat" croissant
+            plan.sort_descending = value.startswith("-")
+            plan.sort_stat = value.lstrip("-+") or None
+        else:
+            plan.unknown_terms.append(raw_term)
+    return plan
+
+
+def execute_query(
+    index,
+    text,
+    base_mask=None,
+    level=None,
+    sort_stat=None,
+    descending=True,
+    top_k=None,
+):
+    """
+    Exécute une requête sur un CatalogIndex et retourne la liste ordonnée des ids
+    d'items, ou None si rien ne restreint ni ne réordonne le catalogue.
+
+    base_mask: masque d'items imposé en plus de la requête (zone, facettes).
+    level/sort_stat/descending/top_k: valeurs par défaut, la requête prime.
+    """
+    plan = parse_query(text)
+    level = plan.level if plan.level is not None else level
+    # Requête stricte d'abord, puis variantes approximatives si elle ne donne rien
+    for candidate_plan in plan.with_fallbacks():
+        masks = [
+            mask
+            for mask in (candidate_plan.filter_mask(index, level), base_mask)
+            if mask is not None
+        ]
+        combined = mask_and(*masks) if masks else None
+        if combined is None or mask_count(combined):
+            break
+    plan = candidate_plan
+    if plan.sort_stat:
+        sort_stat, descending = plan.sort_stat, plan.sort_descending
+    top_k = plan.top_k or top_k
+    if combined is None and sort_stat is None and top_k is None:
+        return None
+    item_ids = mask_indices(combined) if combined is not None else None
+    if sort_stat is None:
+        if item_ids is None:
+            item_ids = range(index.item_count)
+        return plan.rank(index, item_ids)[:top_k]  # Pertinence des termes approximatifs
+    return index.order_items(sort_stat, level, descending, item_ids=item_ids, top_k=top_k)
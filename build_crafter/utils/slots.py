@@ -0,0 +1,35 @@
+# utils/slots.py
+
+# Slots d'équipement, dans l'ordre d'affichage (et d'énumération des builds).
+EQUIPMENT_SLOTS = (
+    "Helm",
+    "Amulet",
+    "Ring1",
+    "Chest",
+    "Weapon",
+    "Ring2",
+    "Pants",
+    "Offhand",
+    "Accessory",
+    "Gloves",
+    "Pet",
+)
+
+# Les slots "Melee/Range/Magic Weapon" du JSON vont tous dans le slot générique "Weapon".
+WEAPON_SLOT_TYPES = {"melee weapon", "range weapon", "magic weapon"}
+
+
+def candidate_slots(item_slot, available_slots):
+    """
+    Retourne les slots d'équipement pouvant accueillir un item,
+    par ordre de préférence (même correspondance que MainWindow._handle_equip_request).
+    """
+    if not item_slot:
+        return []
+    if item_slot.lower() in WEAPON_SLOT_TYPES:
+        return ["Weapon"] if "Weapon" in available_slots else []
+    if item_slot == "Ring":
+        return [slot for slot in ("Ring1", "Ring2") if slot in available_slots]
+    if item_slot in available_slots:
+        return [item_slot]
+    return []
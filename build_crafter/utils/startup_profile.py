@@ -0,0 +1,119 @@
+# utils/startup_profile.py
+"""
+Profil du démarrage de l'application (main.py --profile-startup).
+
+Le démarrage est découpé en phases chronométrées (imports, chargement de
+chaque fichier, construction de la fenêtre, premier affichage, remplissage
+différé des listes) pendant qu'un cProfile tourne. À la fin, le profil est
+écrit au format pstats (à ouvrir avec `python -m pstats fichier` ou
+snakeviz) et un résumé est affiché : durée de chaque phase puis les
+fonctions les plus coûteuses.
+
+Inactif (enabled=False), phase() ne fait rien : main.py garde un seul chemin.
+"""
+import contextlib
+import cProfile
+import io
+import pstats
+import sys
+import time
+
+TOP_FUNCTIONS = 15
+
+
+def wait_for_first_paint(window):
+    """
+    Traite les événements de `window` un par un jusqu'à son premier Expose,
+    puis la mise en page et le dessin en attente. Un update() ne convient pas :
+    il traiterait aussi tous les callbacks after() (remplissage différé).
+    """
+    exposed = []
+    binding = window.bind("<Expose>", lambda event: exposed.append(True), add="+")
+    while not exposed:
+        window.tk.dooneevent(0)
+    window.unbind("<Expose>", binding)
+    window.update_idletasks()
+
+
+def wait_for_population(window, zones):
+    """
+    Traite les événements jusqu'à ce que chaque zone de recherche ait son
+    index et sa liste entièrement remplie ; retourne [durée en ms jusqu'à la
+    fin de chacune], dans l'ordre.
+    """
+    start = time.perf_counter()
+    durations = [None] * len(zones)
+    while None in durations:
+        for position, zone in enumerate(zones):
+            if durations[position] is None and not zone.populating:
+                durations[position] = (time.perf_counter() - start) * 1000
+        if None in durations:
+            window.tk.dooneevent(0)
+    return durations
+
+
+class StartupProfile:
+    """Phases du démarrage (nom, durée en ms) et profil cProfile associé."""
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.phases = []  # [(nom, ms, profondeur)]
+        self.profiler = cProfile.Profile() if enabled else None
+        self._started = None
+        self.total_ms = 0.0
+        self._depth = 0
+
+    def start(self):
+        if self.enabled:
+            self._started = time.perf_counter()
+            self.profiler.enable()
+
+    def stop(self):
+        if self.enabled:
+            self.profiler.disable()
+            self.total_ms = (time.perf_counter() - self._started) * 1000
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        """Chronomètre le bloc sous `name` (les phases imbriquées sont indentées)."""
+        if not self.enabled:
+            yield
+            return
+        position = len(self.phases)
+        self.phases.append((name, 0.0, self._depth))
+        self._depth += 1
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._depth -= 1
+            self.phases[position] = (
+                name,
+                (time.perf_counter() - start) * 1000,
+                self._depth,
+            )
+
+    def add_phase(self, name, duration_ms, depth=0):
+        """Phase mesurée ailleurs (ex. par utils.instrumentation)."""
+        if self.enabled:
+            self.phases.append((name, duration_ms, depth))
+
+    def summary_text(self):
+        lines = ["Démarrage (ms)"]
+        for name, duration_ms, depth in self.phases:
+            lines.append(f"{'  ' * depth}{name:<{40 - 2 * depth}} {duration_ms:9.1f}")
+        lines.append(f"{'total':<40} {self.total_ms:9.1f}")
+        stream = io.StringIO()
+        stats = pstats.Stats(self.profiler, stream=stream)
+        stats.sort_stats("cumulative").print_stats(TOP_FUNCTIONS)
+        lines.append(stream.getvalue().strip())
+        return "\n".join(lines)
+
+    def write(self, dump_path):
+        """Arrête le profil, écrit le dump pstats et le résumé (stderr)."""
+        if not self.enabled:
+            return
+        self.stop()
+        self.profiler.dump_stats(dump_path)
+        sys.stderr.write(self.summary_text() + "\n")
+        sys.stderr.write(f"Profil pstats écrit dans {dump_path}\n")
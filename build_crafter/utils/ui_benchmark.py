@@ -0,0 +1,237 @@
+# utils/ui_benchmark.py
+"""
+Benchmark de la couche Tk, sans intervention humaine.
+
+Pour chaque catalogue (données livrées, puis catalogues synthétiques de 1k,
+10k et 50k items, voir utils.catalog_generator) et chaque affichage de liste
+("frames", "canvas"), construit une MainWindow et mesure : démarrage (jusqu'au
+premier affichage), remplissage différé des listes, filtrage frappe par
+frappe, remplissage de la liste, sélection d'un item et équipement. Chaque
+mesure inclut le traitement des événements qui suit (mise en page et
+redessin) ; pour la sélection, item_selection_cpu compte en plus le travail
+différé (callbacks after/idle) sur une fenêtre fixe.
+
+Sous Linux sans DISPLAY, un serveur Xvfb est lancé le temps du benchmark.
+Les résultats sont écrits en JSON (stdout ou --output) pour le suivi des
+régressions :
+
+    python -m utils.ui_benchmark --sizes 1000,10000 --output bench.json
+
+Exemple de résultat (réglages par défaut) : benchmarks/ui_benchmark_sample.json.
+Il a été relevé sous un serveur X minimal qui ne dessine rien : les durées
+couvrent le travail de Tk et de l'application, pas le rendu.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import time
+
+from utils.catalog_generator import generate_catalog, split_catalog
+from utils.instrumentation import TimingRecorder, recorder
+from utils.startup_profile import wait_for_first_paint, wait_for_population
+
+DEFAULT_SIZES = (1000, 10000, 50000)
+# Au-delà, l'affichage "frames" (un Frame par ligne) prend plusieurs minutes
+FRAMES_RENDERER_LIMIT = 10000
+KEYSTROKE_QUERIES = ("sword", "rarity:rare iron", "max_health>=10 sort:-armor")
+SELECTION_COUNT = 20
+EQUIP_COUNT = 20
+DEFERRED_WINDOW_MS = 250  # Fenêtre où compter le travail différé d'une action
+
+
+def _settle(window):
+    """Traite les événements en attente (mise en page, redessin)."""
+    window.update_idletasks()
+    window.update()
+
+
+def _measure(timings, name, action, window):
+    start = time.perf_counter()
+    action()
+    _settle(window)
+    timings.record(name, (time.perf_counter() - start) * 1000)
+
+
+def _measure_deferred(timings, name, action, window):
+    """
+    Comme _measure, puis relève sous `<name>_cpu` le temps CPU du processus
+    jusqu'à DEFERRED_WINDOW_MS après l'action : le travail reporté dans des
+    callbacks after()/idle, que _settle ne voit pas, y est compté.
+    """
+    cpu_start = time.process_time()
+    _measure(timings, name, action, window)
+    done = []
+    window.after(DEFERRED_WINDOW_MS, done.append, True)
+    while not done:
+        window.tk.dooneevent(0)
+    timings.record(f"{name}_cpu", (time.process_time() - cpu_start) * 1000)
+
+
+def run_case(weapons, armor, list_renderer, seed=0):
+    """Mesure une fenêtre ; retourne {mesure: statistiques} (durées en ms)."""
+    from ui.main_window import MainWindow
+
+    timings = TimingRecorder()
+    rng = random.Random(seed)
+    recorder.reset()
+
+    start = time.perf_counter()
+    window = MainWindow(
+        weapon_data=weapons, armor_data=armor, list_renderer=list_renderer
+    )
+    wait_for_first_paint(window)
+    timings.record("startup", (time.perf_counter() - start) * 1000)
+    try:
+        # --- Remplissage différé des deux listes, après le premier affichage ---
+        zones = (window.search_zone_weapons, window.search_zone_armor)
+        durations = wait_for_population(window, zones)
+        timings.record("initial_population", max(durations))
+        _settle(window)
+
+        zone = window.search_zone_armor if armor else window.search_zone_weapons
+        zone_items = armor or weapons
+
+        # --- Filtrage : une mesure par frappe (saisie puis effacement) ---
+        entry = zone.search_entry
+        for query in KEYSTROKE_QUERIES:
+            for length in list(range(1, len(query) + 1)) + [0]:
+
+                def keystroke(text=query[:length]):
+                    entry.delete(0, "end")
+                    entry.insert(0, text)
+                    zone.filter_list()
+
+                _measure(timings, "filter_keystroke", keystroke, window)
+
+        # --- Remplissage complet de la liste ---
+        list_display = zone.item_list_display
+        for _ in range(3):
+            _measure(
+                timings,
+                "list_population",
+                lambda: list_display.display_items(zone_items),
+                window,
+            )
+
+        # --- Sélection (clic -> détails) ---
+        for _ in range(SELECTION_COUNT):
+            position = rng.randrange(len(list_display.displayed_items))
+            _measure_deferred(
+                timings,
+                "item_selection",
+                lambda: list_display.select_index(position),
+                window,
+            )
+
+        # --- Équipement ---
+        for _ in range(EQUIP_COUNT):
+            item_data = rng.choice(zone_items)
+            _measure(
+                timings,
+                "equip",
+                lambda: window._handle_equip_request(item_data),
+                window,
+            )
+    finally:
+        window.destroy()
+
+    result = timings.summary()
+    # Mesures internes (utils.instrumentation) relevées pendant ce cas
+    for name, stats in recorder.summary().items():
+        result[f"internal:{name}"] = stats
+    return result
+
+
+def _start_xvfb():
+    """Lance Xvfb sur un display libre si besoin ; retourne le processus ou None."""
+    if os.environ.get("DISPLAY") or platform.system() != "Linux":
+        return None
+    xvfb = shutil.which("Xvfb")
+    if not xvfb:
+        raise SystemExit("Pas de DISPLAY et Xvfb introuvable : installez xvfb.")
+    read_fd, write_fd = os.pipe()
+    process = subprocess.Popen(
+        [xvfb, "-displayfd", str(write_fd), "-screen", "0", "1600x1000x24"],
+        pass_fds=(write_fd,),
+    )
+    os.close(write_fd)
+    with os.fdopen(read_fd) as pipe:
+        display = pipe.readline().strip()  # Xvfb écrit le numéro choisi
+    if not display:
+        process.kill()
+        raise SystemExit("Xvfb n'a pas démarré.")
+    os.environ["DISPLAY"] = f":{display}"
+    return process
+
+
+def main(argv=None):
+    from utils.data_loader import load_data_from_file
+
+    parser = argparse.ArgumentParser(description="Benchmark de l'interface Tk")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)))
+    parser.add_argument("--renderers", default="frames,canvas")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--no-shipped", action="store_true", help="ignorer les données livrées"
+    )
+    parser.add_argument("--output", default="", help="fichier JSON (défaut: stdout)")
+    args = parser.parse_args(argv)
+
+    weapons = load_data_from_file(os.path.join("data", "weapons.json"))
+    armor = load_data_from_file(os.path.join("data", "armor.json"))
+    catalogs = [] if args.no_shipped else [("shipped", weapons, armor)]
+    for size in (int(s) for s in args.sizes.split(",") if s):
+        # Images livrées réutilisées : le cache d'images travaille comme en vrai
+        image_paths = [i["local_image_path"] for i in weapons + armor]
+        items = generate_catalog(size, args.seed, image_paths)
+        catalogs.append((f"synthetic-{size}", *split_catalog(items)))
+
+    xvfb = _start_xvfb()
+    recorder.enabled = True
+    results = []
+    try:
+        for catalog_name, catalog_weapons, catalog_armor in catalogs:
+            item_count = len(catalog_weapons) + len(catalog_armor)
+            for list_renderer in (r for r in args.renderers.split(",") if r):
+                case = {
+                    "catalog": catalog_name,
+                    "items": item_count,
+                    "renderer": list_renderer,
+                }
+                if list_renderer == "frames" and item_count > FRAMES_RENDERER_LIMIT:
+                    case["skipped"] = f"plus de {FRAMES_RENDERER_LIMIT} items"
+                    results.append(case)
+                    continue
+                print(f"{catalog_name} / {list_renderer}...", file=sys.stderr)
+                case["unit"] = "ms"
+                case["metrics"] = run_case(
+                    catalog_weapons, catalog_armor, list_renderer, args.seed
+                )
+                results.append(case)
+    finally:
+        recorder.enabled = False
+        if xvfb is not None:
+            xvfb.terminate()
+
+    report = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": args.seed,
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()